@@ -0,0 +1,180 @@
+"""
+Parametrização por comprimento de arco de curvas de Bézier cúbicas.
+
+O parâmetro t de uma cúbica não é proporcional à distância percorrida: com
+t avançando a taxa constante, a velocidade ao longo da curva varia conforme a
+disposição dos pontos de controle. Cada curva recebe uma tabela com o
+comprimento acumulado em ARC_SAMPLES + 1 valores de t igualmente espaçados
+(poligonal inscrita), calculada para muitas curvas de uma vez com NumPy.
+
+- Inversão (distância ou fração do comprimento -> t): o trecho de cada
+  consulta é a quantidade de colunas da tabela até a distância procurada,
+  contada para todas as consultas em uma única comparação vetorizada (com
+  ARC_SAMPLES pequeno, mais barato que as iterações de uma busca binária),
+  seguida de interpolação linear no trecho.
+- Ponto mais próximo: amostra mais próxima da tabela seguida de poucas
+  iterações de Newton na distância ao quadrado.
+- Atualização barata quando só p3 se move: B(t) = A(t) + t^3 p3, então cada
+  corda da poligonal é a + c p3, com a a corda da parte fixa A(t) (p0, p1,
+  p2) e c a diferença de t^3 no trecho. Guardadas as cordas a (por eixo) e
+  |a|^2, |corda|^2 = |a|^2 + 2 c (a . p3) + c^2 |p3|^2 custa três produtos
+  por eixo, sem montar os pontos da curva (chord_cumulative_lengths).
+"""
+
+import numpy as np
+
+# Trechos da poligonal de cada tabela
+ARC_SAMPLES = 32
+SAMPLE_PARAMS = np.linspace(0.0, 1.0, ARC_SAMPLES + 1)
+# Iterações de Newton no ponto mais próximo
+NEWTON_ITERATIONS = 3
+
+def bernstein_basis(t, derivative=0):
+    """
+    Base de Bernstein cúbica (ou a sua derivada) em cada t.
+
+    Returns:
+        np.ndarray: (..., 4), pesos de p0..p3
+    """
+    t = np.asarray(t, dtype=np.float64)[..., None]
+    u = 1.0 - t
+    if derivative == 0:
+        return np.concatenate((u ** 3, 3.0 * u * u * t, 3.0 * u * t * t, t ** 3), axis=-1)
+    if derivative == 1:
+        return np.concatenate((-3.0 * u * u, 3.0 * u * (u - 2.0 * t), 3.0 * t * (2.0 * u - t), 3.0 * t * t), axis=-1)
+    return np.concatenate((6.0 * u, 6.0 * (t - 2.0 * u), 6.0 * (u - 2.0 * t), 6.0 * t), axis=-1)
+
+def fixed_samples(control, params=SAMPLE_PARAMS):
+    """Parte de cada curva (N, 4, 3) que não depende de p3, nos parâmetros da tabela: (N, K+1, 3)"""
+    basis = bernstein_basis(params)
+    return np.einsum('kj,njc->nkc', basis[:, :3], np.asarray(control, dtype=np.float64)[:, :3])
+
+def curve_samples(base, p3, params=SAMPLE_PARAMS):
+    """Pontos das curvas a partir da parte fixa (N, K+1, 3) e do ponto final p3 (N, 3), no tipo de base"""
+    cubes = (np.asarray(params) ** 3).astype(base.dtype)
+    return base + cubes[None, :, None] * np.asarray(p3, dtype=base.dtype)[:, None, :]
+
+def fixed_chords(control, params=SAMPLE_PARAMS, dtype=np.float32):
+    """
+    Cordas da parte fixa das poligonais, para chord_cumulative_lengths.
+
+    Returns:
+        tuple: (cordas por eixo (N, 3, K), quadrado do seu comprimento (N, K))
+    """
+    chords = np.diff(fixed_samples(control, params), axis=1).transpose(0, 2, 1)
+    return np.ascontiguousarray(chords, dtype=dtype), np.einsum('nck,nck->nk', chords, chords).astype(dtype)
+
+def chord_cumulative_lengths(chords, squared, p3, params=SAMPLE_PARAMS):
+    """
+    Comprimento acumulado (N, K+1) das poligonais com o ponto final p3 (N, 3),
+    a partir das cordas da parte fixa (fixed_chords), no tipo das cordas.
+    """
+    p3 = np.asarray(p3, dtype=chords.dtype)
+    steps = np.diff(np.asarray(params, dtype=np.float64) ** 3).astype(chords.dtype)
+    # |a + c p3|^2 = |a|^2 + 2 c (a . p3) + c^2 |p3|^2
+    dot = chords[:, 0] * p3[:, 0:1]
+    dot += chords[:, 1] * p3[:, 1:2]
+    dot += chords[:, 2] * p3[:, 2:3]
+    dot *= 2.0 * steps
+    dot += squared
+    dot += (steps * steps) * np.einsum('nc,nc->n', p3, p3)[:, None]
+    # Erro de arredondamento em cordas quase nulas
+    np.maximum(dot, 0.0, out=dot)
+    np.sqrt(dot, out=dot)
+    lengths = np.zeros((len(chords), len(params)), dtype=chords.dtype)
+    np.cumsum(dot, axis=1, out=lengths[:, 1:])
+    return lengths
+
+def cumulative_lengths(samples):
+    """Comprimento acumulado das poligonais (N, K+1, 3) -> (N, K+1), começando em 0"""
+    chords = np.diff(samples, axis=1)
+    lengths = np.zeros(samples.shape[:2], dtype=samples.dtype)
+    np.cumsum(np.sqrt(np.einsum('nkc,nkc->nk', chords, chords)), axis=1, out=lengths[:, 1:])
+    return lengths
+
+def fraction_at_parameter(lengths, t):
+    """
+    Fração do comprimento de cada curva percorrida até o parâmetro t.
+
+    Os parâmetros da tabela são igualmente espaçados, então o trecho de t é
+    encontrado diretamente, O(1) por consulta.
+
+    Args:
+        lengths: Tabelas de comprimento acumulado (N, K+1) em SAMPLE_PARAMS
+        t: Parâmetros (N,) ou (S, N)
+    """
+    lengths = np.asarray(lengths)
+    n, columns = lengths.shape
+    position = np.clip(np.asarray(t, dtype=np.float64), 0.0, 1.0) * (columns - 1)
+    k = np.minimum(position.astype(np.int64), columns - 2)
+    row = np.broadcast_to(np.arange(n), k.shape)
+    start, end = lengths[row, k], lengths[row, k + 1]
+    total = lengths[:, -1]
+    distance = start + (position - k) * (end - start)
+    return np.where(total > 0.0, distance / np.where(total > 0.0, total, 1.0), t)
+
+def parameter_at_fraction(lengths, fractions, params=SAMPLE_PARAMS):
+    """
+    Parâmetro t em que cada curva atinge uma fração do seu comprimento.
+
+    Args:
+        lengths: Tabelas de comprimento acumulado (N, K+1)
+        fractions: Frações em [0, 1], (N,) ou (S, N) para S consultas por curva
+        params: Parâmetros t das colunas da tabela
+
+    Returns:
+        np.ndarray: t com a forma de fractions
+    """
+    lengths = np.asarray(lengths)
+    n, columns = lengths.shape
+    total = lengths[:, -1]
+    fractions = np.clip(np.asarray(fractions, dtype=lengths.dtype), 0.0, 1.0)
+    params = np.asarray(params, dtype=lengths.dtype)
+    row = np.broadcast_to(np.arange(n), fractions.shape)
+    # Trecho de cada consulta: colunas cujo comprimento não passa da distância procurada
+    distances = fractions * total
+    k = np.count_nonzero(lengths <= distances[..., None], axis=-1) - 1
+    k = np.clip(k, 0, columns - 2)
+    start, end = lengths[row, k], lengths[row, k + 1]
+    span = end - start
+    weight = np.clip((distances - start) / np.where(span > 0.0, span, 1.0), 0.0, 1.0)
+    # Curvas degeneradas (um ponto): a fração vira o próprio parâmetro
+    return np.where(total > 0.0, params[k] + weight * (params[k + 1] - params[k]), fractions)
+
+def parameter_at_distance(lengths, distances, params=SAMPLE_PARAMS):
+    """Parâmetro t em que cada curva atinge uma distância (mesma forma de parameter_at_fraction)"""
+    total = np.asarray(lengths)[:, -1]
+    return parameter_at_fraction(lengths, np.asarray(distances) / np.where(total > 0.0, total, 1.0), params)
+
+def evaluate(control, t, derivative=0):
+    """Pontos (ou derivadas) de cada curva (N, 4, 3) nos parâmetros t (N,)"""
+    return np.einsum('nj,njc->nc', bernstein_basis(t, derivative), np.asarray(control, dtype=np.float64))
+
+def closest_parameter(control, points, samples=None, params=SAMPLE_PARAMS, iterations=NEWTON_ITERATIONS):
+    """
+    Ponto de cada curva mais próximo de um ponto dado.
+
+    Args:
+        control: Pontos de controle (N, 4, 3)
+        points: Pontos de consulta (N, 3)
+        samples: Pontos das curvas nos parâmetros da tabela (N, K+1, 3); calculados se omitidos
+
+    Returns:
+        (t, distância) de cada curva, (N,) e (N,)
+    """
+    control = np.asarray(control, dtype=np.float64)
+    points = np.asarray(points, dtype=np.float64)
+    if samples is None:
+        samples = curve_samples(fixed_samples(control, params), control[:, 3], params)
+    nearest = np.argmin(np.einsum('nkc,nkc->nk', samples - points[:, None], samples - points[:, None]), axis=1)
+    t = params[nearest].astype(np.float64)
+    # Newton em f(t) = (B(t) - P) . B'(t), derivada |B'|^2 + (B - P) . B''
+    for _ in range(iterations):
+        offset = evaluate(control, t) - points
+        first = evaluate(control, t, 1)
+        second = evaluate(control, t, 2)
+        f = np.einsum('nc,nc->n', offset, first)
+        slope = np.einsum('nc,nc->n', first, first) + np.einsum('nc,nc->n', offset, second)
+        step = np.where(slope > 0.0, f / np.where(slope > 0.0, slope, 1.0), 0.0)
+        t = np.clip(t - step, 0.0, 1.0)
+    return t, np.linalg.norm(evaluate(control, t) - points, axis=1)
@@ -0,0 +1,186 @@
+"""
+Carregamento assíncrono de recursos para o Explorador 3D do Sistema Solar.
+
+A leitura e a decodificação de texturas e modelos rodam em um pool de threads,
+enquanto a janela já exibe as texturas provisórias (fallback). Os resultados
+prontos são enviados para a GPU pela thread principal (a única com contexto
+OpenGL), de forma incremental e limitada a um orçamento de milissegundos por
+frame, para que o streaming de recursos nunca cause travadas.
+"""
+
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import OpenGL.GL as gl
+
+from gpu_mesh import GpuMesh
+
+# Orçamento padrão de envio para a GPU por frame (ms)
+DEFAULT_UPLOAD_BUDGET_MS = 4.0
+# Quantidade de linhas de uma textura enviadas por passo
+TEXTURE_ROWS_PER_STEP = 64
+
+class TextureUpload:
+    """Envio incremental de uma textura RGBA para a GPU, em faixas de linhas"""
+
+    def __init__(self, width, height, texels, on_ready, rows_per_step=TEXTURE_ROWS_PER_STEP):
+        self.width = width
+        self.height = height
+        self.texels = np.frombuffer(texels, dtype=np.uint8) if isinstance(texels, bytes) else texels.reshape(-1)
+        self.on_ready = on_ready
+        self.rows_per_step = rows_per_step
+        self.texture_id = None
+        self.row = 0
+
+    def step(self):
+        """Executa um passo do envio; retorna True quando a textura está completa"""
+        if self.texture_id is None:
+            # Alocar a textura sem dados; as linhas são enviadas nos próximos passos
+            self.texture_id = gl.glGenTextures(1)
+            gl.glBindTexture(gl.GL_TEXTURE_2D, self.texture_id)
+            gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MIN_FILTER, gl.GL_LINEAR)
+            gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MAG_FILTER, gl.GL_LINEAR)
+            gl.glTexImage2D(gl.GL_TEXTURE_2D, 0, gl.GL_RGBA, self.width, self.height, 0,
+                            gl.GL_RGBA, gl.GL_UNSIGNED_BYTE, None)
+            return False
+
+        rows = min(self.rows_per_step, self.height - self.row)
+        row_bytes = self.width * 4
+        chunk = self.texels[self.row * row_bytes:(self.row + rows) * row_bytes]
+        gl.glBindTexture(gl.GL_TEXTURE_2D, self.texture_id)
+        gl.glTexSubImage2D(gl.GL_TEXTURE_2D, 0, 0, self.row, self.width, rows,
+                           gl.GL_RGBA, gl.GL_UNSIGNED_BYTE, chunk)
+        self.row += rows
+        if self.row < self.height:
+            return False
+
+        gl.glBindTexture(gl.GL_TEXTURE_2D, 0)
+        self.texels = None
+        self.on_ready(self.texture_id)
+        return True
+
+class TextureLayerUpload:
+    """Envio incremental de uma camada de um TextureArray, em faixas de linhas"""
+
+    def __init__(self, texture_array, layer, width, height, texels, on_ready, rows_per_step=TEXTURE_ROWS_PER_STEP):
+        self.texture_array = texture_array
+        self.layer = layer
+        # Redimensionamento (se necessário) acontece aqui, ainda na thread do pool
+        texels = texture_array.fit(width, height, texels)
+        self.texels = np.frombuffer(texels, dtype=np.uint8) if isinstance(texels, bytes) else texels.reshape(-1)
+        self.on_ready = on_ready
+        self.rows_per_step = rows_per_step
+        self.row = 0
+
+    def step(self):
+        array = self.texture_array
+        rows = min(self.rows_per_step, array.height - self.row)
+        row_bytes = array.width * 4
+        array.upload_rows(self.layer, self.row, rows, self.texels[self.row * row_bytes:(self.row + rows) * row_bytes])
+        self.row += rows
+        if self.row < array.height:
+            return False
+        self.texels = None
+        self.on_ready(self.layer)
+        return True
+
+class MeshUpload:
+    """Envio de uma malha indexada para a GPU"""
+
+    def __init__(self, arrays, on_ready):
+        self.arrays = arrays
+        self.on_ready = on_ready
+
+    def step(self):
+        mesh = GpuMesh(*self.arrays)
+        self.arrays = None
+        self.on_ready(mesh)
+        return True
+
+class AsyncAssetLoader:
+    """
+    Decodifica recursos em um pool de threads e os envia para a GPU
+    incrementalmente a partir da thread principal.
+    """
+
+    def __init__(self, max_workers=None, budget_ms=DEFAULT_UPLOAD_BUDGET_MS):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="asset-loader")
+        self.budget_ms = budget_ms
+        self._completed = queue.Queue()
+        self._current = None
+        self.pending = 0
+
+    def run(self, fn, *args):
+        """Executa uma função qualquer no pool (sem envio para a GPU)"""
+        return self.executor.submit(fn, *args)
+
+    def _submit(self, name, build_upload, fn, *args):
+        def job():
+            return build_upload(fn(*args))
+        future = self.executor.submit(job)
+        future.asset_name = name
+        self.pending += 1
+        future.add_done_callback(self._completed.put)
+        return future
+
+    def load_texture(self, name, decode_fn, on_ready, *args):
+        """
+        Agenda a decodificação de uma textura.
+
+        decode_fn(*args) roda no pool e deve retornar (largura, altura, texels RGBA);
+        on_ready(texture_id) é chamado na thread principal quando o envio termina.
+        """
+        return self._submit(name, lambda result: TextureUpload(*result, on_ready), decode_fn, *args)
+
+    def load_texture_layer(self, name, decode_fn, texture_array, on_ready, *args):
+        """
+        Agenda a decodificação de uma textura que vai para a camada 'name' de um TextureArray.
+        on_ready(layer) é chamado na thread principal quando o envio termina.
+        """
+        layer = texture_array.layer(name)
+        return self._submit(name, lambda result: TextureLayerUpload(texture_array, layer, *result, on_ready),
+                            decode_fn, *args)
+
+    def load_mesh(self, name, load_fn, on_ready, *args):
+        """
+        Agenda a leitura de uma malha.
+
+        load_fn(*args) roda no pool e deve retornar (vértices, índices, faixas);
+        on_ready(mesh) é chamado na thread principal com a GpuMesh criada.
+        """
+        return self._submit(name, lambda result: MeshUpload(result, on_ready), load_fn, *args)
+
+    @property
+    def idle(self):
+        """True quando não há recursos decodificando nem aguardando envio"""
+        return self.pending == 0
+
+    def upload_pending(self, budget_ms=None):
+        """
+        Envia recursos prontos para a GPU até esgotar o orçamento do frame.
+        Deve ser chamado uma vez por frame na thread principal.
+        """
+        if budget_ms is None:
+            budget_ms = self.budget_ms
+        deadline = time.perf_counter() + budget_ms / 1000.0
+        while time.perf_counter() < deadline:
+            if self._current is None:
+                try:
+                    future = self._completed.get_nowait()
+                except queue.Empty:
+                    return
+                try:
+                    self._current = future.result()
+                except Exception as e:
+                    print(f"Erro ao carregar recurso {future.asset_name}: {e}")
+                    self.pending -= 1
+                    continue
+            if self._current.step():
+                self._current = None
+                self.pending -= 1
+
+    def shutdown(self):
+        """Encerra o pool sem esperar decodificações pendentes"""
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,302 @@
+"""
+Pacote binário de recursos (malhas e texturas) para o Explorador 3D do Sistema Solar.
+
+O passo de construção lê os arquivos OBJ e JPEG uma única vez e grava, em um
+único arquivo versionado, as malhas já indexadas (posição/normal/texcoord e
+índices) e os texels RGBA já decodificados. Na inicialização o arquivo é
+mapeado em memória (mmap) e cada recurso é exposto como uma view NumPy sobre o
+próprio mapeamento, entregue diretamente a glBufferData/glTexImage2D sem
+cópias intermediárias.
+
+Cada arquivo de origem é registrado com tamanho, data de modificação e hash
+SHA-256; se algum deles mudar (ou aparecer/desaparecer), o pacote é
+reconstruído automaticamente.
+
+Formato do arquivo:
+    magic (8 bytes) | versão (uint32) | tamanho do cabeçalho (uint32) |
+    cabeçalho JSON | blobs alinhados em ALIGNMENT bytes
+
+Uso (construção manual):
+    python asset_pack.py [--force]
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+
+import numpy as np
+
+PACK_MAGIC = b'SSPACK\x00\x01'
+PACK_VERSION = 1
+ALIGNMENT = 64
+DEFAULT_PACK_PATH = 'assets.pack'
+
+_PREFIX = struct.Struct('<8sII')
+
+# Manifesto padrão de recursos da aplicação
+TEXTURE_FILES = {
+    'sun': 'textures/sun.jpg',
+    'mercury': 'textures/mercury.jpg',
+    'venus': 'textures/venus.jpg',
+    'earth': 'textures/earth.jpg',
+    'moon': 'textures/moon.jpg',
+    'mars': 'textures/mars.jpg',
+    'jupiter': 'textures/jupiter.jpg',
+    'saturn': 'textures/saturn.jpg',
+    'stars': 'textures/stars.jpg',
+    'asteroid': 'textures/asteroid.jpg',
+    'satellite': 'textures/satellite.jpg'
+}
+
+MODEL_FILES = {
+    'satellite': 'models/Satellite.obj'
+}
+
+def file_sha256(path):
+    """Hash SHA-256 do conteúdo de um arquivo"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def source_signature(path):
+    """Assinatura de um arquivo de origem (None se o arquivo não existe)"""
+    if not os.path.exists(path):
+        return None
+    st = os.stat(path)
+    return {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'sha256': file_sha256(path)}
+
+def source_is_current(path, recorded):
+    """
+    Verifica se um arquivo de origem ainda corresponde à assinatura gravada.
+    O hash só é recalculado quando tamanho e data de modificação não batem.
+    """
+    if recorded is None:
+        return not os.path.exists(path)
+    if not os.path.exists(path):
+        return False
+    st = os.stat(path)
+    if st.st_size != recorded['size']:
+        return False
+    if st.st_mtime_ns == recorded['mtime_ns']:
+        return True
+    return file_sha256(path) == recorded['sha256']
+
+def _align(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+def decode_texture(file_path):
+    """Decodifica uma imagem em texels RGBA (origem no canto inferior esquerdo)"""
+    import pygame
+    surface = pygame.image.load(file_path)
+    width, height = surface.get_size()
+    return width, height, pygame.image.tostring(surface, 'RGBA', True)
+
+def bake_mesh(file_path):
+    """Lê um OBJ e converte em arrays indexados (ver gpu_mesh.build_mesh_arrays)"""
+    import pywavefront
+    from gpu_mesh import build_mesh_arrays
+    model = pywavefront.Wavefront(file_path, collect_faces=True, create_materials=True, parse=True)
+    return build_mesh_arrays(model)
+
+def build_asset_pack(pack_path=DEFAULT_PACK_PATH, texture_files=None, model_files=None, textures=None,
+                     meshes=None):
+    """
+    Constrói o pacote de recursos a partir dos arquivos de origem.
+
+    Arquivos ausentes são registrados (para invalidar o pacote quando surgirem),
+    mas não geram entradas; a aplicação usa seus fallbacks nesses casos.
+
+    Args:
+        textures: Texturas já decodificadas por nome, (largura, altura, texels)
+        meshes: Malhas já processadas por nome, (vértices, índices, faixas);
+            as que faltarem nos dois dicionários são lidas aqui
+    """
+    textures = textures or {}
+    meshes = meshes or {}
+    if texture_files is None:
+        texture_files = TEXTURE_FILES
+    if model_files is None:
+        model_files = MODEL_FILES
+
+    blobs = []
+    header = {
+        'version': PACK_VERSION,
+        'sources': {},
+        'textures': {},
+        'meshes': {}
+    }
+
+    def add_blob(data):
+        array = np.ascontiguousarray(data)
+        blobs.append(array)
+        return {'blob': len(blobs) - 1, 'dtype': array.dtype.str, 'shape': list(array.shape)}
+
+    for name, path in sorted(texture_files.items()):
+        header['sources'][path] = source_signature(path)
+        if header['sources'][path] is None:
+            continue
+        try:
+            width, height, texels = textures[name] if name in textures else decode_texture(path)
+        except Exception as e:
+            print(f"Erro ao decodificar textura {name}: {e}")
+            continue
+        entry = add_blob(np.frombuffer(texels, dtype=np.uint8))
+        entry.update({'width': width, 'height': height, 'format': 'RGBA'})
+        header['textures'][name] = entry
+
+    for name, path in sorted(model_files.items()):
+        header['sources'][path] = source_signature(path)
+        if header['sources'][path] is None:
+            continue
+        try:
+            vertices, indices, ranges = meshes[name] if name in meshes else bake_mesh(path)
+        except Exception as e:
+            print(f"Erro ao processar modelo {name}: {e}")
+            continue
+        header['meshes'][name] = {
+            'vertices': add_blob(vertices),
+            'indices': add_blob(indices),
+            'ranges': [list(r) for r in ranges]
+        }
+
+    # Hash de conteúdo do pacote: derivado dos hashes das origens e da versão
+    content = hashlib.sha256(str(PACK_VERSION).encode())
+    for path, signature in sorted(header['sources'].items()):
+        content.update(path.encode())
+        content.update((signature['sha256'] if signature else '-').encode())
+    header['content_hash'] = content.hexdigest()
+
+    # Calcular offsets dos blobs: o cabeçalho é serializado até que os
+    # offsets (que dependem do tamanho do cabeçalho) se estabilizem
+    offsets = []
+    data_start = 0
+    while True:
+        cursor = data_start
+        offsets = []
+        for array in blobs:
+            offsets.append(cursor)
+            cursor = _align(cursor + array.nbytes)
+        header['blobs'] = [{'offset': o, 'nbytes': a.nbytes} for o, a in zip(offsets, blobs)]
+        header_bytes = json.dumps(header, sort_keys=True).encode('utf-8')
+        new_start = _align(_PREFIX.size + len(header_bytes))
+        if new_start == data_start:
+            break
+        data_start = new_start
+
+    tmp_path = pack_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(_PREFIX.pack(PACK_MAGIC, PACK_VERSION, len(header_bytes)))
+        f.write(header_bytes)
+        for offset, array in zip(offsets, blobs):
+            f.write(b'\x00' * (offset - f.tell()))
+            f.write(array.tobytes())
+    os.replace(tmp_path, pack_path)
+    print(f"Pacote de recursos gerado: {pack_path} ({header['content_hash'][:12]})")
+
+class AssetPack:
+    """Pacote de recursos mapeado em memória; os recursos são views sem cópia"""
+
+    def __init__(self, pack_path):
+        self.path = pack_path
+        self._file = open(pack_path, 'rb')
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, header_len = _PREFIX.unpack_from(self._mmap, 0)
+            if magic != PACK_MAGIC or version != PACK_VERSION:
+                raise ValueError(f"Pacote de recursos incompatível: {pack_path}")
+            start = _PREFIX.size
+            self.header = json.loads(bytes(self._mmap[start:start + header_len]).decode('utf-8'))
+        except Exception:
+            self.close()
+            raise
+        self.content_hash = self.header['content_hash']
+
+    def is_current(self, texture_files=None, model_files=None):
+        """Verifica se o pacote corresponde ao manifesto e aos arquivos de origem atuais"""
+        if texture_files is None:
+            texture_files = TEXTURE_FILES
+        if model_files is None:
+            model_files = MODEL_FILES
+        sources = self.header['sources']
+        expected = set(texture_files.values()) | set(model_files.values())
+        if set(sources) != expected:
+            return False
+        return all(source_is_current(path, signature) for path, signature in sources.items())
+
+    def _view(self, entry):
+        blob = self.header['blobs'][entry['blob']]
+        dtype = np.dtype(entry['dtype'])
+        count = blob['nbytes'] // dtype.itemsize
+        return np.frombuffer(self._mmap, dtype=dtype, count=count, offset=blob['offset']).reshape(entry['shape'])
+
+    def has_texture(self, name):
+        return name in self.header['textures']
+
+    def texture(self, name):
+        """Retorna (largura, altura, view RGBA uint8) de uma textura"""
+        entry = self.header['textures'][name]
+        return entry['width'], entry['height'], self._view(entry)
+
+    def has_mesh(self, name):
+        return name in self.header['meshes']
+
+    def mesh(self, name):
+        """Retorna (vértices, índices, faixas por material) de uma malha, no formato de GpuMesh"""
+        entry = self.header['meshes'][name]
+        ranges = [tuple(r) for r in entry['ranges']]
+        return self._view(entry['vertices']), self._view(entry['indices']), ranges
+
+    def close(self):
+        """Fecha o mapeamento; as views obtidas não devem mais ser usadas"""
+        if getattr(self, '_mmap', None) is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # Ainda há views vivas; o mapeamento é liberado quando forem coletadas
+                pass
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+def open_asset_pack(pack_path=DEFAULT_PACK_PATH, texture_files=None, model_files=None):
+    """
+    Abre o pacote de recursos sem reconstruí-lo.
+
+    Returns:
+        AssetPack, ou None se o pacote estiver ausente, corrompido ou
+        desatualizado em relação aos arquivos de origem
+    """
+    if not os.path.exists(pack_path):
+        return None
+    try:
+        pack = AssetPack(pack_path)
+        if pack.is_current(texture_files, model_files):
+            return pack
+        pack.close()
+        print("Pacote de recursos desatualizado")
+    except (ValueError, OSError, struct.error, KeyError) as e:
+        print(f"Erro ao abrir pacote de recursos: {e}")
+    return None
+
+def load_asset_pack(pack_path=DEFAULT_PACK_PATH, texture_files=None, model_files=None):
+    """
+    Abre o pacote de recursos, reconstruindo-o se estiver ausente, corrompido
+    ou desatualizado em relação aos arquivos de origem.
+    """
+    pack = open_asset_pack(pack_path, texture_files, model_files)
+    if pack is not None:
+        return pack
+    build_asset_pack(pack_path, texture_files, model_files)
+    return AssetPack(pack_path)
+
+if __name__ == '__main__':
+    if '--force' in sys.argv or not os.path.exists(DEFAULT_PACK_PATH):
+        build_asset_pack(DEFAULT_PACK_PATH)
+    else:
+        load_asset_pack(DEFAULT_PACK_PATH).close()
@@ -0,0 +1,364 @@
+"""
+Enxame de asteroides para o Explorador 3D do Sistema Solar.
+
+Cada asteroide segue uma curva de Bézier cúbica de um ponto aleatório da cena
+até um planeta alvo, cujo ponto final acompanha o planeta a cada passo. O
+estado de todos os asteroides (pontos de controle, parâmetro t, alvo, vivo)
+fica em arrays contíguos, de modo que posições, colisões com os planetas, o
+Sol e os limites da cena são calculadas para o enxame inteiro em poucas
+operações NumPy por passo, com milhares de asteroides simultâneos.
+
+As colisões com os planetas são contínuas: o passo é dividido em poucos
+segmentos retos (o suficiente para que a corda desvie no máximo
+SWEEP_TOLERANCE das curvas dos asteroides e das órbitas) e, em cada segmento,
+o instante exato de impacto é calculado por sphere_sweep_time_of_impact.
+Assim, mesmo em velocidades altas da simulação, com deslocamentos por passo
+muito maiores que os raios dos planetas, nenhum impacto é perdido. Com
+track_clearance, os mesmos segmentos também dão a menor distância de cada
+asteroide a qualquer planeta ao longo da trajetória (quase-colisões).
+
+Com constant_speed (padrão), o estado de cada asteroide é a fração do
+comprimento da curva já percorrida (progress), que avança a taxa constante:
+a velocidade ao longo da curva é constante, qualquer que seja a disposição
+dos pontos de controle. Em cada subpasso, a tabela de comprimento de arco
+(arc_length.py) é refeita com o p3 daquele instante e dá o parâmetro t da
+cúbica; assim a posição em cada instante só depende do tempo decorrido e da
+posição do alvo, e não da duração do passo (ver check_step_independence.py).
+"""
+
+import numpy as np
+
+from collisions import (
+    SphereSet, AABBSet, aabb_set_aabb_collision, clamp_spheres_to_aabb, sphere_sweep_time_of_impact,
+    sphere_sweep_closest_distance
+)
+from arc_length import (
+    SAMPLE_PARAMS, fixed_chords, chord_cumulative_lengths, parameter_at_fraction, closest_parameter
+)
+
+DEFAULT_CAPACITY = 1024
+# Distância mínima entre o ponto inicial e o planeta alvo
+MIN_SPAWN_DISTANCE = 10.0
+# Afastamento máximo dos pontos de controle intermediários em relação à reta p0-p3
+CONTROL_SPREAD = 8.0
+# Desvio máximo entre a trajetória e os segmentos retos da colisão contínua
+SWEEP_TOLERANCE = 0.05
+MAX_SUBSTEPS = 64
+
+def bezier_cubic(t, control_points):
+    """
+    Pontos de várias curvas de Bézier cúbicas de uma vez.
+
+    Args:
+        t: Parâmetro de cada curva (N,)
+        control_points: Pontos de controle (N, 4, 3)
+
+    Returns:
+        Posições (N, 3)
+    """
+    t = np.asarray(t, dtype=np.float32)[:, None]
+    u = 1.0 - t
+    p = control_points
+    return (u * u * u) * p[:, 0] + (3.0 * u * u * t) * p[:, 1] + (3.0 * u * t * t) * p[:, 2] + (t * t * t) * p[:, 3]
+
+class AsteroidSwarm:
+    """Asteroides em arrays contíguos; posições livres são reaproveitadas por novos asteroides"""
+
+    def __init__(self, bounds, radius=0.27, speed=0.15, capacity=DEFAULT_CAPACITY, seed=None,
+                 track_clearance=False, constant_speed=True):
+        """
+        Args:
+            bounds: AABB dos limites da cena
+            radius: Raio de cada asteroide
+            speed: Fração da trajetória (do parâmetro t, ou do comprimento com
+                constant_speed) percorrida por segundo de simulação
+            capacity: Capacidade inicial dos arrays (cresce se necessário)
+            track_clearance: Mede a menor distância de cada asteroide aos planetas
+            constant_speed: t avança pelo comprimento de arco (velocidade constante
+                ao longo da curva) em vez de diretamente no parâmetro da cúbica
+        """
+        self.bounds = bounds
+        self.radius = radius
+        self.speed = speed
+        self.constant_speed = constant_speed
+        self.rng = np.random.default_rng(seed)
+        self.control = np.zeros((capacity, 4, 3), dtype=np.float32)
+        self.t = np.zeros(capacity, dtype=np.float32)
+        # Fração da trajetória percorrida (do comprimento com constant_speed, senão igual a t)
+        self.progress = np.zeros(capacity, dtype=np.float32)
+        # Parâmetro t percorrido por segundo no último passo (estimativa dos subpassos)
+        self.param_rate = np.zeros(capacity, dtype=np.float32)
+        self.target = np.full(capacity, -1, dtype=np.int64)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.positions = np.zeros((capacity, 3), dtype=np.float32)
+        # Posições no início do último passo (interpolação no desenho)
+        self.previous_positions = np.zeros((capacity, 3), dtype=np.float32)
+        # Menor distância entre superfícies até algum planeta e qual planeta (track_clearance)
+        self.track_clearance = track_clearance
+        self.clearance = np.full(capacity, np.inf, dtype=np.float32)
+        self.closest_node = np.full(capacity, -1, dtype=np.int64)
+        # Tabelas de comprimento de arco: cordas da parte que não depende de p3 (por
+        # eixo) e o quadrado dos seus comprimentos, e comprimento acumulado com o p3 atual
+        self.arc_chords = np.zeros((capacity, 3, len(SAMPLE_PARAMS) - 1), dtype=np.float32)
+        self.arc_chord_squares = np.zeros((capacity, len(SAMPLE_PARAMS) - 1), dtype=np.float32)
+        self.arc_lengths = np.zeros((capacity, len(SAMPLE_PARAMS)), dtype=np.float32)
+        # Posições em uso: [0, count)
+        self.count = 0
+
+    def __len__(self):
+        return int(np.count_nonzero(self.alive[:self.count]))
+
+    def alive_indices(self):
+        return np.flatnonzero(self.alive[:self.count])
+
+    def _grow(self, capacity):
+        old = len(self.t)
+        if capacity <= old:
+            return
+        capacity = max(capacity, 2 * old)
+        for name in ('control', 't', 'progress', 'param_rate', 'target', 'alive', 'positions', 'previous_positions',
+                     'clearance', 'closest_node', 'arc_chords', 'arc_chord_squares', 'arc_lengths'):
+            array = getattr(self, name)
+            grown = np.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+            grown[:old] = array
+            setattr(self, name, grown)
+
+    def _allocate(self, n):
+        """Índices para n novos asteroides (primeiro as posições livres)"""
+        free = np.flatnonzero(~self.alive[:self.count])[:n]
+        extra = n - len(free)
+        self._grow(self.count + extra)
+        slots = np.concatenate((free, np.arange(self.count, self.count + extra)))
+        self.count += extra
+        return slots
+
+    def spawn(self, targets, target_positions):
+        """
+        Cria um asteroide por alvo.
+
+        Args:
+            targets: Índices dos alvos (K,), como usados em step()
+            target_positions: Posição atual de cada alvo (K, 3)
+
+        Returns:
+            Índices dos novos asteroides
+        """
+        targets = np.asarray(targets, dtype=np.int64)
+        p3 = np.asarray(target_positions, dtype=np.float32).reshape(-1, 3)
+        n = len(targets)
+        low = self.bounds.min_point + np.array([5, 2, 5], dtype=np.float32)
+        high = self.bounds.max_point - np.array([5, 2, 5], dtype=np.float32)
+
+        # Ponto inicial aleatório dentro dos limites da cena (exceto perto do planeta)
+        p0 = self.rng.uniform(low, high, (n, 3)).astype(np.float32)
+        near = np.flatnonzero(np.linalg.norm(p0 - p3, axis=1) <= MIN_SPAWN_DISTANCE)
+        while len(near):
+            p0[near] = self.rng.uniform(low, high, (len(near), 3))
+            near = near[np.linalg.norm(p0[near] - p3[near], axis=1) <= MIN_SPAWN_DISTANCE]
+
+        # Dois pontos de controle intermediários aleatórios (entre p0 e p3)
+        v = p3 - p0
+        controls = []
+        for _ in range(2):
+            base = p0 + v * self.rng.uniform(0.25, 0.75, (n, 1))
+            controls.append(base + self.rng.uniform(-CONTROL_SPREAD, CONTROL_SPREAD, (n, 3)))
+
+        slots = self._allocate(n)
+        self.control[slots] = np.stack((p0, controls[0], controls[1], p3), axis=1)
+        self.t[slots] = 0.0
+        self.progress[slots] = 0.0
+        self.target[slots] = targets
+        self.alive[slots] = True
+        self.positions[slots] = p0
+        self.previous_positions[slots] = p0
+        self.clearance[slots] = np.inf
+        self.closest_node[slots] = -1
+        chords, squares = fixed_chords(self.control[slots])
+        self.arc_chords[slots] = chords
+        self.arc_chord_squares[slots] = squares
+        lengths = chord_cumulative_lengths(chords, squares, p3)
+        self.arc_lengths[slots] = lengths
+        # Primeira estimativa da taxa do parâmetro: inclinação da tabela em t = 0
+        rate = np.full(n, self.speed, dtype=np.float32)
+        if self.constant_speed:
+            first = lengths[:, 1]
+            rate = np.where(first > 0.0, self.speed * SAMPLE_PARAMS[1] * lengths[:, -1] / np.where(first > 0.0, first, 1.0),
+                            rate)
+        self.param_rate[slots] = rate
+        return slots
+
+    def parameters(self, progress, indices, lengths=None):
+        """
+        Parâmetros t da cúbica em que cada asteroide percorreu frações da trajetória.
+
+        Args:
+            progress: Fração percorrida de cada asteroide (N,)
+            lengths: Tabelas de comprimento de arco (N, K+1); as atuais se omitidas
+
+        Returns:
+            t da cúbica (N,), no máximo 1
+        """
+        progress = np.minimum(progress, 1.0)
+        if not self.constant_speed:
+            return progress.astype(np.float32)
+        if lengths is None:
+            lengths = self.arc_lengths[indices]
+        return parameter_at_fraction(lengths, progress).astype(np.float32)
+
+    def arc_length(self, indices=None):
+        """Comprimento aproximado da trajetória de cada asteroide"""
+        if indices is None:
+            indices = self.alive_indices()
+        return self.arc_lengths[indices, -1]
+
+    def closest_points(self, points, indices=None):
+        """
+        Ponto da trajetória de cada asteroide mais próximo de um ponto dado.
+
+        Args:
+            points: Ponto de consulta (3,) ou um por asteroide (N, 3)
+
+        Returns:
+            (t da cúbica, distância) por asteroide
+        """
+        if indices is None:
+            indices = self.alive_indices()
+        points = np.broadcast_to(np.asarray(points, dtype=np.float64), (len(indices), 3))
+        return closest_parameter(self.control[indices], points)
+
+    def required_substeps(self, dt, tolerance=SWEEP_TOLERANCE):
+        """
+        Segmentos retos por passo para que a corda desvie no máximo 'tolerance'
+        das curvas de Bézier (|B''| <= 6 max|P[i] - 2P[i+1] + P[i+2]|).
+        """
+        idx = self.alive_indices()
+        if len(idx) == 0:
+            return 1
+        p = self.control[idx]
+        second = np.maximum(np.linalg.norm(p[:, 0] - 2 * p[:, 1] + p[:, 2], axis=1),
+                            np.linalg.norm(p[:, 1] - 2 * p[:, 2] + p[:, 3], axis=1))
+        # Trecho do parâmetro da cúbica percorrido no passo, estimado pela taxa do
+        # último passo (a velocidade do parâmetro varia pouco de um passo ao outro)
+        span = self.param_rate[idx] * abs(dt)
+        # Desvio da corda para um trecho de parâmetro h: h^2 |B''| / 8
+        substeps = float((span * np.sqrt(6.0 * second / (8.0 * tolerance))).max())
+        return int(min(max(np.ceil(substeps), 1), MAX_SUBSTEPS))
+
+    def step(self, dt, node_track, node_radii, planet_nodes, sun_node):
+        """
+        Avança o enxame em dt segundos de simulação e resolve as colisões.
+
+        Args:
+            node_track: Posições dos nós da cena em K+1 instantes igualmente
+                espaçados do passo, (K+1, M, 3): o primeiro é o início do passo e o
+                último o fim; um array (M, 3) equivale a nós parados no passo
+            node_radii: Raios (M,) dos nós
+            planet_nodes: Nós que podem ser atingidos (índices em node_track)
+            sun_node: Nó do Sol (asteroides dentro dele são empurrados para fora)
+
+        Returns:
+            (asteroides, nós, instantes): índices dos asteroides que colidiram neste
+            passo, do nó atingido e a fração do passo em que ocorreu o impacto
+        """
+        idx = self.alive_indices()
+        if len(idx) == 0:
+            return idx, idx, np.zeros(0)
+        radius = self.radius
+        node_track = np.asarray(node_track, dtype=np.float32)
+        if node_track.ndim == 2:
+            node_track = np.stack((node_track, node_track))
+        substeps = len(node_track) - 1
+
+        # Trajetória de cada asteroide nos K+1 instantes do passo; o ponto final
+        # da curva acompanha o alvo em cada instante e, com constant_speed, o t
+        # de cada instante vem da tabela refeita com o p3 daquele instante
+        self.previous_positions[idx] = self.positions[idx]
+        targets = self.target[idx]
+        start = self.progress[idx]
+        advance = np.float32(self.speed * dt) * np.linspace(0.0, 1.0, substeps + 1, dtype=np.float32)
+        params = np.empty((substeps + 1, len(idx)), dtype=np.float32)
+        params[0] = self.t[idx]
+        lengths = None
+        if self.constant_speed:
+            chords, squares = self.arc_chords[idx], self.arc_chord_squares[idx]
+        for s in range(1, substeps + 1):
+            if self.constant_speed:
+                lengths = chord_cumulative_lengths(chords, squares, node_track[s, targets])
+            params[s] = self.parameters(start + advance[s], idx, lengths)
+        self.progress[idx] = start + advance[-1]
+        self.t[idx] = params[-1]
+        if dt > 0.0:
+            self.param_rate[idx] = (params[-1] - params[0]) / np.float32(dt)
+        if self.constant_speed:
+            self.arc_lengths[idx] = lengths
+        control = np.broadcast_to(self.control[idx], (substeps + 1,) + self.control[idx].shape).copy()
+        control[:, :, 3] = node_track[:, targets]
+        path = bezier_cubic(params.ravel(), control.reshape(-1, 4, 3)).reshape(substeps + 1, len(idx), 3)
+        self.control[idx, 3] = node_track[-1, targets]
+        positions = path[-1]
+
+        # Colisão contínua com todos os planetas: instante de impacto em cada
+        # segmento (K, asteroides, planetas) e o primeiro impacto de cada asteroide
+        planet_nodes = np.asarray(planet_nodes, dtype=np.int64)
+        planet_path = node_track[:, planet_nodes]
+        toi = sphere_sweep_time_of_impact(path[:-1, :, None], path[1:, :, None], radius,
+                                          planet_path[:-1, None], planet_path[1:, None],
+                                          node_radii[planet_nodes])
+        impact_times = (np.arange(substeps)[:, None, None] + toi) / substeps
+        impact_times = impact_times.transpose(1, 0, 2).reshape(len(idx), -1)
+        first = np.argmin(impact_times, axis=1)
+        impact_time = impact_times[np.arange(len(idx)), first]
+        hit = np.isfinite(impact_time)
+        hit_asteroids = idx[hit]
+        hit_nodes = planet_nodes[first[hit] % len(planet_nodes)]
+        hit_times = impact_time[hit]
+
+        if self.track_clearance:
+            gaps = sphere_sweep_closest_distance(path[:-1, :, None], path[1:, :, None], radius,
+                                                 planet_path[:-1, None], planet_path[1:, None],
+                                                 node_radii[planet_nodes]).min(axis=0)
+            nearest = np.argmin(gaps, axis=1)
+            gap = gaps[np.arange(len(idx)), nearest]
+            closer = gap < self.clearance[idx]
+            self.clearance[idx[closer]] = gap[closer]
+            self.closest_node[idx[closer]] = planet_nodes[nearest[closer]]
+
+        # Fim da curva sem colisão também remove o asteroide
+        expired = ~hit & (self.progress[idx] >= 1.0)
+        self.alive[idx[hit | expired]] = False
+        remaining = ~(hit | expired)
+        idx, positions = idx[remaining], positions[remaining]
+
+        # Sol (não pode colidir): asteroides dentro dele são empurrados para fora
+        sun_center = node_track[-1, sun_node]
+        sun_reach = node_radii[sun_node] + radius
+        offset = positions - sun_center
+        distance = np.linalg.norm(offset, axis=1)
+        inside = np.flatnonzero(distance < sun_reach)
+        if len(inside):
+            direction = offset[inside]
+            length = distance[inside]
+            direction[length == 0] = (1.0, 0.0, 0.0)
+            length[length == 0] = 1.0
+            positions[inside] = sun_center + direction / length[:, None] * (sun_reach + 0.1)
+
+        # Paredes (AABB): asteroides totalmente fora da cena voltam para dentro
+        spheres = SphereSet(positions, radius)
+        outside = ~aabb_set_aabb_collision(AABBSet.from_spheres(spheres), self.bounds)
+        if outside.any():
+            positions[outside] = clamp_spheres_to_aabb(spheres, self.bounds)[outside]
+        self.positions[idx] = positions
+
+        return hit_asteroids, hit_nodes, hit_times
+
+    def interpolated_positions(self, alpha, indices=None):
+        """Posições entre o início e o fim do último passo (alpha em [0, 1])"""
+        if indices is None:
+            indices = self.alive_indices()
+        previous = self.previous_positions[indices]
+        return previous + (self.positions[indices] - previous) * alpha
+
+    def clear(self):
+        """Remove todos os asteroides"""
+        self.alive[:] = False
+        self.count = 0
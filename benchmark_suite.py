@@ -0,0 +1,363 @@
+"""
+Benchmarks reprodutíveis de renderização e simulação do Explorador 3D.
+
+Renderização: cada cenário (tamanho da cena, quantidade de asteroides, malha
+do satélite e trajetória de câmera) cria um SolarExplorer sem janela em um
+contexto OpenGL offscreen (offscreen_gl: EGL, inclusive com o renderizador
+por software do Mesa em máquinas sem GPU) e desenha um número fixo de
+frames. A simulação avança em passos fixos, os asteroides têm semente fixa e
+a câmera segue uma trajetória roteirizada pelo índice do frame, então duas
+execuções desenham exatamente os mesmos frames. Cada frame termina com
+glFinish, de modo que o tempo medido inclui o trabalho da GPU.
+
+Microbenchmarks: colisões (collisions.py), bezier_cubic, create_sphere_mesh
+e o passo do motor da simulação, sem OpenGL.
+
+O relatório (percentis do tempo de frame, tempos por fase do perfilador e
+tempos dos microbenchmarks) é gravado em JSON e pode ser comparado com um
+relatório anterior (linha de base): métricas mais lentas que o limite
+indicado são regressões e o programa termina com código 1.
+
+Uso:
+    python benchmark_suite.py --output atual.json [--baseline base.json] [--threshold 0.1]
+    python benchmark_suite.py --scenarios default,swarm_1k --frames 100 --size 640x360
+    python benchmark_suite.py --no-render          # apenas microbenchmarks
+"""
+
+# Precisa vir antes de qualquer módulo que importe OpenGL (escolha da plataforma EGL)
+import offscreen_gl
+
+import argparse
+import contextlib
+import csv
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+import numpy as np
+import OpenGL.GL as gl
+
+from collisions import SphereSet, UniformGrid, SweepAndPrune, sphere_set_collision_pairs, sphere_sweep_time_of_impact
+from asteroid_swarm import bezier_cubic
+from sphere_mesh import create_sphere_mesh
+from gpu_mesh import GpuMesh
+from ephemeris import CATALOGUE_COLUMNS
+from scene_graph import DEFAULT_SCENE
+from simulation_engine import SimulationEngine
+from frame_profiler import FrameProfiler
+from benchmark_broadphase import make_swarm
+
+REPORT_VERSION = 1
+DEFAULT_FRAMES = 200
+DEFAULT_WARMUP = 20
+DEFAULT_SIZE = (1280, 720)
+DEFAULT_SEED = 0
+# Regressão: métrica mais lenta que (1 + limite) vezes a linha de base
+DEFAULT_THRESHOLD = 0.10
+# Passo fixo da simulação durante os frames medidos
+FRAME_STEP = 1.0 / 60.0
+# Tempo máximo esperando texturas e modelos chegarem à GPU antes de medir
+ASSET_TIMEOUT = 60.0
+# Tempo mínimo e repetições mínimas de cada microbenchmark
+MICRO_MIN_SECONDS = 0.5
+MICRO_MIN_REPEATS = 5
+
+def orbit_path(progress):
+    """Volta completa em torno do Sol na distância padrão"""
+    return 360.0 * progress, 15.0, 30.0
+
+def flyby_path(progress):
+    """Aproximação: de longe e de cima até perto do plano das órbitas"""
+    return 90.0 * progress, 40.0 - 35.0 * progress, 60.0 - 52.0 * progress
+
+def static_path(progress):
+    return 0.0, 15.0, 30.0
+
+# Trajetórias de câmera: progresso em [0, 1] -> (rotação horizontal, vertical, distância)
+CAMERA_PATHS = {
+    'orbit': orbit_path,
+    'flyby': flyby_path,
+    'static': static_path,
+}
+
+# Cenários de renderização: planetas extras, asteroides mantidos na cena,
+# triângulos do satélite (0 = modelo original) e trajetória de câmera
+SCENARIOS = {
+    'default': {'planets': 0, 'asteroids': 0, 'satellite_triangles': 0, 'path': 'orbit'},
+    'swarm_1k': {'planets': 0, 'asteroids': 1000, 'satellite_triangles': 0, 'path': 'orbit'},
+    'swarm_10k': {'planets': 0, 'asteroids': 10000, 'satellite_triangles': 0, 'path': 'flyby'},
+    'planets_200': {'planets': 200, 'asteroids': 0, 'satellite_triangles': 0, 'path': 'orbit'},
+    'satellite_200k': {'planets': 0, 'asteroids': 0, 'satellite_triangles': 200000, 'path': 'flyby'},
+}
+
+def percentile_summary(values):
+    values = np.asarray(values, dtype=np.float64)
+    p50, p95, p99 = np.percentile(values, (50, 95, 99))
+    return {'p50': float(p50), 'p95': float(p95), 'p99': float(p99),
+            'mean': float(values.mean()), 'max': float(values.max())}
+
+def write_scene_files(extra_planets, directory, seed=DEFAULT_SEED, scene_path=DEFAULT_SCENE):
+    """
+    Cena padrão com planetas extras (em órbitas aleatórias reprodutíveis).
+
+    Returns:
+        Caminho do arquivo de cena gravado em 'directory'
+    """
+    with open(scene_path) as f:
+        description = json.load(f)
+    with open(description['catalogue'], newline='') as f:
+        rows = list(csv.DictReader(f))
+
+    rng = np.random.default_rng(seed)
+    for i in range(extra_planets):
+        name = f"planet{i:04d}"
+        a = rng.uniform(12.0, 38.0)
+        rows.append({
+            'name': name, 'semi_major_axis': a, 'eccentricity': rng.uniform(0.0, 0.1),
+            'inclination': rng.uniform(0.0, 5.0), 'ascending_node': rng.uniform(0.0, 360.0),
+            'arg_periapsis': rng.uniform(0.0, 360.0), 'mean_anomaly': rng.uniform(0.0, 360.0),
+            # Terceira lei de Kepler, na escala das velocidades do catálogo
+            'mean_motion': 1000.0 / a ** 1.5, 'radius': rng.uniform(0.2, 0.8), 'parent': ''
+        })
+        description['nodes'].append({'name': name, 'body': name, 'draw': 'body', 'orbit': True, 'target': True})
+
+    catalogue = os.path.join(directory, 'catalogue.csv')
+    with open(catalogue, 'w', newline='') as f:
+        writer = csv.DictWriter(f, CATALOGUE_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+    description['catalogue'] = catalogue
+    path = os.path.join(directory, 'scene.json')
+    with open(path, 'w') as f:
+        json.dump(description, f)
+    return path
+
+def sphere_gpu_mesh(triangles):
+    """Malha de esfera com aproximadamente 'triangles' triângulos (substitui o satélite)"""
+    stacks = max(int(round(np.sqrt(triangles / 4.0))), 2)
+    vertices, indices = create_sphere_mesh(10.0, 2 * stacks, stacks)
+    return GpuMesh(vertices, indices, [('benchmark', 0, len(indices))])
+
+def run_scenario(name, config, frames, warmup, size, seed, directory):
+    """
+    Desenha warmup + frames frames de um cenário.
+
+    Returns:
+        (resumo do cenário, (renderizador OpenGL, versão))
+    """
+    from solar_explorer import SolarExplorer
+
+    context = offscreen_gl.OffscreenContext(*size)
+    renderer = (context.renderer, context.version)
+    scene_path = write_scene_files(config['planets'], directory, seed) if config['planets'] else DEFAULT_SCENE
+    path = CAMERA_PATHS[config['path']]
+    log = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(log):
+            explorer = SolarExplorer(*size, scene_path=scene_path, seed=seed, window=False)
+            # Recursos na GPU antes de medir (o envio em segundo plano não entra na medição)
+            deadline = time.perf_counter() + ASSET_TIMEOUT
+            while not explorer.asset_loader.idle and time.perf_counter() < deadline:
+                explorer.stream_assets()
+                time.sleep(0.01)
+            explorer.stream_assets()
+            if config['satellite_triangles']:
+                explorer.meshes['satellite'] = sphere_gpu_mesh(config['satellite_triangles'])
+            explorer.camera_type = "orbit"
+
+            frame_ms = []
+            total = warmup + frames
+            for frame in range(total):
+                if frame == warmup:
+                    explorer.profiler.delete()
+                    explorer.profiler = FrameProfiler(enabled=True, history=frames)
+                profiler = explorer.profiler
+                explorer.camera_rotation_h, explorer.camera_rotation_v, explorer.camera_distance = path(frame / total)
+                missing = config['asteroids'] - len(explorer.asteroids)
+                if missing > 0:
+                    explorer.spawn_asteroid(missing)
+
+                profiler.begin_frame()
+                start = time.perf_counter()
+                with profiler.phase('update'):
+                    explorer.tick(FRAME_STEP)
+                with profiler.phase('draw_scene'):
+                    explorer.draw_scene()
+                with profiler.phase('finish'):
+                    gl.glFinish()
+                elapsed = (time.perf_counter() - start) * 1000.0
+                profiler.end_frame()
+                if frame >= warmup:
+                    frame_ms.append(elapsed)
+
+            # Lê as consultas de GPU ainda pendentes
+            for _ in range(2):
+                profiler.begin_frame()
+                profiler.end_frame()
+            phases = {}
+            for phase, _count, cpu, gpu_ms in profiler.report():
+                phases[phase] = {'cpu_p50': cpu[0], 'cpu_p95': cpu[1]}
+                if gpu_ms is not None:
+                    phases[phase].update({'gpu_p50': gpu_ms[0], 'gpu_p95': gpu_ms[1]})
+            explorer.asset_loader.shutdown()
+            result = {
+                'config': dict(config),
+                'frames': frames,
+                'frame_ms': percentile_summary(frame_ms),
+                'phases': phases,
+                'bodies': len(explorer.scene),
+            }
+    finally:
+        context.release()
+    return result, renderer
+
+def time_call(fn, min_seconds=MICRO_MIN_SECONDS, min_repeats=MICRO_MIN_REPEATS):
+    """Tempos (ms) de chamadas repetidas de fn até min_seconds e min_repeats"""
+    fn()  # aquecimento (caches, alocações)
+    times = []
+    start = time.perf_counter()
+    while len(times) < min_repeats or time.perf_counter() - start < min_seconds:
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1000.0)
+    return times
+
+def microbenchmarks(seed=DEFAULT_SEED):
+    """{nome: função sem argumentos} com entradas fixas geradas a partir da semente"""
+    rng = np.random.default_rng(seed)
+    centers, radii, _ = make_swarm(10000, seed)
+    small = SphereSet(rng.uniform(0.0, 40.0, (2000, 3)), rng.uniform(0.1, 0.5, 2000))
+    start_a = rng.uniform(-40.0, 40.0, (10000, 1, 3))
+    end_a = start_a + rng.uniform(-1.0, 1.0, (10000, 1, 3))
+    start_b = rng.uniform(-40.0, 40.0, (1, 6, 3))
+    end_b = start_b + rng.uniform(-0.5, 0.5, (1, 6, 3))
+    planet_radii = rng.uniform(0.4, 2.0, 6)
+    t = rng.uniform(0.0, 1.0, 100000)
+    controls = rng.uniform(-40.0, 40.0, (100000, 4, 3)).astype(np.float32)
+
+    def engine_tick():
+        engine = SimulationEngine(seed=seed, record_events=False)
+        engine.spawn_asteroids(10000)
+        return lambda: engine.tick(FRAME_STEP)
+
+    return {
+        'sphere_set_collision_pairs_2k': lambda: sphere_set_collision_pairs(small),
+        'uniform_grid_10k': lambda: UniformGrid().candidate_pairs(centers, radii),
+        'sweep_and_prune_10k': lambda: SweepAndPrune().candidate_pairs(centers, radii),
+        'sphere_sweep_toi_10k_x6': lambda: sphere_sweep_time_of_impact(start_a, end_a, 0.27, start_b, end_b, planet_radii),
+        'bezier_cubic_100k': lambda: bezier_cubic(t, controls),
+        # Sem o cache de create_sphere_mesh: mede a geração da malha
+        'create_sphere_mesh_128x64': lambda: create_sphere_mesh.__wrapped__(1.0, 128, 64),
+        'create_sphere_mesh_16x8': lambda: create_sphere_mesh.__wrapped__(1.0, 16, 8),
+        'engine_tick_10k': engine_tick(),
+    }
+
+def run_micro(seed=DEFAULT_SEED):
+    results = {}
+    for name, fn in microbenchmarks(seed).items():
+        times = time_call(fn)
+        summary = percentile_summary(times)
+        results[name] = {'median_ms': summary['p50'], 'p95_ms': summary['p95'], 'repeats': len(times)}
+        print(f"{name:<32} {summary['p50']:>10.3f} ms (p95 {summary['p95']:.3f} ms, {len(times)} repetições)")
+    return results
+
+def environment(renderer=None, version=None):
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpus': os.cpu_count(),
+        'gl_renderer': renderer,
+        'gl_version': version,
+    }
+
+def regression_metrics(report):
+    """Métricas comparáveis de um relatório: {nome: ms}"""
+    metrics = {}
+    for name, scenario in report.get('scenarios', {}).items():
+        for key in ('p50', 'p95'):
+            metrics[f"{name}.frame_{key}"] = scenario['frame_ms'][key]
+    for name, micro in report.get('micro', {}).items():
+        metrics[f"micro.{name}"] = micro['median_ms']
+    return metrics
+
+def compare(report, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compara um relatório com a linha de base e imprime a tabela.
+
+    Returns:
+        Lista de métricas que ficaram mais lentas que (1 + threshold) x base
+    """
+    renderer, base_renderer = report['environment'].get('gl_renderer'), baseline['environment'].get('gl_renderer')
+    if renderer and base_renderer and renderer != base_renderer:
+        print(f"Aviso: renderizador diferente da linha de base ({base_renderer} -> {renderer})")
+    current = regression_metrics(report)
+    base = regression_metrics(baseline)
+    regressions = []
+    print(f"\n{'métrica':<44} {'base ms':>10} {'atual ms':>10} {'variação':>9}")
+    for name in sorted(set(current) & set(base)):
+        change = current[name] / base[name] - 1.0 if base[name] > 0 else 0.0
+        status = ''
+        if change > threshold:
+            status = 'REGRESSÃO'
+            regressions.append(name)
+        elif change < -threshold:
+            status = 'melhora'
+        print(f"{name:<44} {base[name]:>10.3f} {current[name]:>10.3f} {change:>+8.1%} {status}")
+    return regressions
+
+def parse_size(text):
+    width, height = text.lower().split('x')
+    return int(width), int(height)
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Benchmarks de renderização e simulação")
+    parser.add_argument('--frames', type=int, default=DEFAULT_FRAMES, help="frames medidos por cenário")
+    parser.add_argument('--warmup', type=int, default=DEFAULT_WARMUP, help="frames descartados no início")
+    parser.add_argument('--size', type=parse_size, default=DEFAULT_SIZE, help="resolução LxA (ex: 1280x720)")
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS), help="cenários separados por vírgula")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--no-render', action='store_true', help="apenas microbenchmarks")
+    parser.add_argument('--no-micro', action='store_true', help="apenas cenários de renderização")
+    parser.add_argument('--output', help="arquivo JSON do relatório")
+    parser.add_argument('--baseline', help="relatório JSON anterior para comparação")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="variação tolerada antes de acusar regressão (0.1 = 10%%)")
+    args = parser.parse_args(argv)
+
+    report = {'version': REPORT_VERSION, 'config': {
+        'frames': args.frames, 'warmup': args.warmup, 'size': list(args.size), 'seed': args.seed}}
+    renderer = version = None
+    if not args.no_render:
+        report['scenarios'] = {}
+        with tempfile.TemporaryDirectory() as directory:
+            for name in args.scenarios.split(','):
+                result, (renderer, version) = run_scenario(name, SCENARIOS[name], args.frames, args.warmup, args.size,
+                                               args.seed, directory)
+                report['scenarios'][name] = result
+                frame_ms = result['frame_ms']
+                print(f"{name:<16} p50 {frame_ms['p50']:8.2f} ms  p95 {frame_ms['p95']:8.2f} ms  "
+                      f"p99 {frame_ms['p99']:8.2f} ms  ({result['bodies']} nós)")
+    if not args.no_micro:
+        report['micro'] = run_micro(args.seed)
+    report['environment'] = environment(renderer, version)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regressões acima de {args.threshold:.0%}")
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
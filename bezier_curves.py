@@ -0,0 +1,128 @@
+"""
+Trajetórias de Bézier dos asteroides desenhadas pela GPU.
+
+Os vértices das curvas só contêm o parâmetro t: um buffer estático com a
+sequência 0..1 em várias resoluções, criado uma única vez. Os pontos de
+controle de cada curva vão em um array de uniforms e o vertex shader avalia
+a curva (base de Bernstein); cada lote de até BEZIER_BATCH curvas com a
+mesma resolução é um único glDrawArraysInstanced. Como a cada passo só o
+ponto final p3 se move (acompanha o planeta alvo), nada precisa ser
+recalculado nem reenviado além dos próprios pontos de controle.
+
+Tesselação adaptativa pela planura: pela fórmula de Wang, n segmentos
+aproximam uma cúbica com erro de no máximo 3/4 * L / n^2, onde L é a maior
+segunda diferença |p0 - 2 p1 + p2|, |p1 - 2 p2 + p3| dos pontos de controle.
+Os pontos são projetados na tela, então o erro é medido em pixels: curvas
+retas ou distantes usam poucos segmentos e curvas próximas e sinuosas,
+muitos.
+"""
+
+import ctypes
+
+import numpy as np
+import OpenGL.GL as gl
+
+from shading_models import ATTRIB_POSITION, BEZIER_BATCH, get_bezier_program
+
+# Segmentos de cada resolução, do mais simples ao mais detalhado
+CURVE_LEVELS = (4, 8, 16, 32, 64, 128)
+# Afastamento máximo (pixels) entre a poligonal desenhada e a curva
+FLATNESS_PIXELS = 0.5
+CURVE_COLOR = (1.0, 0.5, 0.2, 1.0)  # Laranja para destacar
+
+def curve_parameters(levels=CURVE_LEVELS):
+    """
+    Parâmetros t das resoluções concatenados.
+
+    Returns:
+        tuple: (t (N,) float32, primeiro vértice de cada resolução)
+    """
+    levels = np.asarray(levels)
+    t = np.concatenate([np.linspace(0.0, 1.0, n + 1) for n in levels]).astype(np.float32)
+    first = np.concatenate(([0], np.cumsum(levels + 1)[:-1]))
+    return t, first
+
+def flatness_segments(screen_points, tolerance):
+    """
+    Segmentos necessários para cúbicas (fórmula de Wang), vetorizado.
+
+    Args:
+        screen_points: Pontos de controle (N, 4, 2)
+        tolerance: Erro máximo, nas mesmas unidades dos pontos
+    """
+    p = screen_points
+    second = np.maximum(np.linalg.norm(p[:, 0] - 2.0 * p[:, 1] + p[:, 2], axis=-1),
+                        np.linalg.norm(p[:, 1] - 2.0 * p[:, 2] + p[:, 3], axis=-1))
+    return np.ceil(np.sqrt(0.75 * second / tolerance))
+
+class BezierCurves:
+    """Curvas de Bézier cúbicas avaliadas no vertex shader, com resolução adaptativa"""
+
+    def __init__(self, levels=CURVE_LEVELS, flatness_pixels=FLATNESS_PIXELS, color=CURVE_COLOR):
+        self.levels = np.asarray(levels)
+        self.flatness_pixels = flatness_pixels
+        self.color = color
+        self.program = get_bezier_program()
+        self.drawn_curves = 0
+        self.drawn_vertices = 0
+
+        t, self._first = curve_parameters(self.levels)
+        self.vao = gl.glGenVertexArrays(1)
+        gl.glBindVertexArray(self.vao)
+        self.vbo = gl.glGenBuffers(1)
+        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self.vbo)
+        gl.glBufferData(gl.GL_ARRAY_BUFFER, t.nbytes, t, gl.GL_STATIC_DRAW)
+        gl.glEnableVertexAttribArray(ATTRIB_POSITION)
+        gl.glVertexAttribPointer(ATTRIB_POSITION, 1, gl.GL_FLOAT, gl.GL_FALSE, 4, ctypes.c_void_p(0))
+        gl.glBindVertexArray(0)
+
+    def select_levels(self, controls, frame):
+        """Índice da resolução de cada curva (N, 4, 3) para a câmera do frame"""
+        controls = np.asarray(controls, dtype=np.float32)
+        clip = controls @ frame.view_projection[:, :3].T + frame.view_projection[:, 3]
+        w = clip[..., 3]
+        # Pontos atrás da câmera não têm projeção: resolução máxima
+        behind = (w <= 1e-6).any(axis=1)
+        width, height = frame.viewport
+        screen = clip[..., :2] / np.where(w > 1e-6, w, 1.0)[..., None] * (0.5 * width, 0.5 * height)
+        needed = flatness_segments(screen, self.flatness_pixels)
+        levels = np.minimum(np.searchsorted(self.levels, needed), len(self.levels) - 1)
+        levels[behind] = len(self.levels) - 1
+        return levels
+
+    def draw(self, controls, frame):
+        """
+        Desenha as curvas com a câmera do frame (bloco "Camera" já enviado).
+
+        Args:
+            controls: Pontos de controle (N, 4, 3)
+            frame: FrameContext do frame atual
+        """
+        controls = np.asarray(controls, dtype=np.float32)
+        self.drawn_curves = len(controls)
+        self.drawn_vertices = 0
+        if not len(controls):
+            return
+        levels = self.select_levels(controls, frame)
+        # Uma mat4 por curva com os pontos de controle nas colunas (a última linha não é usada)
+        matrices = np.zeros((len(controls), 4, 4), dtype=np.float32)
+        matrices[:, :3, :] = controls.transpose(0, 2, 1)
+
+        program = self.program
+        program.use()
+        program.set_vec4("color", self.color)
+        gl.glBindVertexArray(self.vao)
+        for level in np.unique(levels):
+            batch = matrices[levels == level]
+            first, count = int(self._first[level]), int(self.levels[level]) + 1
+            for start in range(0, len(batch), BEZIER_BATCH):
+                chunk = batch[start:start + BEZIER_BATCH]
+                program.set_mat4_array("controls", chunk)
+                gl.glDrawArraysInstanced(gl.GL_LINE_STRIP, first, count, len(chunk))
+            self.drawn_vertices += count * len(batch)
+        gl.glBindVertexArray(0)
+        gl.glUseProgram(0)
+
+    def delete(self):
+        gl.glDeleteBuffers(1, [self.vbo])
+        gl.glDeleteVertexArrays(1, [self.vao])
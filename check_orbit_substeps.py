@@ -0,0 +1,86 @@
+"""
+Verifica os subpassos das órbitas usados pela colisão contínua.
+
+Dentro de cada subpasso a colisão contínua trata o movimento dos planetas
+como um segmento reto; Ephemeris.required_substeps escolhe quantos
+subpassos são necessários para que esse segmento desvie no máximo
+SWEEP_TOLERANCE da órbita verdadeira. Para vários passos e instantes
+iniciais sorteados, este script divide o passo como a simulação faz, avalia
+as efemérides em pontos intermediários de cada subpasso e mede a maior
+distância entre a posição verdadeira e a do segmento reto.
+
+O catálogo padrão (data/eccentric_system.csv) tem órbitas bem excêntricas,
+em que o corpo é muito mais rápido e a curvatura muito maior no periapsis.
+Passos em que o número de subpassos chega ao limite (max_substeps) são só
+informados: neles o desvio pode passar da tolerância por construção.
+
+Uso:
+    python check_orbit_substeps.py --catalogue data/eccentric_system.csv --steps 0.1 0.5 2.0
+"""
+
+import argparse
+import sys
+
+import numpy as np
+
+from ephemeris import load_catalogue
+from asteroid_swarm import SWEEP_TOLERANCE
+
+DEFAULT_CATALOGUE = 'data/eccentric_system.csv'
+DEFAULT_STEPS = (1.0 / 60.0, 0.1, 0.5, 2.0)
+# Instantes iniciais sorteados por passo e pontos avaliados dentro de cada subpasso
+DEFAULT_STARTS = 50
+SAMPLES_PER_SUBSTEP = 16
+MAX_SUBSTEPS = 64
+
+def chord_deviation(ephemeris, start, step, substeps, samples=SAMPLES_PER_SUBSTEP):
+    """
+    Maior distância de cada corpo aos segmentos retos de um passo.
+
+    Returns:
+        np.ndarray: (N,) desvio máximo de cada corpo no passo
+    """
+    knots = np.array([ephemeris.positions(start + step * k / substeps) for k in range(substeps + 1)])
+    fractions = np.arange(1, samples) / samples
+    worst = np.zeros(len(ephemeris))
+    for k in range(substeps):
+        for f in fractions:
+            exact = ephemeris.positions(start + step * (k + f) / substeps)
+            chord = knots[k] + f * (knots[k + 1] - knots[k])
+            worst = np.maximum(worst, np.linalg.norm(exact - chord, axis=1))
+    return worst
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Desvio entre as órbitas e os segmentos da colisão contínua")
+    parser.add_argument('--catalogue', default=DEFAULT_CATALOGUE, help="catálogo CSV de elementos orbitais")
+    parser.add_argument('--steps', type=float, nargs='+', default=DEFAULT_STEPS, help="durações de passo (s)")
+    parser.add_argument('--starts', type=int, default=DEFAULT_STARTS, help="instantes iniciais sorteados por passo")
+    parser.add_argument('--seed', type=int, default=1, help="semente dos instantes iniciais")
+    parser.add_argument('--tolerance', type=float, default=SWEEP_TOLERANCE, help="desvio máximo aceito")
+    return parser.parse_args(argv)
+
+def main(argv):
+    args = parse_args(argv)
+    ephemeris = load_catalogue(args.catalogue)
+    rng = np.random.default_rng(args.seed)
+    motion = np.abs(ephemeris.mean_motion)
+    period = float(360.0 / motion[motion > 0].min())
+    failed = False
+    for step in args.steps:
+        substeps = ephemeris.required_substeps(step, args.tolerance, MAX_SUBSTEPS)
+        worst = np.zeros(len(ephemeris))
+        for start in rng.uniform(0.0, period, args.starts):
+            worst = np.maximum(worst, chord_deviation(ephemeris, start, step, substeps))
+        body = int(np.argmax(worst))
+        capped = substeps >= MAX_SUBSTEPS
+        failed |= not capped and worst[body] > args.tolerance
+        note = " (limite de subpassos)" if capped else ""
+        print(f"Passo {step:g} s: {substeps} subpassos{note}, maior desvio {worst[body]:.4f} "
+              f"({ephemeris.names[body]}, tolerância {args.tolerance:g})")
+    if failed:
+        print("Os segmentos retos desviam das órbitas mais que a tolerância")
+        sys.exit(1)
+    print("Segmentos dentro da tolerância em todos os passos")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,127 @@
+"""
+Verifica que os impactos dos asteroides não dependem da duração do passo.
+
+Executa a mesma simulação (mesma semente, asteroides criados no início) com
+passos de tamanhos diferentes e compara, asteroide por asteroide, o planeta
+atingido e o instante do impacto. Com a colisão contínua, um passo grande só
+muda a quantidade de subpassos, não as trajetórias: os impactos devem ser os
+mesmos, com instantes iguais a menos de 'tolerance' segundos.
+
+A única exceção são raspões: um asteroide que passa a menos de
+SWEEP_TOLERANCE da superfície de um planeta pode atingi-lo ou não conforme
+os segmentos retos da colisão contínua. Na execução de referência (a de
+menor passo) a menor distância de cada asteroide a cada planeta é medida, e
+uma troca de planeta só é contada como falha se não for um raspão.
+
+Uso:
+    python check_step_independence.py --asteroids 300 --seconds 40 --steps 2.0 0.5 0.004166
+"""
+
+import argparse
+import sys
+
+import numpy as np
+
+from scene_graph import DEFAULT_SCENE
+from simulation_engine import SimulationEngine, ASTEROID_RADIUS
+from asteroid_swarm import SWEEP_TOLERANCE
+
+DEFAULT_STEPS = (2.0, 1.0 / 240.0)
+# Diferença máxima aceita entre os instantes de impacto (segundos)
+DEFAULT_TOLERANCE = 0.1
+
+def impacts(step, asteroids, seconds, seed, scene_path=DEFAULT_SCENE, constant_speed=True, measure_gaps=False):
+    """
+    Impactos de uma execução com passo 'step'.
+
+    Args:
+        measure_gaps: Mede, no fim de cada passo, a distância entre a superfície
+            de cada asteroide e a de cada nó da cena
+
+    Returns:
+        tuple: (dict asteroide -> (nó atingido, instante do impacto), menor
+        distância (asteroides, nós) ou None sem measure_gaps)
+    """
+    engine = SimulationEngine(scene_path, seed=seed, constant_speed=constant_speed)
+    engine.spawn_asteroids(asteroids)
+    gaps = None
+    if measure_gaps:
+        swarm, scene = engine.asteroids, engine.scene
+        gaps = np.full((asteroids, len(scene)), np.inf)
+
+        def measure(*hits):
+            idx = swarm.alive_indices()
+            distance = np.linalg.norm(swarm.positions[idx, None] - scene.positions[None], axis=2)
+            gaps[idx] = np.minimum(gaps[idx], distance - scene.scale - ASTEROID_RADIUS)
+
+        engine.run(seconds, step, on_tick=measure)
+    else:
+        engine.run(seconds, step)
+    times, hit_asteroids, nodes = engine.events()
+    return {int(a): (int(n), float(t)) for t, a, n in zip(times, hit_asteroids, nodes)}, gaps
+
+def compare(reference, other, gaps, tolerance=DEFAULT_TOLERANCE):
+    """
+    Diferenças entre duas execuções.
+
+    Args:
+        gaps: Menor distância de cada asteroide a cada nó na execução de referência
+
+    Returns:
+        tuple: (asteroides com planeta diferente, impacto em só uma das
+        execuções ou instantes mais distantes que 'tolerance'; raspões com
+        planeta diferente; maior diferença entre instantes no mesmo planeta)
+    """
+    mismatched, grazes = [], []
+    worst = 0.0
+    for asteroid in sorted(set(reference) | set(other)):
+        a, b = reference.get(asteroid), other.get(asteroid)
+        if a is None or b is None or a[0] != b[0]:
+            # O planeta atingido só na outra execução passou raspando na referência
+            if b is not None and gaps[asteroid, b[0]] < SWEEP_TOLERANCE:
+                grazes.append(asteroid)
+            else:
+                mismatched.append(asteroid)
+            continue
+        difference = abs(a[1] - b[1])
+        worst = max(worst, difference)
+        if difference > tolerance:
+            mismatched.append(asteroid)
+    return mismatched, grazes, worst
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Impactos independentes da duração do passo")
+    parser.add_argument('--asteroids', type=int, default=300, help="asteroides criados no início")
+    parser.add_argument('--seconds', type=float, default=40.0, help="segundos de simulação")
+    parser.add_argument('--steps', type=float, nargs='+', default=DEFAULT_STEPS,
+                        help="durações de passo comparadas com a última (a referência)")
+    parser.add_argument('--seed', type=int, default=1, help="semente dos asteroides")
+    parser.add_argument('--scene', default=DEFAULT_SCENE, help="arquivo de cena JSON")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="diferença máxima entre instantes de impacto (s)")
+    parser.add_argument('--parameter-speed', action='store_true',
+                        help="t avança no parâmetro da cúbica (sem velocidade constante)")
+    return parser.parse_args(argv)
+
+def main(argv):
+    args = parse_args(argv)
+    constant_speed = not args.parameter_speed
+    *steps, reference_step = args.steps
+    reference, gaps = impacts(reference_step, args.asteroids, args.seconds, args.seed, args.scene, constant_speed,
+                              measure_gaps=True)
+    print(f"Referência: passo {reference_step:g} s, {len(reference)} impactos de {args.asteroids} asteroides")
+    failed = False
+    for step in steps:
+        other, _ = impacts(step, args.asteroids, args.seconds, args.seed, args.scene, constant_speed)
+        mismatched, grazes, worst = compare(reference, other, gaps, args.tolerance)
+        failed |= bool(mismatched)
+        print(f"Passo {step:g} s: {len(mismatched)} asteroides diferentes "
+              f"({100.0 * len(mismatched) / args.asteroids:.1f}%), {len(grazes)} raspões, "
+              f"maior diferença de instante {worst:.3f} s")
+    if failed:
+        print("Os impactos dependem da duração do passo")
+        sys.exit(1)
+    print("Impactos iguais em todos os passos")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
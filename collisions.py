@@ -5,6 +5,18 @@ Este arquivo contém implementações de diferentes tipos de testes de colisão:
 1. Esfera-Esfera
 2. Esfera-Ponto
 3. AABB-AABB (Caixas alinhadas aos eixos)
+4. Broadphase para muitas esferas em movimento: grade uniforme com hash
+   (UniformGrid) e sweep-and-prune em um eixo (SweepAndPrune), que devolvem
+   os pares candidatos para os testes exatos
+5. Conjuntos em estrutura de arrays (SphereSet, AABBSet) com testes
+   vetorizados um-contra-muitos e todos-contra-todos, que devolvem máscaras
+   booleanas ou pares de índices em vez de um bool por chamada
+6. Colisão contínua: instante de impacto entre esferas que se movem em linha
+   reta durante um passo, para que passos grandes não "atravessem" planetas,
+   e a menor distância entre elas no passo (quase-colisões)
+7. Recorte pelo volume de visão (frustum culling): os seis planos extraídos
+   da matriz de visualização-projeção (método de Gribb-Hartmann) como objetos
+   Plane e o teste vetorizado de um conjunto de esferas contra eles
 
 FONTE: Alguns algoritmos foram adaptados do livro "Real-Time Collision Detection"
 por Christer Ericson, Morgan Kaufmann Publishers, 2005.
@@ -15,13 +27,13 @@ import math
 
 class Sphere:
     def __init__(self, center, radius):
-        self.center = np.array(center, dtype=np.float32)
+        self.center = np.asarray(center, dtype=np.float32)
         self.radius = float(radius)
 
 class AABB:
     def __init__(self, min_point, max_point):
-        self.min_point = np.array(min_point, dtype=np.float32)
-        self.max_point = np.array(max_point, dtype=np.float32)
+        self.min_point = np.asarray(min_point, dtype=np.float32)
+        self.max_point = np.asarray(max_point, dtype=np.float32)
     
     @staticmethod
     def from_points(points):
@@ -48,6 +60,14 @@ class Plane:
         self.normal = self.normal / np.linalg.norm(self.normal)  # Normalizar
         self.distance = np.dot(self.normal, np.array(point))
 
+    @staticmethod
+    def from_equation(coefficients):
+        """Cria o plano a x + b y + c z + d = 0 (a normal aponta para o lado positivo)"""
+        coefficients = np.asarray(coefficients, dtype=np.float64)
+        normal = coefficients[:3]
+        # Ponto do plano mais próximo da origem
+        return Plane(normal, -coefficients[3] * normal / np.dot(normal, normal))
+
 def sphere_sphere_collision(sphere1, sphere2):
     """
     Teste de colisão entre duas esferas.
@@ -136,3 +156,413 @@ def create_aabb_for_object(position, size):
     return AABB(min_point, max_point)
 
 # (Nenhuma alteração necessária, já implementa Sphere, AABB, sphere_sphere_collision, aabb_aabb_collision, sphere_point_collision)
+
+# --- Broadphase ---------------------------------------------------------------
+# Os métodos abaixo recebem os centros (N, 3) e os raios (N,) de todas as esferas
+# e devolvem um array (K, 2) de pares de índices (i < j) cujas AABBs se
+# sobrepõem. Somente esses pares precisam do teste exato de colisão.
+
+# Bits por eixo na chave de célula da grade (coordenadas de -2^20 a 2^20 - 1)
+_CELL_BITS = 21
+_CELL_OFFSET = 1 << (_CELL_BITS - 1)
+# Células por eixo a partir das quais uma esfera fica fora da grade (teste direto)
+LARGE_SPAN_CELLS = 4
+
+def _expand_ranges(starts, counts):
+    """
+    Expande os intervalos [starts[k], starts[k] + counts[k]) em arrays planos.
+
+    Returns:
+        (dono, valor): para cada elemento gerado, o índice k do intervalo e o valor
+    """
+    counts = np.asarray(counts, dtype=np.int64)
+    owners = np.repeat(np.arange(len(counts)), counts)
+    first = np.cumsum(counts) - counts
+    values = np.arange(len(owners), dtype=np.int64) - np.repeat(first - starts, counts)
+    return owners, values
+
+def _cell_keys(cells):
+    """Chave inteira única de cada célula (N, 3) da grade"""
+    c = (cells + _CELL_OFFSET).astype(np.int64)
+    return (c[:, 0] << (2 * _CELL_BITS)) | (c[:, 1] << _CELL_BITS) | c[:, 2]
+
+def _aabb_overlap(mins, maxs, i, j, axes=(0, 1, 2)):
+    """Máscara dos pares (i, j) cujas AABBs se sobrepõem nos eixos informados"""
+    mask = np.ones(len(i), dtype=bool)
+    for axis in axes:
+        mask &= (mins[i, axis] <= maxs[j, axis]) & (maxs[i, axis] >= mins[j, axis])
+    return mask
+
+def _sorted_pairs(i, j):
+    """Pares (K, 2) com o menor índice primeiro"""
+    return np.stack((np.minimum(i, j), np.maximum(i, j)), axis=1)
+
+class UniformGrid:
+    """
+    Broadphase por grade uniforme com hash.
+
+    Cada esfera é inserida em todas as células que a sua AABB toca; um par é
+    reportado apenas na célula que contém o canto mínimo da interseção das duas
+    AABBs, o que evita pares duplicados sem precisar de np.unique.
+
+    Uma esfera cuja AABB toca mais de LARGE_SPAN_CELLS células em algum eixo
+    (ex: um planeta ou o céu no meio de um enxame de asteroides) ocuparia
+    (2R / célula)^3 entradas; ela fica fora da grade e é testada diretamente
+    contra todas as outras esferas.
+    """
+
+    def __init__(self, cell_size=None):
+        """
+        Args:
+            cell_size: Aresta das células; se None, duas vezes o diâmetro do percentil
+                       90 dos raios (poucos corpos muito grandes não inflam as células)
+        """
+        self.cell_size = cell_size
+        self.cell_entries = 0
+        self.large_spheres = 0
+
+    def candidate_pairs(self, centers, radii):
+        centers = np.asarray(centers, dtype=np.float64).reshape(-1, 3)
+        radii = np.broadcast_to(np.asarray(radii, dtype=np.float64), (len(centers),))
+        if len(centers) < 2:
+            return np.zeros((0, 2), dtype=np.int64)
+        cell_size = self.cell_size
+        if cell_size is None:
+            cell_size = 4.0 * float(np.percentile(radii, 90)) or 1.0
+        mins = centers - radii[:, None]
+        maxs = centers + radii[:, None]
+
+        # Células tocadas por cada esfera; as grandes ficam fora da grade
+        lo = np.floor(mins / cell_size).astype(np.int64)
+        span = np.floor(maxs / cell_size).astype(np.int64) - lo + 1
+        large = (span > LARGE_SPAN_CELLS).any(axis=1)
+        self.large_spheres = int(np.count_nonzero(large))
+        small = np.flatnonzero(~large)
+        entries, k = _expand_ranges(np.zeros(len(small), dtype=np.int64), span[small].prod(axis=1))
+        owners = small[entries]
+        sx, sy = span[owners, 0], span[owners, 1]
+        cells = lo[owners] + np.stack((k % sx, (k // sx) % sy, k // (sx * sy)), axis=1)
+        keys = _cell_keys(cells)
+        self.cell_entries = len(keys)
+
+        # Entradas da mesma célula ficam contíguas após a ordenação;
+        # células com uma única entrada são descartadas antes de gerar pares
+        order = np.argsort(keys)
+        keys = keys[order]
+        owners = owners[order]
+        run_start = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+        run_length = np.diff(np.append(run_start, len(keys)))
+        shared = run_length > 1
+        run_start, run_length = run_start[shared], run_length[shared]
+        run_id, offset = _expand_ranges(np.zeros(len(run_start), dtype=np.int64), run_length)
+        positions = run_start[run_id] + offset
+        a, b = _expand_ranges(positions + 1, run_length[run_id] - offset - 1)
+        a = positions[a]
+        i, j = owners[a], owners[b]
+
+        # Sobreposição das AABBs e célula de referência do par
+        mask = _aabb_overlap(mins, maxs, i, j)
+        i, j, cell_keys = i[mask], j[mask], keys[a[mask]]
+        corner = np.floor(np.maximum(mins[i], mins[j]) / cell_size).astype(np.int64)
+        mask = _cell_keys(corner) == cell_keys
+        pairs = _sorted_pairs(i[mask], j[mask])
+        if self.large_spheres:
+            pairs = np.concatenate((pairs, _large_pairs(mins, maxs, large)))
+        return pairs
+
+def _large_pairs(mins, maxs, large):
+    """Pares de cada esfera grande com todas as outras, em blocos de até PAIR_BLOCK_SIZE pares"""
+    n = len(mins)
+    others = np.arange(n)
+    block = max(1, PAIR_BLOCK_SIZE // n)
+    indices = np.flatnonzero(large)
+    pairs = [np.zeros((0, 2), dtype=np.int64)]
+    for start in range(0, len(indices), block):
+        chunk = indices[start:start + block]
+        i = np.repeat(chunk, n)
+        j = np.tile(others, len(chunk))
+        # Pares entre duas esferas grandes aparecem uma única vez (i < j)
+        keep = (j != i) & (~large[j] | (j > i))
+        i, j = i[keep], j[keep]
+        mask = _aabb_overlap(mins, maxs, i, j)
+        pairs.append(_sorted_pairs(i[mask], j[mask]))
+    return np.concatenate(pairs)
+
+class SweepAndPrune:
+    """
+    Broadphase por sweep-and-prune em um eixo.
+
+    Os intervalos são ordenados pelo início na projeção sobre o eixo e cada um
+    é comparado com os seguintes que começam antes do seu fim. O custo cresce
+    com o número de sobreposições nessa projeção: para enxames densos e
+    espalhados nos três eixos, UniformGrid escala melhor (benchmark_broadphase.py).
+    """
+
+    def __init__(self, axis=None):
+        """
+        Args:
+            axis: Eixo da varredura; se None, o de maior variância dos centros
+        """
+        self.axis = axis
+
+    def candidate_pairs(self, centers, radii):
+        centers = np.asarray(centers, dtype=np.float64).reshape(-1, 3)
+        n = len(centers)
+        radii = np.broadcast_to(np.asarray(radii, dtype=np.float64), (n,))
+        if n < 2:
+            return np.zeros((0, 2), dtype=np.int64)
+        mins = centers - radii[:, None]
+        maxs = centers + radii[:, None]
+
+        axis = self.axis
+        if axis is None:
+            axis = int(np.argmax(centers.var(axis=0)))
+        order = np.argsort(mins[:, axis])
+
+        # Cada intervalo se sobrepõe aos seguintes cujo início vem antes do seu fim
+        sorted_min = mins[order, axis]
+        sorted_max = maxs[order, axis]
+        ends = np.searchsorted(sorted_min, sorted_max, side='right')
+        positions = np.arange(n)
+        a, b = _expand_ranges(positions + 1, np.maximum(ends - positions - 1, 0))
+        i, j = order[a], order[b]
+        other_axes = [other for other in range(3) if other != axis]
+        mask = _aabb_overlap(mins, maxs, i, j, other_axes)
+        return _sorted_pairs(i[mask], j[mask])
+
+def sphere_pairs_collision(centers, radii, pairs):
+    """
+    Teste exato (narrowphase) dos pares candidatos da broadphase.
+
+    Returns:
+        Máscara booleana (K,) dos pares que colidem
+    """
+    centers = np.asarray(centers, dtype=np.float64).reshape(-1, 3)
+    radii = np.broadcast_to(np.asarray(radii, dtype=np.float64), (len(centers),))
+    i, j = pairs[:, 0], pairs[:, 1]
+    d = centers[i] - centers[j]
+    sum_radii = radii[i] + radii[j]
+    return np.einsum('ij,ij->i', d, d) <= sum_radii * sum_radii
+
+
+# --- Conjuntos em estrutura de arrays -----------------------------------------
+# Um SphereSet/AABBSet guarda todos os objetos em arrays contíguos (um array
+# por campo), de modo que milhares de testes custam um único kernel NumPy.
+
+# Quantidade máxima de pares avaliados por bloco nos testes todos-contra-todos
+PAIR_BLOCK_SIZE = 1 << 20
+
+class SphereSet:
+    """Conjunto de esferas: centros (N, 3) e raios (N,)"""
+
+    def __init__(self, centers, radii):
+        self.centers = np.asarray(centers, dtype=np.float32).reshape(-1, 3)
+        self.radii = np.broadcast_to(np.asarray(radii, dtype=np.float32), (len(self.centers),))
+
+    def __len__(self):
+        return len(self.centers)
+
+    @staticmethod
+    def from_spheres(spheres):
+        """Cria um conjunto a partir de objetos Sphere"""
+        return SphereSet([s.center for s in spheres], [s.radius for s in spheres])
+
+    def sphere(self, index):
+        """Esfera de índice 'index' como objeto Sphere"""
+        return Sphere(self.centers[index], self.radii[index])
+
+class AABBSet:
+    """Conjunto de caixas alinhadas aos eixos: cantos mínimos e máximos (N, 3)"""
+
+    def __init__(self, min_points, max_points):
+        self.min_points = np.asarray(min_points, dtype=np.float32).reshape(-1, 3)
+        self.max_points = np.asarray(max_points, dtype=np.float32).reshape(-1, 3)
+
+    def __len__(self):
+        return len(self.min_points)
+
+    @staticmethod
+    def from_spheres(sphere_set):
+        """AABBs que envolvem cada esfera do conjunto"""
+        r = sphere_set.radii[:, None]
+        return AABBSet(sphere_set.centers - r, sphere_set.centers + r)
+
+    @staticmethod
+    def from_objects(positions, sizes):
+        """AABBs centradas nas posições, com os tamanhos (N, 3) ou (3,) informados"""
+        positions = np.asarray(positions, dtype=np.float32).reshape(-1, 3)
+        half_sizes = np.asarray(sizes, dtype=np.float32) / 2
+        return AABBSet(positions - half_sizes, positions + half_sizes)
+
+def sphere_set_sphere_collision(sphere_set, sphere):
+    """
+    Teste de uma esfera contra todas as esferas do conjunto.
+
+    Returns:
+        Máscara booleana (N,) das esferas do conjunto que colidem com 'sphere'
+    """
+    d = sphere_set.centers - sphere.center
+    sum_radii = sphere_set.radii + sphere.radius
+    return np.einsum('ij,ij->i', d, d) <= sum_radii * sum_radii
+
+def sphere_set_point_collision(sphere_set, point):
+    """Máscara (N,) das esferas do conjunto que contêm o ponto"""
+    d = sphere_set.centers - np.asarray(point, dtype=np.float32)
+    return np.einsum('ij,ij->i', d, d) <= sphere_set.radii * sphere_set.radii
+
+def sphere_set_collision_pairs(set_a, set_b=None):
+    """
+    Teste todos-contra-todos entre dois conjuntos de esferas (ou de um conjunto
+    consigo mesmo, se set_b for None), avaliado em blocos de PAIR_BLOCK_SIZE pares.
+
+    Returns:
+        Pares (K, 2) de índices (i em set_a, j em set_b) que colidem;
+        para um único conjunto, apenas pares com i < j
+    """
+    same = set_b is None
+    if same:
+        set_b = set_a
+    centers_b = set_b.centers
+    radii_b = set_b.radii
+    rows = max(1, PAIR_BLOCK_SIZE // max(len(set_b), 1))
+    pairs = []
+    for start in range(0, len(set_a), rows):
+        block = slice(start, start + rows)
+        d = set_a.centers[block, None, :] - centers_b[None, :, :]
+        sum_radii = set_a.radii[block, None] + radii_b[None, :]
+        hits = np.einsum('ijk,ijk->ij', d, d) <= sum_radii * sum_radii
+        if same:
+            # Apenas o triângulo superior (j > i)
+            hits &= np.arange(len(set_b))[None, :] > np.arange(start, start + len(hits))[:, None]
+        i, j = np.nonzero(hits)
+        pairs.append(np.stack((i + start, j), axis=1))
+    if not pairs:
+        return np.zeros((0, 2), dtype=np.int64)
+    return np.concatenate(pairs).astype(np.int64)
+
+def aabb_set_aabb_collision(aabb_set, aabb):
+    """Máscara (N,) das caixas do conjunto que se sobrepõem à caixa 'aabb'"""
+    return np.all((aabb_set.min_points <= aabb.max_point) & (aabb_set.max_points >= aabb.min_point), axis=1)
+
+def aabb_set_collision_pairs(set_a, set_b=None):
+    """
+    Teste todos-contra-todos entre dois conjuntos de caixas (ou de um conjunto
+    consigo mesmo, se set_b for None).
+
+    Returns:
+        Pares (K, 2) de índices que se sobrepõem (i < j para um único conjunto)
+    """
+    same = set_b is None
+    if same:
+        set_b = set_a
+    rows = max(1, PAIR_BLOCK_SIZE // max(len(set_b), 1))
+    pairs = []
+    for start in range(0, len(set_a), rows):
+        block = slice(start, start + rows)
+        hits = np.all((set_a.min_points[block, None, :] <= set_b.max_points[None, :, :]) &
+                      (set_a.max_points[block, None, :] >= set_b.min_points[None, :, :]), axis=2)
+        if same:
+            hits &= np.arange(len(set_b))[None, :] > np.arange(start, start + len(hits))[:, None]
+        i, j = np.nonzero(hits)
+        pairs.append(np.stack((i + start, j), axis=1))
+    if not pairs:
+        return np.zeros((0, 2), dtype=np.int64)
+    return np.concatenate(pairs).astype(np.int64)
+
+def sphere_set_inside_aabb(sphere_set, aabb):
+    """Máscara (N,) das esferas do conjunto totalmente contidas na caixa 'aabb'"""
+    r = sphere_set.radii[:, None]
+    return np.all((sphere_set.centers - r >= aabb.min_point) & (sphere_set.centers + r <= aabb.max_point), axis=1)
+
+def clamp_spheres_to_aabb(sphere_set, aabb):
+    """Centros das esferas ajustados para que fiquem inteiramente dentro da caixa 'aabb'"""
+    r = sphere_set.radii[:, None]
+    return np.clip(sphere_set.centers, aabb.min_point + r, aabb.max_point - r)
+
+# --- Colisão contínua ---------------------------------------------------------
+
+def sphere_sweep_time_of_impact(start_a, end_a, radius_a, start_b, end_b, radius_b):
+    """
+    Instante de impacto entre esferas que se movem em linha reta durante um passo.
+
+    A esfera A vai de start_a a end_a e a esfera B de start_b a end_b no mesmo
+    intervalo; no referencial de B, A percorre o segmento d0 -> d0 + v e o
+    impacto é a menor raiz em [0, 1] de |d0 + v s|^2 = (ra + rb)^2
+    (Ericson, seção 5.5.5). Todos os argumentos aceitam arrays com broadcasting
+    (posições com última dimensão 3).
+
+    Returns:
+        Fração s do passo em que as esferas se tocam (0 se já se sobrepõem no
+        início) ou np.inf se não há impacto no passo
+    """
+    start_a = np.asarray(start_a, dtype=np.float64)
+    start_b = np.asarray(start_b, dtype=np.float64)
+    d0 = start_a - start_b
+    v = (np.asarray(end_a, dtype=np.float64) - start_a) - (np.asarray(end_b, dtype=np.float64) - start_b)
+    r = np.asarray(radius_a, dtype=np.float64) + np.asarray(radius_b, dtype=np.float64)
+
+    c = np.einsum('...i,...i->...', d0, d0) - r * r
+    a = np.einsum('...i,...i->...', v, v)
+    b = np.einsum('...i,...i->...', d0, v)
+    discriminant = b * b - a * c
+
+    # Só há impacto se as esferas se aproximam (b < 0) e a reta passa perto o bastante
+    approaching = (b < 0.0) & (discriminant >= 0.0) & (a > 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        s = (-b - np.sqrt(np.maximum(discriminant, 0.0))) / np.where(a > 0.0, a, 1.0)
+    toi = np.where(approaching & (s <= 1.0), s, np.inf)
+    return np.where(c <= 0.0, 0.0, toi)
+
+def sphere_sweep_closest_distance(start_a, end_a, radius_a, start_b, end_b, radius_b):
+    """
+    Menor distância entre as superfícies de duas esferas que se movem em linha
+    reta durante um passo (negativa se chegam a se sobrepor).
+
+    No referencial de B, A percorre o segmento d0 -> d0 + v; o ponto mais
+    próximo da origem é s = clamp(-d0.v / v.v, 0, 1) (Ericson, seção 5.1.2).
+    Os argumentos aceitam arrays com broadcasting, como em
+    sphere_sweep_time_of_impact.
+    """
+    start_a = np.asarray(start_a, dtype=np.float64)
+    start_b = np.asarray(start_b, dtype=np.float64)
+    d0 = start_a - start_b
+    v = (np.asarray(end_a, dtype=np.float64) - start_a) - (np.asarray(end_b, dtype=np.float64) - start_b)
+    a = np.einsum('...i,...i->...', v, v)
+    b = np.einsum('...i,...i->...', d0, v)
+    s = np.clip(-b / np.where(a > 0.0, a, 1.0), 0.0, 1.0)
+    closest = d0 + v * s[..., None]
+    return (np.sqrt(np.einsum('...i,...i->...', closest, closest))
+            - np.asarray(radius_a, dtype=np.float64) - np.asarray(radius_b, dtype=np.float64))
+
+# --- Volume de visão -------------------------------------------------------------
+
+def frustum_planes(view_projection):
+    """
+    Planos do volume de visão extraídos da matriz de visualização-projeção
+    (Gribb e Hartmann): com clip = M @ v, um ponto está dentro quando
+    -w <= x, y, z <= w, ou seja, (linha 3 +- linha i) . v >= 0.
+
+    Args:
+        view_projection: Matriz 4x4 em convenção linha-maior (como FrameContext)
+
+    Returns:
+        Lista com os seis Plane (esquerdo, direito, inferior, superior, próximo,
+        distante), com as normais apontando para dentro do volume
+    """
+    m = np.asarray(view_projection, dtype=np.float64)
+    return [Plane.from_equation(m[3] + sign * m[axis]) for axis in range(3) for sign in (1.0, -1.0)]
+
+def sphere_set_frustum_collision(sphere_set, planes):
+    """
+    Teste de todas as esferas do conjunto contra o volume de visão.
+
+    O teste é conservador: uma esfera só é descartada se estiver inteiramente
+    atrás de algum plano (esferas perto das arestas do volume podem passar).
+
+    Returns:
+        Máscara booleana (N,) das esferas que podem estar visíveis
+    """
+    normals = np.array([plane.normal for plane in planes], dtype=np.float32)
+    distances = np.array([plane.distance for plane in planes], dtype=np.float32)
+    signed = sphere_set.centers @ normals.T - distances
+    return np.all(signed >= -sphere_set.radii[:, None], axis=1)
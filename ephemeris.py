@@ -0,0 +1,240 @@
+"""
+Efemérides keplerianas vetorizadas para o Explorador 3D do Sistema Solar.
+
+Os elementos orbitais de todos os corpos ficam em arrays NumPy e as posições
+de todo o catálogo são calculadas em uma única chamada por passo da
+simulação. Órbitas excêntricas são resolvidas com uma iteração de Newton
+vetorizada para a equação de Kepler (M = E - e sen E).
+
+Convenções (as mesmas da cena original):
+- O plano de referência é XZ, com Y para cima; com inclinação, nó e argumento
+  do periapsis nulos, um corpo em órbita circular está em
+  (a cos M, 0, a sen M).
+- Ângulos em graus; o movimento médio é dado em graus por segundo de simulação.
+- Corpos com 'parent' orbitam a posição do corpo pai (ex: Lua em torno da Terra).
+
+O catálogo é lido de arquivos CSV com as colunas de CATALOGUE_COLUMNS
+(ver data/solar_system.csv); catálogos com dezenas de milhares de corpos
+menores podem ser acrescentados com load_catalogue.
+"""
+
+import csv
+import numpy as np
+
+DEFAULT_CATALOGUE = 'data/solar_system.csv'
+
+CATALOGUE_COLUMNS = (
+    'name', 'semi_major_axis', 'eccentricity', 'inclination', 'ascending_node',
+    'arg_periapsis', 'mean_anomaly', 'mean_motion', 'radius', 'parent'
+)
+
+_ELEMENTS = CATALOGUE_COLUMNS[1:-1]
+
+def solve_kepler(mean_anomaly, eccentricity, tol=1e-12, max_iter=30):
+    """
+    Resolve a equação de Kepler E - e sen E = M para arrays de M e e (radianos).
+
+    Usa Newton-Raphson vetorizado; a estimativa inicial E = pi para e > 0.8
+    garante convergência também em órbitas muito excêntricas.
+    """
+    M = np.remainder(mean_anomaly + np.pi, 2.0 * np.pi) - np.pi
+    e = np.asarray(eccentricity, dtype=np.float64)
+    E = np.where(e > 0.8, np.pi * np.sign(M + (M == 0)), M)
+    for _ in range(max_iter):
+        delta = (E - e * np.sin(E) - M) / (1.0 - e * np.cos(E))
+        E -= delta
+        if not np.any(np.abs(delta) > tol):
+            break
+    return E
+
+class Ephemeris:
+    """Catálogo de elementos orbitais com cálculo vetorizado de posições"""
+
+    def __init__(self):
+        self.names = []
+        self.index = {}
+        self.semi_major_axis = np.zeros(0)
+        self.eccentricity = np.zeros(0)
+        self.inclination = np.zeros(0)
+        self.ascending_node = np.zeros(0)
+        self.arg_periapsis = np.zeros(0)
+        self.mean_anomaly = np.zeros(0)
+        self.mean_motion = np.zeros(0)
+        self.radius = np.zeros(0)
+        self.parent = np.zeros(0, dtype=np.int64)
+        self._depth_levels = []
+
+    def __len__(self):
+        return len(self.names)
+
+    def add_bodies(self, names, parents=None, **elements):
+        """
+        Acrescenta corpos ao catálogo.
+
+        Args:
+            names: Nomes dos corpos (únicos)
+            parents: Nome do corpo pai de cada um (None/'' para órbita em torno do Sol)
+            **elements: Arrays com os elementos de CATALOGUE_COLUMNS
+                (semi_major_axis, mean_motion e radius são obrigatórios; os demais valem 0)
+        """
+        names = list(names)
+        n = len(names)
+        for name in names:
+            if name in self.index:
+                raise ValueError(f"Corpo duplicado no catálogo: {name}")
+        values = {}
+        for key in _ELEMENTS:
+            if key in elements:
+                values[key] = np.broadcast_to(np.asarray(elements[key], dtype=np.float64), (n,))
+            elif key in ('semi_major_axis', 'mean_motion', 'radius'):
+                raise ValueError(f"Elemento obrigatório ausente: {key}")
+            else:
+                values[key] = np.zeros(n)
+        if np.any((values['eccentricity'] < 0) | (values['eccentricity'] >= 1)):
+            raise ValueError("Apenas órbitas elípticas (0 <= e < 1) são suportadas")
+
+        # Pais podem ser corpos já existentes ou do próprio lote
+        lookup = dict(self.index)
+        lookup.update({name: len(self.names) + i for i, name in enumerate(names)})
+        if parents is None:
+            parent_ids = np.full(n, -1, dtype=np.int64)
+        else:
+            parent_ids = np.array([lookup[p] if p else -1 for p in parents], dtype=np.int64)
+
+        for i, name in enumerate(names):
+            self.index[name] = len(self.names) + i
+        self.names.extend(names)
+        for key in _ELEMENTS:
+            setattr(self, key, np.concatenate([getattr(self, key), values[key]]))
+        self.parent = np.concatenate([self.parent, parent_ids])
+        self._build_depth_levels()
+
+    def _build_depth_levels(self):
+        """Agrupa os corpos por profundidade na hierarquia (pais antes dos filhos)"""
+        depth = np.zeros(len(self.names), dtype=np.int64)
+        for _ in range(len(self.names)):
+            has_parent = self.parent >= 0
+            new_depth = np.where(has_parent, depth[self.parent] + 1, 0)
+            if np.array_equal(new_depth, depth):
+                break
+            depth = new_depth
+        else:
+            if len(self.names):
+                raise ValueError("Hierarquia de órbitas com ciclo")
+        self._depth_levels = [np.flatnonzero(depth == d) for d in range(1, int(depth.max(initial=0)) + 1)]
+
+    def relative_positions(self, t, indices=None):
+        """
+        Posições (N, 3) de cada corpo em relação ao seu corpo pai, no tempo t.
+
+        Args:
+            indices: Só estes corpos (ex: os de uma cena), na ordem dada; todos se None
+        """
+        if indices is None:
+            indices = slice(None)
+        M = np.radians(self.mean_anomaly[indices] + self.mean_motion[indices] * t)
+        e = self.eccentricity[indices]
+        E = solve_kepler(M, e)
+        a = self.semi_major_axis[indices]
+
+        # Posição no plano da órbita
+        xp = a * (np.cos(E) - e)
+        yp = a * np.sqrt(1.0 - e * e) * np.sin(E)
+
+        # Argumento do periapsis (no plano da órbita)
+        w = np.radians(self.arg_periapsis[indices])
+        cw, sw = np.cos(w), np.sin(w)
+        x1 = xp * cw - yp * sw
+        z1 = xp * sw + yp * cw
+
+        # Inclinação em torno da linha dos nós (eixo X antes da rotação do nó)
+        inc = np.radians(self.inclination[indices])
+        y = z1 * np.sin(inc)
+        z2 = z1 * np.cos(inc)
+
+        # Longitude do nó ascendente (rotação no plano XZ)
+        node = np.radians(self.ascending_node[indices])
+        cn, sn = np.cos(node), np.sin(node)
+        positions = np.empty((len(a), 3))
+        positions[:, 0] = x1 * cn - z2 * sn
+        positions[:, 1] = y
+        positions[:, 2] = x1 * sn + z2 * cn
+        return positions
+
+    def positions(self, t):
+        """Posições absolutas (N, 3) de todos os corpos no tempo t, em uma única chamada"""
+        positions = self.relative_positions(t)
+        for level in self._depth_levels:
+            positions[level] += positions[self.parent[level]]
+        return positions
+
+    def position(self, name, t):
+        """Posição absoluta de um único corpo (conveniência; prefira positions)"""
+        return self.positions(t)[self.index[name]]
+
+    def max_accelerations(self, indices=None):
+        """
+        Maior aceleração de cada corpo ao longo da órbita, somada à dos seus
+        ancestrais (limite da aceleração da posição absoluta).
+
+        No periapsis a velocidade é n a sqrt((1 + e) / (1 - e)) e o raio de
+        curvatura a (1 - e^2), o menor da elipse: v^2 / rho = n^2 a / (1 - e)^2.
+
+        Args:
+            indices: Só estes corpos (e os seus ancestrais); todos se None
+        """
+        def periapsis(bodies):
+            n = np.radians(self.mean_motion[bodies])
+            return n * n * self.semi_major_axis[bodies] / (1.0 - self.eccentricity[bodies]) ** 2
+
+        bodies = np.arange(len(self.names)) if indices is None else np.asarray(indices, dtype=np.int64)
+        acceleration = periapsis(bodies)
+        ancestor = self.parent[bodies]
+        while np.any(ancestor >= 0):
+            chained = np.flatnonzero(ancestor >= 0)
+            acceleration[chained] += periapsis(ancestor[chained])
+            ancestor = np.where(ancestor >= 0, self.parent[np.maximum(ancestor, 0)], -1)
+        return acceleration
+
+    def required_substeps(self, dt, tolerance, max_substeps=64, indices=None):
+        """
+        Segmentos retos em que um intervalo dt deve ser dividido para que a corda
+        de cada órbita desvie no máximo 'tolerance' da trajetória: com segmentos
+        de duração h, o desvio é no máximo h^2 max|x''| / 8.
+
+        Args:
+            indices: Só estes corpos (ex: os de uma cena); todos se None
+        """
+        acceleration = self.max_accelerations(indices)
+        if len(acceleration) == 0:
+            return 1
+        substeps = np.ceil(abs(dt) * np.sqrt(acceleration.max() / (8.0 * tolerance)))
+        return int(min(max(substeps, 1), max_substeps))
+
+    def heliocentric(self):
+        """Índices dos corpos que orbitam diretamente o Sol"""
+        return np.flatnonzero(self.parent < 0)
+
+def load_catalogue(path, ephemeris=None):
+    """
+    Lê um catálogo CSV de elementos orbitais.
+
+    Args:
+        path: Arquivo CSV com cabeçalho contendo CATALOGUE_COLUMNS
+        ephemeris: Efemérides às quais os corpos são acrescentados (uma nova se None)
+
+    Returns:
+        Ephemeris
+    """
+    if ephemeris is None:
+        ephemeris = Ephemeris()
+    with open(path, newline='') as f:
+        rows = list(csv.DictReader(f))
+    names = [row['name'] for row in rows]
+    parents = [row.get('parent') or None for row in rows]
+    elements = {
+        key: np.array([float(row[key] or 0.0) for row in rows])
+        for key in _ELEMENTS
+    }
+    ephemeris.add_bodies(names, parents, **elements)
+    return ephemeris
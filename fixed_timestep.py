@@ -0,0 +1,54 @@
+"""
+Passo fixo da simulação para o Explorador 3D do Sistema Solar.
+
+A simulação avança sempre em passos de duração fixa, independentemente da
+taxa de quadros: o tempo real de cada frame é acumulado e consumido em
+quantos passos couberem (zero, um ou vários por frame). A fração que sobra
+no acumulador (alpha) é usada pelo desenho para interpolar entre o estado do
+passo anterior e o do passo atual, de modo que a renderização pode rodar a
+144 Hz com a física a 60 Hz, ou o contrário.
+"""
+
+import numpy as np
+
+# Passos da simulação por segundo de tempo real
+DEFAULT_TICK_RATE = 60.0
+# Máximo de passos por frame; o tempo excedente é descartado para que um
+# frame lento não gere cada vez mais passos atrasados
+MAX_TICKS_PER_FRAME = 8
+
+def lerp(previous, current, alpha):
+    """Interpolação linear entre dois estados (arrays ou escalares)"""
+    return previous + (current - previous) * alpha
+
+class FixedTimestep:
+    """Acumulador de tempo real que converte frames em passos fixos"""
+
+    def __init__(self, tick_rate=DEFAULT_TICK_RATE, max_ticks=MAX_TICKS_PER_FRAME):
+        self.dt = 1.0 / tick_rate
+        self.max_ticks = max_ticks
+        self.accumulator = 0.0
+        self.ticks = 0
+        # Tempo real descartado por excesso de passos atrasados
+        self.dropped_time = 0.0
+
+    def advance(self, frame_seconds):
+        """
+        Acumula o tempo real de um frame.
+
+        Returns:
+            Quantidade de passos fixos a executar neste frame
+        """
+        self.accumulator += max(frame_seconds, 0.0)
+        ticks = int(self.accumulator // self.dt)
+        self.accumulator -= ticks * self.dt
+        if ticks > self.max_ticks:
+            self.dropped_time += (ticks - self.max_ticks) * self.dt
+            ticks = self.max_ticks
+        self.ticks += ticks
+        return ticks
+
+    @property
+    def alpha(self):
+        """Fração do próximo passo já decorrida, em [0, 1), para interpolação"""
+        return float(np.clip(self.accumulator / self.dt, 0.0, 1.0))
@@ -0,0 +1,68 @@
+"""
+Estado da câmera por frame para o Explorador 3D do Sistema Solar.
+
+As matrizes de visualização e projeção, a matriz combinada e a posição do
+observador são calculadas uma única vez por frame e enviadas, também uma única
+vez, para um uniform buffer object (UBO) ligado ao bloco "Camera" de todos os
+programas de shader. Cada desenho só precisa enviar a sua matriz de modelo.
+Os planos do volume de visão, usados para descartar objetos fora da tela,
+também são extraídos uma única vez por frame.
+"""
+
+import numpy as np
+import OpenGL.GL as gl
+
+from shading_models import CAMERA_BLOCK_BINDING
+from collisions import frustum_planes
+
+class FrameContext:
+    """Estado da câmera de um frame (somente NumPy, sem chamadas OpenGL)"""
+
+    def __init__(self, view, projection, eye, light_position=(0.0, 0.0, 0.0), viewport=(1280, 720)):
+        self.view = np.asarray(view, dtype=np.float32)
+        self.projection = np.asarray(projection, dtype=np.float32)
+        self.view_projection = self.projection @ self.view
+        self.eye = np.asarray(eye, dtype=np.float32)
+        self.light_position = np.asarray(light_position, dtype=np.float32)
+        self.viewport = viewport
+        # Planos do volume de visão (recorte dos objetos fora da tela)
+        self.frustum = frustum_planes(self.view_projection)
+
+    @property
+    def focal_length(self):
+        """1 / tan(fov / 2), usado para estimar tamanhos na tela"""
+        return float(self.projection[1, 1])
+
+    @property
+    def viewport_height(self):
+        return self.viewport[1]
+
+class CameraUniformBuffer:
+    """UBO com o bloco "Camera" (layout std140), atualizado uma vez por frame"""
+
+    # 3 mat4 + 2 vec4, em floats
+    FLOAT_COUNT = 3 * 16 + 2 * 4
+
+    def __init__(self, binding=CAMERA_BLOCK_BINDING):
+        self.binding = binding
+        self._data = np.zeros(self.FLOAT_COUNT, dtype=np.float32)
+        self.ubo = gl.glGenBuffers(1)
+        gl.glBindBuffer(gl.GL_UNIFORM_BUFFER, self.ubo)
+        gl.glBufferData(gl.GL_UNIFORM_BUFFER, self._data.nbytes, None, gl.GL_DYNAMIC_DRAW)
+        gl.glBindBuffer(gl.GL_UNIFORM_BUFFER, 0)
+        gl.glBindBufferBase(gl.GL_UNIFORM_BUFFER, binding, self.ubo)
+
+    def upload(self, frame):
+        """Envia o estado da câmera do frame (as matrizes vão em linha-maior, como no bloco)"""
+        data = self._data
+        data[0:16] = frame.view.ravel()
+        data[16:32] = frame.projection.ravel()
+        data[32:48] = frame.view_projection.ravel()
+        data[48:51] = frame.eye
+        data[52:55] = frame.light_position
+        gl.glBindBuffer(gl.GL_UNIFORM_BUFFER, self.ubo)
+        gl.glBufferSubData(gl.GL_UNIFORM_BUFFER, 0, data.nbytes, data)
+        gl.glBindBuffer(gl.GL_UNIFORM_BUFFER, 0)
+
+    def delete(self):
+        gl.glDeleteBuffers(1, [self.ubo])
@@ -0,0 +1,236 @@
+"""
+Perfilador por fase dos frames do Explorador 3D do Sistema Solar.
+
+Cada fase do frame (eventos, atualização, desenho e os desenhos internos:
+fundo, Sol, órbitas, planetas, anéis, satélite, curvas de Bézier, HUD) é
+envolvida com
+
+    with profiler.phase('nome'):
+        ...
+
+que mede o tempo de CPU (perf_counter) e, com um contexto OpenGL, o tempo de
+GPU. Fases podem ser aninhadas (o nome completo é 'pai/filho') e repetidas no
+mesmo frame (os tempos são somados).
+
+Tempo de GPU: consultas GL_TIME_ELAPSED não podem ser aninhadas, então cada
+fase registra dois carimbos de tempo da GPU (glQueryCounter com GL_TIMESTAMP,
+da mesma extensão ARB_timer_query), que medem o mesmo intervalo e podem ser
+aninhados. Os resultados só são lidos QUERY_BUFFERS frames depois (consultas
+em buffer duplo): a leitura nunca espera a GPU, e se o resultado ainda não
+estiver pronto o frame é descartado das estatísticas de GPU.
+
+As últimas amostras de cada fase ficam em janelas deslizantes com os
+percentis p50/p95/p99, exibidos no HUD e exportados em CSV.
+"""
+
+import csv
+import ctypes
+import time
+from collections import deque
+
+import numpy as np
+import OpenGL.GL as gl
+# O wrapper do PyOpenGL para glGetQueryObjectui64v não aceita o tipo GLuint64
+from OpenGL.raw.GL.VERSION.GL_3_3 import glGetQueryObjectui64v
+
+# Frames guardados por fase para os percentis
+PROFILE_HISTORY = 300
+# Conjuntos de consultas de GPU em uso (o resultado é lido QUERY_BUFFERS frames depois)
+QUERY_BUFFERS = 2
+PERCENTILES = (50, 95, 99)
+
+class _Phase:
+    """Contexto de uma fase (with profiler.phase(...))"""
+
+    __slots__ = ('profiler', 'name')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.profiler._begin(self.name)
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler._end()
+        return False
+
+class _NullPhase:
+    """Fase vazia usada com o perfilador desligado (custo praticamente nulo)"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_PHASE = _NullPhase()
+
+class FrameProfiler:
+    """Tempos de CPU e GPU por fase, com percentis em janela deslizante"""
+
+    def __init__(self, enabled=False, gpu=True, history=PROFILE_HISTORY, record=False):
+        """
+        Args:
+            enabled: Começa ligado (pode ser alternado a qualquer momento; vale a partir do próximo frame)
+            gpu: Mede também o tempo de GPU (exige contexto OpenGL com ARB_timer_query)
+            history: Frames guardados por fase para os percentis
+            record: Guarda todas as amostras para export_samples_csv
+        """
+        self.enabled = enabled
+        self.gpu = gpu
+        self.history = history
+        self.record = record
+        self.frame = 0
+        self.cpu_times = {}  # fase -> deque de ms
+        self.gpu_times = {}
+        self.samples = []  # (frame, fase, 'cpu' | 'gpu', ms) se record
+        self.dropped_gpu_frames = 0
+
+        self._frame_open = False
+        self._stack = []  # (nome completo, início na CPU, consulta inicial)
+        self._frame_cpu = {}
+        self._query_pool = []
+        # Por conjunto: frame e lista de (fase, consulta inicial, consulta final)
+        self._query_frames = [0] * QUERY_BUFFERS
+        self._queries = [[] for _ in range(QUERY_BUFFERS)]
+        self._current_queries = None
+        self._result = ctypes.c_uint64()
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        return self.enabled
+
+    def begin_frame(self):
+        """Início de um frame: lê as consultas de GPU do frame mais antigo e reaproveita-as"""
+        self._frame_open = self.enabled
+        if not self._frame_open:
+            return
+        self.frame += 1
+        self._stack = []
+        self._frame_cpu = {}
+        if self.gpu:
+            slot = self.frame % QUERY_BUFFERS
+            self._collect(slot)
+            self._query_frames[slot] = self.frame
+            self._current_queries = self._queries[slot]
+
+    def phase(self, name):
+        """Contexto que mede uma fase do frame atual"""
+        if not self._frame_open:
+            return _NULL_PHASE
+        return _Phase(self, name)
+
+    def _new_query(self):
+        return self._query_pool.pop() if self._query_pool else int(gl.glGenQueries(1)[0])
+
+    def _begin(self, name):
+        full_name = f"{self._stack[-1][0]}/{name}" if self._stack else name
+        if full_name not in self.cpu_times:
+            # Registrada no início: as fases aparecem na ordem do frame (pai antes dos filhos)
+            self.cpu_times[full_name] = deque(maxlen=self.history)
+        query = None
+        if self.gpu:
+            query = self._new_query()
+            gl.glQueryCounter(query, gl.GL_TIMESTAMP)
+        self._stack.append((full_name, time.perf_counter(), query))
+
+    def _end(self):
+        full_name, start, query = self._stack.pop()
+        elapsed = (time.perf_counter() - start) * 1000.0
+        self._frame_cpu[full_name] = self._frame_cpu.get(full_name, 0.0) + elapsed
+        if query is not None:
+            end_query = self._new_query()
+            gl.glQueryCounter(end_query, gl.GL_TIMESTAMP)
+            self._current_queries.append((full_name, query, end_query))
+
+    def end_frame(self):
+        """Fim do frame: os tempos de CPU entram nas janelas deslizantes"""
+        if not self._frame_open:
+            return
+        self._frame_open = False
+        for name, ms in self._frame_cpu.items():
+            self._add(self.cpu_times, name, ms, 'cpu', self.frame)
+
+    def _add(self, table, name, ms, source, frame):
+        window = table.get(name)
+        if window is None:
+            window = table[name] = deque(maxlen=self.history)
+        window.append(ms)
+        if self.record:
+            self.samples.append((frame, name, source, ms))
+
+    def _query_value(self, query):
+        glGetQueryObjectui64v(query, gl.GL_QUERY_RESULT, ctypes.byref(self._result))
+        return self._result.value
+
+    def _collect(self, slot):
+        """Lê as consultas de um conjunto, sem esperar a GPU, e devolve-as ao pool"""
+        queries = self._queries[slot]
+        if not queries:
+            return
+        # A última consulta do frame é a última a ficar pronta
+        if gl.glGetQueryObjectiv(queries[-1][2], gl.GL_QUERY_RESULT_AVAILABLE):
+            frame_gpu = {}
+            for name, start_query, end_query in queries:
+                ms = (self._query_value(end_query) - self._query_value(start_query)) / 1e6
+                frame_gpu[name] = frame_gpu.get(name, 0.0) + ms
+            for name, ms in frame_gpu.items():
+                self._add(self.gpu_times, name, ms, 'gpu', self._query_frames[slot])
+        else:
+            self.dropped_gpu_frames += 1
+        for _name, start_query, end_query in queries:
+            self._query_pool.extend((start_query, end_query))
+        queries.clear()
+
+    def percentiles(self, name, source='cpu'):
+        """(p50, p95, p99) em ms de uma fase, ou None sem amostras"""
+        window = (self.cpu_times if source == 'cpu' else self.gpu_times).get(name)
+        if not window:
+            return None
+        return tuple(np.percentile(np.fromiter(window, dtype=np.float64), PERCENTILES))
+
+    def report(self):
+        """Linhas (fase, amostras, percentis de CPU, percentis de GPU ou None), na ordem das fases"""
+        return [(name, len(window), self.percentiles(name, 'cpu'), self.percentiles(name, 'gpu'))
+                for name, window in self.cpu_times.items() if window]
+
+    def overlay_lines(self):
+        """Texto do HUD: uma linha por fase com p50/p95/p99 de CPU e GPU em ms"""
+        lines = []
+        for name, _count, cpu, gpu_ms in self.report():
+            indent = '  ' * name.count('/')
+            text = f"{indent}{name.rsplit('/', 1)[-1]}: cpu {cpu[0]:.2f}/{cpu[1]:.2f}/{cpu[2]:.2f}"
+            if gpu_ms is not None:
+                text += f"  gpu {gpu_ms[0]:.2f}/{gpu_ms[1]:.2f}/{gpu_ms[2]:.2f}"
+            lines.append(text)
+        return lines
+
+    def export_csv(self, path):
+        """Grava os percentis de cada fase em CSV (uma linha por fase)"""
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(('phase', 'samples', 'cpu_p50_ms', 'cpu_p95_ms', 'cpu_p99_ms',
+                             'gpu_p50_ms', 'gpu_p95_ms', 'gpu_p99_ms'))
+            for name, count, cpu, gpu_ms in self.report():
+                gpu_ms = gpu_ms if gpu_ms is not None else ('', '', '')
+                writer.writerow((name, count) + tuple(f"{v:.4f}" if v != '' else v for v in cpu + gpu_ms))
+
+    def export_samples_csv(self, path):
+        """Grava todas as amostras registradas (record=True): frame, fase, origem, ms"""
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(('frame', 'phase', 'source', 'ms'))
+            for frame, name, source, ms in self.samples:
+                writer.writerow((frame, name, source, f"{ms:.4f}"))
+
+    def delete(self):
+        queries = list(self._query_pool)
+        for slot_queries in self._queries:
+            for _name, start_query, end_query in slot_queries:
+                queries.extend((start_query, end_query))
+        if queries:
+            gl.glDeleteQueries(len(queries), queries)
+        self._query_pool = []
+        self._queries = [[] for _ in range(QUERY_BUFFERS)]
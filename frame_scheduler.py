@@ -0,0 +1,147 @@
+"""
+Ritmo de quadros (frame pacing) para o Explorador 3D do Sistema Solar.
+
+Substitui a espera fixa após cada flip por um agendador com modos:
+
+- uncapped: sem espera, o mais rápido possível
+- vsync: a troca de buffers espera o retraço vertical (intervalo de troca 1)
+- target: taxa alvo; cada frame começa em um prazo absoluto (sem acumular
+  erro), dormindo até pouco antes dele e completando com espera ativa, já que
+  time.sleep pode acordar milissegundos depois do pedido
+- power_save: como target, mas cai para uma taxa baixa enquanto a simulação
+  está pausada e não há entrada do usuário
+
+O agendador mede o intervalo real entre apresentações (média, desvio padrão
+e pior desvio em relação ao intervalo alvo, ou seja, o jitter) e a latência
+entre a leitura de uma entrada do usuário e a apresentação do frame que a
+reflete.
+"""
+
+import time
+from collections import deque
+
+import numpy as np
+
+FRAME_MODES = ('uncapped', 'vsync', 'target', 'power_save')
+DEFAULT_FRAME_MODE = 'target'
+DEFAULT_TARGET_FPS = 60.0
+# Taxa do modo power_save enquanto pausado e sem entrada
+IDLE_FPS = 10.0
+# Parte final da espera feita com espera ativa em vez de time.sleep
+SPIN_SECONDS = 0.002
+# Frames guardados para as estatísticas
+FRAME_HISTORY = 240
+
+class FrameScheduler:
+    """Decide quando cada frame começa e mede intervalos e latência"""
+
+    def __init__(self, mode=DEFAULT_FRAME_MODE, target_fps=DEFAULT_TARGET_FPS, idle_fps=IDLE_FPS,
+                 spin_seconds=SPIN_SECONDS):
+        if mode not in FRAME_MODES:
+            raise ValueError(f"Modo de quadros desconhecido: {mode} (use {', '.join(FRAME_MODES)})")
+        self.mode = mode
+        self.target_fps = target_fps
+        self.idle_fps = idle_fps
+        self.spin_seconds = spin_seconds
+        self.deadline = None
+        self.idle = False
+        self.last_present = None
+        self.pending_input = None
+        self.intervals = deque(maxlen=FRAME_HISTORY)
+        self.latencies = deque(maxlen=FRAME_HISTORY)
+        # Tempo total dormindo e em espera ativa (s)
+        self.slept = 0.0
+        self.spun = 0.0
+
+    @property
+    def uses_vsync(self):
+        return self.mode == 'vsync'
+
+    def vsync_unavailable(self):
+        """O driver recusou o vsync: passa a usar a taxa alvo"""
+        print(f"Vsync indisponível: usando taxa alvo de {self.target_fps:.0f} FPS")
+        self.mode = 'target'
+
+    def frame_period(self):
+        """Intervalo alvo entre frames (s), ou 0 se o agendador não espera"""
+        if self.mode == 'target':
+            return 1.0 / self.target_fps
+        if self.mode == 'power_save':
+            return 1.0 / (self.idle_fps if self.idle else self.target_fps)
+        return 0.0
+
+    def wait(self, idle=False):
+        """
+        Espera até o início do próximo frame.
+
+        Args:
+            idle: Simulação pausada (usado pelo modo power_save); uma entrada
+                do usuário ainda pendente cancela o modo ocioso
+        """
+        self.idle = idle and self.pending_input is None
+        period = self.frame_period()
+        now = time.perf_counter()
+        if period == 0.0:
+            self.deadline = now
+            return
+        if self.deadline is None or now - self.deadline > period:
+            # Primeiro frame ou frame muito atrasado: recomeça a contagem a partir de agora
+            self.deadline = now
+            return
+        self.deadline += period
+        remaining = self.deadline - now
+        if remaining > self.spin_seconds:
+            time.sleep(remaining - self.spin_seconds)
+            self.slept += remaining - self.spin_seconds
+        spin_start = time.perf_counter()
+        while time.perf_counter() < self.deadline:
+            pass
+        self.spun += time.perf_counter() - spin_start
+
+    def input_received(self):
+        """Uma entrada do usuário foi lida neste frame (a primeira conta para a latência)"""
+        if self.pending_input is None:
+            self.pending_input = time.perf_counter()
+
+    def frame_presented(self):
+        """Registra a apresentação do frame (chamado logo após o flip)"""
+        now = time.perf_counter()
+        if self.last_present is not None:
+            self.intervals.append(now - self.last_present)
+        self.last_present = now
+        if self.pending_input is not None:
+            self.latencies.append(now - self.pending_input)
+            self.pending_input = None
+
+    def statistics(self):
+        """Resumo dos últimos frames, em milissegundos"""
+        intervals = np.array(self.intervals) * 1000.0
+        latencies = np.array(self.latencies) * 1000.0
+        period = self.frame_period() * 1000.0
+        stats = {'mode': self.mode, 'frames': len(intervals)}
+        if len(intervals):
+            reference = period if period else intervals.mean()
+            stats.update({
+                'fps': 1000.0 / intervals.mean(),
+                'frame_ms': float(intervals.mean()),
+                'jitter_ms': float(intervals.std()),
+                'max_deviation_ms': float(np.abs(intervals - reference).max()),
+                'p99_frame_ms': float(np.percentile(intervals, 99)),
+            })
+        if len(latencies):
+            stats.update({
+                'latency_ms': float(latencies.mean()),
+                'p95_latency_ms': float(np.percentile(latencies, 95)),
+            })
+        return stats
+
+    def summary(self):
+        """Uma linha de texto com as estatísticas (HUD e console)"""
+        stats = self.statistics()
+        if 'frame_ms' not in stats:
+            return f"Quadros: {self.mode}"
+        text = (f"Quadros: {self.mode} {stats['fps']:.0f} FPS  {stats['frame_ms']:.1f} ms "
+                f"±{stats['jitter_ms']:.2f} ms (pior {stats['max_deviation_ms']:.1f} ms)")
+        if 'latency_ms' in stats:
+            text += f"  latência {stats['latency_ms']:.1f} ms"
+        return text
@@ -0,0 +1,142 @@
+"""
+Malhas residentes na GPU (VAO/VBO/EBO) para o Explorador 3D do Sistema Solar.
+
+Os dados de um modelo OBJ lido pelo pywavefront são convertidos uma única vez,
+no carregamento, em um buffer de vértices intercalado (posição, normal,
+coordenada de textura) e um buffer de índices. O desenho é feito pelo pipeline
+de shaders com um glDrawElements por material, sem enviar vértices em modo
+imediato a cada frame.
+"""
+
+import ctypes
+import numpy as np
+import OpenGL.GL as gl
+
+from shading_models import ATTRIB_POSITION, ATTRIB_NORMAL, ATTRIB_TEXCOORD
+
+# Layout intercalado de cada vértice: posição (3), normal (3), texcoord (2)
+VERTEX_STRIDE_FLOATS = 8
+
+def parse_vertex_format(vertex_format):
+    """
+    Interpreta um formato de vértice do pywavefront (ex: 'T2F_N3F_V3F').
+
+    Returns:
+        tuple: ({componente: (offset, tamanho)}, stride em floats)
+    """
+    layout = {}
+    offset = 0
+    for component in vertex_format.split('_'):
+        size = int(component[1:-1])
+        layout[component[0]] = (offset, size)
+        offset += size
+    return layout, offset
+
+def compute_face_normals(positions):
+    """Normais por face para triângulos não indexados (usado quando o OBJ não tem normais)"""
+    tris = positions.reshape(-1, 3, 3)
+    normals = np.cross(tris[:, 1] - tris[:, 0], tris[:, 2] - tris[:, 0])
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    normals = np.divide(normals, lengths, out=np.zeros_like(normals), where=lengths > 0)
+    return np.repeat(normals, 3, axis=0)
+
+def build_mesh_arrays(wavefront):
+    """
+    Converte um pywavefront.Wavefront em arrays indexados prontos para a GPU.
+
+    Vértices repetidos (mesma posição, normal e texcoord) são unificados,
+    de modo que o buffer de índices referencia cada vértice uma única vez.
+
+    Returns:
+        tuple: (vertices (N, 8) float32, indices uint32,
+                lista de (nome do material, primeiro índice, quantidade))
+    """
+    vertex_blocks = []
+    index_blocks = []
+    ranges = []
+    base_vertex = 0
+    first_index = 0
+    for mesh in wavefront.meshes.values():
+        for material in mesh.materials:
+            if not material.vertices:
+                continue
+            layout, stride = parse_vertex_format(material.vertex_format)
+            data = np.asarray(material.vertices, dtype=np.float32).reshape(-1, stride)
+            interleaved = np.zeros((len(data), VERTEX_STRIDE_FLOATS), dtype=np.float32)
+
+            offset, size = layout['V']
+            interleaved[:, 0:3] = data[:, offset:offset + 3]
+            if 'N' in layout:
+                offset, size = layout['N']
+                interleaved[:, 3:6] = data[:, offset:offset + 3]
+            else:
+                interleaved[:, 3:6] = compute_face_normals(interleaved[:, 0:3])
+            if 'T' in layout:
+                offset, size = layout['T']
+                interleaved[:, 6:8] = data[:, offset:offset + 2]
+
+            # Unificar vértices repetidos
+            unique, inverse = np.unique(interleaved, axis=0, return_inverse=True)
+            indices = inverse.reshape(-1).astype(np.uint32) + base_vertex
+
+            vertex_blocks.append(unique)
+            index_blocks.append(indices)
+            ranges.append((material.name, first_index, len(indices)))
+            base_vertex += len(unique)
+            first_index += len(indices)
+
+    if not vertex_blocks:
+        return (np.zeros((0, VERTEX_STRIDE_FLOATS), dtype=np.float32),
+                np.zeros(0, dtype=np.uint32), [])
+    return np.concatenate(vertex_blocks), np.concatenate(index_blocks), ranges
+
+class GpuMesh:
+    """Malha indexada residente na GPU, desenhada com um glDrawElements por material"""
+
+    def __init__(self, vertices, indices, ranges):
+        vertices = np.ascontiguousarray(vertices, dtype=np.float32)
+        indices = np.ascontiguousarray(indices, dtype=np.uint32)
+        self.ranges = list(ranges)
+        self.vertex_count = len(vertices)
+        # Raio da esfera envolvente em torno da origem do modelo (recorte pelo volume de visão)
+        self.bounding_radius = float(np.sqrt((vertices[:, :3] ** 2).sum(axis=1).max())) if len(vertices) else 0.0
+        self.index_count = len(indices)
+
+        self.vao = gl.glGenVertexArrays(1)
+        gl.glBindVertexArray(self.vao)
+
+        self.vbo = gl.glGenBuffers(1)
+        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self.vbo)
+        gl.glBufferData(gl.GL_ARRAY_BUFFER, vertices.nbytes, vertices, gl.GL_STATIC_DRAW)
+
+        # Atributos configurados uma única vez; ficam gravados no VAO
+        stride = VERTEX_STRIDE_FLOATS * 4
+        gl.glEnableVertexAttribArray(ATTRIB_POSITION)
+        gl.glVertexAttribPointer(ATTRIB_POSITION, 3, gl.GL_FLOAT, gl.GL_FALSE, stride, ctypes.c_void_p(0))
+        gl.glEnableVertexAttribArray(ATTRIB_NORMAL)
+        gl.glVertexAttribPointer(ATTRIB_NORMAL, 3, gl.GL_FLOAT, gl.GL_FALSE, stride, ctypes.c_void_p(12))
+        gl.glEnableVertexAttribArray(ATTRIB_TEXCOORD)
+        gl.glVertexAttribPointer(ATTRIB_TEXCOORD, 2, gl.GL_FLOAT, gl.GL_FALSE, stride, ctypes.c_void_p(24))
+
+        self.ebo = gl.glGenBuffers(1)
+        gl.glBindBuffer(gl.GL_ELEMENT_ARRAY_BUFFER, self.ebo)
+        gl.glBufferData(gl.GL_ELEMENT_ARRAY_BUFFER, indices.nbytes, indices, gl.GL_STATIC_DRAW)
+
+        gl.glBindVertexArray(0)
+
+    @classmethod
+    def from_wavefront(cls, wavefront):
+        """Cria a malha a partir de um modelo já lido pelo pywavefront"""
+        return cls(*build_mesh_arrays(wavefront))
+
+    def draw(self):
+        """Desenha a malha com o programa de shader atualmente em uso"""
+        gl.glBindVertexArray(self.vao)
+        for _name, first, count in self.ranges:
+            gl.glDrawElements(gl.GL_TRIANGLES, count, gl.GL_UNSIGNED_INT, ctypes.c_void_p(first * 4))
+        gl.glBindVertexArray(0)
+
+    def delete(self):
+        """Libera os buffers da GPU"""
+        gl.glDeleteBuffers(2, [self.vbo, self.ebo])
+        gl.glDeleteVertexArrays(1, [self.vao])
@@ -0,0 +1,252 @@
+"""
+HUD (textos sobrepostos à cena) para o Explorador 3D do Sistema Solar.
+
+Os glifos da fonte são rasterizados uma única vez pelo pygame em um atlas de
+textura (empacotados em prateleiras). A cada frame, todos os textos do HUD
+(avisos de colisão, FPS, estatísticas) viram quads texturizados em um único
+buffer de vértices e são desenhados com um único glDrawArrays, sem criar
+fontes, superfícies ou texturas durante o loop.
+
+Os avisos ficam em uma fila com prazo de validade: aparecem no topo da tela,
+somem gradualmente e são removidos sem nunca bloquear o loop principal.
+Avisos repetidos enquanto o anterior ainda está na tela são agrupados
+("... (x3)") em vez de empilhados.
+"""
+
+import ctypes
+import string
+import time
+from collections import deque
+
+import numpy as np
+import pygame
+import OpenGL.GL as gl
+
+from shading_models import ATTRIB_POSITION, ATTRIB_TEXCOORD, ATTRIB_COLOR, get_hud_program
+
+HUD_FONT = "Arial"
+HUD_FONT_SIZE = 28
+# Caracteres rasterizados no atlas; os demais são desenhados como '?'
+HUD_CHARACTERS = string.ascii_letters + string.digits + string.punctuation + " áàâãéêíóôõúüçÁÀÂÃÉÊÍÓÔÕÚÜÇ°"
+ATLAS_WIDTH = 512
+GLYPH_PADDING = 2
+
+# Avisos na tela: duração, quantos ao mesmo tempo e tempo de desaparecimento
+MESSAGE_SECONDS = 2.0
+MAX_MESSAGES = 6
+FADE_SECONDS = 0.5
+WARNING_COLOR = (1.0, 0.31, 0.31, 1.0)
+STATS_COLOR = (0.85, 0.85, 0.85, 1.0)
+# Margem (pixels) e escala das linhas de estatísticas em relação aos avisos
+HUD_MARGIN = 10
+STATS_SCALE = 0.6
+
+# Cada vértice: posição (2), coordenada de textura (2), cor (4)
+VERTEX_FLOATS = 8
+VERTEX_STRIDE = VERTEX_FLOATS * 4
+DEFAULT_MAX_GLYPHS = 1024
+
+def screen_matrix(width, height):
+    """Projeção ortográfica de pixels (origem no canto superior esquerdo, y para baixo) para NDC"""
+    return np.array([
+        [2.0 / width, 0.0, 0.0, -1.0],
+        [0.0, -2.0 / height, 0.0, 1.0],
+        [0.0, 0.0, 1.0, 0.0],
+        [0.0, 0.0, 0.0, 1.0]
+    ], dtype=np.float32)
+
+class GlyphAtlas:
+    """Glifos de uma fonte rasterizados uma única vez em uma textura"""
+
+    def __init__(self, font_name=HUD_FONT, size=HUD_FONT_SIZE, bold=True, characters=HUD_CHARACTERS):
+        font = pygame.font.SysFont(font_name, size, bold=bold)
+        self.line_height = font.get_linesize()
+        characters = ''.join(dict.fromkeys(characters + '?'))
+        self.index = {ch: i for i, ch in enumerate(characters)}
+        surfaces = [font.render(ch, True, (255, 255, 255)) for ch in characters]
+
+        # Empacotamento em prateleiras: glifos lado a lado, nova linha quando não cabem
+        self.sizes = np.array([surface.get_size() for surface in surfaces], dtype=np.float32)
+        origins = np.zeros((len(surfaces), 2), dtype=np.float32)
+        x = y = row_height = 0
+        for i, (w, h) in enumerate(self.sizes.astype(int)):
+            if x + w > ATLAS_WIDTH:
+                x, y, row_height = 0, y + row_height + GLYPH_PADDING, 0
+            origins[i] = (x, y)
+            x += w + GLYPH_PADDING
+            row_height = max(row_height, h)
+        height = 1 << int(np.ceil(np.log2(max(y + row_height, 1))))
+
+        atlas = pygame.Surface((ATLAS_WIDTH, height), pygame.SRCALPHA)
+        atlas.fill((0, 0, 0, 0))
+        for surface, origin in zip(surfaces, origins.astype(int)):
+            atlas.blit(surface, tuple(origin))
+        # Coordenadas de textura (u0, v0, u1, v1) de cada glifo; linha 0 da imagem = v 0
+        scale = np.array([ATLAS_WIDTH, height], dtype=np.float32)
+        self.uv = np.concatenate((origins / scale, (origins + self.sizes) / scale), axis=1)
+
+        self.texture = gl.glGenTextures(1)
+        gl.glBindTexture(gl.GL_TEXTURE_2D, self.texture)
+        gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MIN_FILTER, gl.GL_LINEAR)
+        gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MAG_FILTER, gl.GL_LINEAR)
+        gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_WRAP_S, gl.GL_CLAMP_TO_EDGE)
+        gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_WRAP_T, gl.GL_CLAMP_TO_EDGE)
+        gl.glTexImage2D(gl.GL_TEXTURE_2D, 0, gl.GL_RGBA, ATLAS_WIDTH, height, 0, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE,
+                        pygame.image.tostring(atlas, 'RGBA', False))
+        gl.glBindTexture(gl.GL_TEXTURE_2D, 0)
+
+    def glyphs(self, text):
+        """Índices dos glifos de um texto"""
+        fallback = self.index['?']
+        return np.array([self.index.get(ch, fallback) for ch in text], dtype=np.int64)
+
+    def text_width(self, text, scale=1.0):
+        return float(self.sizes[self.glyphs(text), 0].sum()) * scale
+
+    def layout(self, text, x, y, color, scale=1.0):
+        """
+        Vértices (6 por glifo, VERTEX_FLOATS cada) de uma linha de texto.
+
+        Args:
+            x, y: Canto superior esquerdo da linha, em pixels
+            color: Cor RGBA
+        """
+        glyphs = self.glyphs(text)
+        sizes = self.sizes[glyphs] * scale
+        left = x + np.concatenate(([0.0], np.cumsum(sizes[:-1, 0])))
+        right = left + sizes[:, 0]
+        top = np.full(len(glyphs), y, dtype=np.float32)
+        bottom = top + sizes[:, 1]
+        u0, v0, u1, v1 = self.uv[glyphs].T
+
+        # Dois triângulos por glifo: (esq, topo) (esq, base) (dir, base) / (esq, topo) (dir, base) (dir, topo)
+        corners = np.stack((
+            np.stack((left, top, u0, v0), axis=1),
+            np.stack((left, bottom, u0, v1), axis=1),
+            np.stack((right, bottom, u1, v1), axis=1),
+            np.stack((left, top, u0, v0), axis=1),
+            np.stack((right, bottom, u1, v1), axis=1),
+            np.stack((right, top, u1, v0), axis=1),
+        ), axis=1).reshape(-1, 4)
+        vertices = np.empty((len(corners), VERTEX_FLOATS), dtype=np.float32)
+        vertices[:, :4] = corners
+        vertices[:, 4:] = color
+        return vertices
+
+    def delete(self):
+        gl.glDeleteTextures([self.texture])
+
+class HUD:
+    """Textos do HUD desenhados de uma vez no fim de cada frame"""
+
+    def __init__(self, width, height, atlas=None, max_glyphs=DEFAULT_MAX_GLYPHS):
+        self.program = get_hud_program()
+        self.atlas = atlas if atlas is not None else GlyphAtlas()
+        self.resize(width, height)
+        # Avisos: [texto, cor, instante de expiração, repetições]
+        self.messages = deque(maxlen=MAX_MESSAGES)
+        # Linhas fixas no canto superior esquerdo (FPS, estatísticas), por chave
+        self.lines = {}
+        self.glyph_count = 0
+
+        self.capacity = max_glyphs
+        self.vao = gl.glGenVertexArrays(1)
+        self.vbo = gl.glGenBuffers(1)
+        gl.glBindVertexArray(self.vao)
+        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self.vbo)
+        gl.glBufferData(gl.GL_ARRAY_BUFFER, self.capacity * 6 * VERTEX_STRIDE, None, gl.GL_STREAM_DRAW)
+        for location, size, offset in ((ATTRIB_POSITION, 2, 0), (ATTRIB_TEXCOORD, 2, 8), (ATTRIB_COLOR, 4, 16)):
+            gl.glEnableVertexAttribArray(location)
+            gl.glVertexAttribPointer(location, size, gl.GL_FLOAT, gl.GL_FALSE, VERTEX_STRIDE, ctypes.c_void_p(offset))
+        gl.glBindVertexArray(0)
+        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, 0)
+
+    def resize(self, width, height):
+        self.width, self.height = width, height
+        self.screen = screen_matrix(width, height)
+
+    def push(self, text, duration=MESSAGE_SECONDS, color=WARNING_COLOR, now=None):
+        """Enfileira um aviso por 'duration' segundos (não bloqueia)"""
+        now = time.perf_counter() if now is None else now
+        for message in self.messages:
+            if message[0] == text and message[2] > now:
+                message[2] = now + duration
+                message[3] += 1
+                return
+        self.messages.append([text, color, now + duration, 1])
+
+    def set_line(self, key, text):
+        """Define (ou remove, com None) uma linha fixa do canto superior esquerdo"""
+        if text is None:
+            self.lines.pop(key, None)
+        else:
+            self.lines[key] = text
+
+    def clear(self):
+        self.messages.clear()
+
+    def build_vertices(self, now):
+        """Vértices de todos os textos visíveis no instante 'now'"""
+        while self.messages and self.messages[0][2] <= now:
+            self.messages.popleft()
+        atlas = self.atlas
+        parts = []
+
+        y = HUD_MARGIN
+        for text in self.lines.values():
+            parts.append(atlas.layout(text, HUD_MARGIN, y, STATS_COLOR, STATS_SCALE))
+            y += atlas.line_height * STATS_SCALE
+
+        y = 40
+        for text, color, expires, count in self.messages:
+            if expires <= now:
+                continue
+            if count > 1:
+                text = f"{text} (x{count})"
+            alpha = color[3] * min(1.0, (expires - now) / FADE_SECONDS)
+            x = (self.width - atlas.text_width(text)) / 2
+            parts.append(atlas.layout(text, x, y, (color[0], color[1], color[2], alpha)))
+            y += atlas.line_height
+
+        if not parts:
+            return np.zeros((0, VERTEX_FLOATS), dtype=np.float32)
+        return np.concatenate(parts)
+
+    def draw(self, now=None):
+        """Desenha todo o HUD sobre a cena com um único glDrawArrays"""
+        vertices = self.build_vertices(time.perf_counter() if now is None else now)
+        self.glyph_count = len(vertices) // 6
+        if len(vertices) == 0:
+            return
+
+        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self.vbo)
+        if self.glyph_count > self.capacity:
+            self.capacity = max(self.glyph_count, 2 * self.capacity)
+            gl.glBufferData(gl.GL_ARRAY_BUFFER, self.capacity * 6 * VERTEX_STRIDE, None, gl.GL_STREAM_DRAW)
+        gl.glBufferSubData(gl.GL_ARRAY_BUFFER, 0, vertices.nbytes, vertices)
+
+        depth_test = gl.glIsEnabled(gl.GL_DEPTH_TEST)
+        gl.glDisable(gl.GL_DEPTH_TEST)
+        gl.glEnable(gl.GL_BLEND)
+        gl.glBlendFunc(gl.GL_SRC_ALPHA, gl.GL_ONE_MINUS_SRC_ALPHA)
+
+        self.program.use()
+        self.program.set_mat4("screen", self.screen)
+        gl.glActiveTexture(gl.GL_TEXTURE0)
+        gl.glBindTexture(gl.GL_TEXTURE_2D, self.atlas.texture)
+        self.program.set_int("atlas", 0)
+        gl.glBindVertexArray(self.vao)
+        gl.glDrawArrays(gl.GL_TRIANGLES, 0, len(vertices))
+
+        gl.glBindVertexArray(0)
+        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, 0)
+        gl.glBindTexture(gl.GL_TEXTURE_2D, 0)
+        gl.glUseProgram(0)
+        gl.glDisable(gl.GL_BLEND)
+        if depth_test:
+            gl.glEnable(gl.GL_DEPTH_TEST)
+
+    def delete(self):
+        gl.glDeleteBuffers(1, [self.vbo])
+        gl.glDeleteVertexArrays(1, [self.vao])
+        self.atlas.delete()
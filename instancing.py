@@ -0,0 +1,193 @@
+"""
+Desenho instanciado de esferas para o Explorador 3D do Sistema Solar.
+
+Os corpos de um frame (planetas, luas, asteroides) são acumulados e enviados
+de uma só vez: as matrizes de modelo e as camadas de textura de todas as
+instâncias vão para um único buffer de instâncias, e cada grupo de corpos que
+compartilha o mesmo modelo de iluminação e o mesmo nível de detalhe é
+desenhado com um único glDrawElementsInstanced. O número de chamadas de
+desenho depende apenas de (programas x níveis de detalhe), e não da
+quantidade de corpos.
+"""
+
+import ctypes
+import numpy as np
+import OpenGL.GL as gl
+
+from shading_models import ATTRIB_INSTANCE_MODEL, ATTRIB_INSTANCE_LAYER
+from sphere_mesh import projected_radius
+
+# Cada instância: mat4 de modelo (coluna-maior, como o atributo GLSL) + camada
+INSTANCE_FLOATS = 17
+INSTANCE_STRIDE = INSTANCE_FLOATS * 4
+DEFAULT_MAX_INSTANCES = 1024
+
+def instance_records(positions, scales, rotations, layers):
+    """
+    Monta os registros de instância (N, 17) para matrizes T @ Ry @ S.
+
+    Args:
+        positions: Posições (N, 3)
+        scales: Escalas uniformes (N,)
+        rotations: Rotação própria em torno de Y, em graus (N,)
+        layers: Camadas do array de texturas (N,)
+    """
+    n = len(positions)
+    angles = np.radians(rotations)
+    c = np.cos(angles) * scales
+    s = np.sin(angles) * scales
+    records = np.zeros((n, INSTANCE_FLOATS), dtype=np.float32)
+    # Colunas da matriz de modelo
+    records[:, 0] = c
+    records[:, 2] = -s
+    records[:, 5] = scales
+    records[:, 8] = s
+    records[:, 10] = c
+    records[:, 12:15] = positions
+    records[:, 15] = 1.0
+    records[:, 16] = layers
+    return records
+
+class InstancedSphereRenderer:
+    """Acumula esferas durante o frame e as desenha agrupadas por programa e nível de detalhe"""
+
+    def __init__(self, sphere_lod, programs, texture_array, max_instances=DEFAULT_MAX_INSTANCES):
+        """
+        Args:
+            sphere_lod: SphereLOD com as malhas de cada nível
+            programs: {nome: ShaderProgram instanciado}
+            texture_array: TextureArray com as texturas dos corpos
+            max_instances: Capacidade inicial do buffer de instâncias (cresce se necessário)
+        """
+        self.sphere_lod = sphere_lod
+        self.programs = dict(programs)
+        self._program_index = {name: i for i, name in enumerate(self.programs)}
+        self._program_list = list(self.programs.values())
+        self.texture_array = texture_array
+        self.capacity = max_instances
+        self.draw_calls = 0
+        self.instance_count = 0
+
+        self.instance_vbo = gl.glGenBuffers(1)
+        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self.instance_vbo)
+        gl.glBufferData(gl.GL_ARRAY_BUFFER, self.capacity * INSTANCE_STRIDE, None, gl.GL_STREAM_DRAW)
+
+        # Os atributos por instância são acrescentados ao VAO de cada nível de detalhe
+        for mesh in sphere_lod.meshes:
+            gl.glBindVertexArray(mesh.vao)
+            gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self.instance_vbo)
+            for location in range(ATTRIB_INSTANCE_MODEL, ATTRIB_INSTANCE_MODEL + 4):
+                gl.glEnableVertexAttribArray(location)
+                gl.glVertexAttribDivisor(location, 1)
+            gl.glEnableVertexAttribArray(ATTRIB_INSTANCE_LAYER)
+            gl.glVertexAttribDivisor(ATTRIB_INSTANCE_LAYER, 1)
+            self._point_instances(0)
+        gl.glBindVertexArray(0)
+        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, 0)
+
+        self.begin()
+
+    def _point_instances(self, first_instance):
+        """Aponta os atributos por instância para o registro first_instance (VAO e buffer já ligados)"""
+        offset = first_instance * INSTANCE_STRIDE
+        for column in range(4):
+            gl.glVertexAttribPointer(ATTRIB_INSTANCE_MODEL + column, 4, gl.GL_FLOAT, gl.GL_FALSE,
+                                     INSTANCE_STRIDE, ctypes.c_void_p(offset + column * 16))
+        gl.glVertexAttribPointer(ATTRIB_INSTANCE_LAYER, 1, gl.GL_FLOAT, gl.GL_FALSE,
+                                 INSTANCE_STRIDE, ctypes.c_void_p(offset + 64))
+
+    def begin(self):
+        """Inicia a coleta de instâncias de um frame"""
+        self._batches = []
+
+    def add(self, program_name, position, scale, texture_name, rotation=0.0):
+        """Adiciona uma esfera ao frame"""
+        self.add_many(program_name, np.asarray([position], dtype=np.float32), [scale],
+                      [self.texture_array.layer(texture_name)], [rotation])
+
+    def add_many(self, program_name, positions, scales, layers, rotations=None):
+        """Adiciona várias esferas de uma vez (arrays com uma linha por instância)"""
+        positions = np.asarray(positions, dtype=np.float32).reshape(-1, 3)
+        n = len(positions)
+        if n == 0:
+            return
+        scales = np.broadcast_to(np.asarray(scales, dtype=np.float32), (n,))
+        layers = np.broadcast_to(np.asarray(layers, dtype=np.float32), (n,))
+        rotations = np.zeros(n, dtype=np.float32) if rotations is None else \
+            np.broadcast_to(np.asarray(rotations, dtype=np.float32), (n,))
+        records = instance_records(positions, scales, rotations, layers)
+        self._batches.append((self._program_index[program_name], records, positions, scales))
+
+    def add_models(self, program_name, models, radii, layers):
+        """
+        Adiciona esferas a partir de matrizes de modelo já montadas (ex: do grafo de cena).
+
+        Args:
+            models: Matrizes de modelo (N, 4, 4), linha-maior
+            radii: Raio de cada esfera no mundo, usado na escolha do nível de detalhe (N,)
+            layers: Camadas do array de texturas (N,)
+        """
+        models = np.asarray(models, dtype=np.float32).reshape(-1, 4, 4)
+        n = len(models)
+        if n == 0:
+            return
+        records = np.empty((n, INSTANCE_FLOATS), dtype=np.float32)
+        # Linha-maior transposta = colunas da matriz, como o atributo GLSL espera
+        records[:, :16] = models.transpose(0, 2, 1).reshape(n, 16)
+        records[:, 16] = layers
+        positions = np.ascontiguousarray(models[:, :3, 3])
+        radii = np.broadcast_to(np.asarray(radii, dtype=np.float32), (n,))
+        self._batches.append((self._program_index[program_name], records, positions, radii))
+
+    def flush(self, frame):
+        """Envia todas as instâncias do frame e as desenha, um glDrawElementsInstanced por grupo"""
+        batches = self._batches
+        self.begin()
+        self.draw_calls = 0
+        self.instance_count = 0
+        if not batches:
+            return
+
+        program_ids = np.concatenate([np.full(len(b[1]), b[0]) for b in batches])
+        records = np.concatenate([b[1] for b in batches])
+        positions = np.concatenate([b[2] for b in batches])
+        scales = np.concatenate([b[3] for b in batches])
+        n = len(positions)
+
+        # Nível de detalhe de cada instância pelo raio projetado na tela
+        radii_px = projected_radius(positions, scales, frame.eye, frame.focal_length, frame.viewport_height)
+        levels = self.sphere_lod.select_levels(radii_px)
+
+        # Ordenar por (programa, nível) para que cada grupo seja contíguo no buffer
+        order = np.lexsort((levels, program_ids))
+        records = records[order]
+        keys = program_ids[order] * len(self.sphere_lod.meshes) + levels[order]
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(keys)) + 1))
+        ends = np.append(starts[1:], n)
+
+        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self.instance_vbo)
+        if n > self.capacity:
+            self.capacity = max(n, 2 * self.capacity)
+            gl.glBufferData(gl.GL_ARRAY_BUFFER, self.capacity * INSTANCE_STRIDE, None, gl.GL_STREAM_DRAW)
+        gl.glBufferSubData(gl.GL_ARRAY_BUFFER, 0, records.nbytes, records)
+
+        self.texture_array.bind(0)
+        for start, end in zip(starts, ends):
+            key = int(keys[start])
+            program = self._program_list[key // len(self.sphere_lod.meshes)]
+            mesh = self.sphere_lod.meshes[key % len(self.sphere_lod.meshes)]
+            program.use()
+            program.set_int("textures", 0)
+            gl.glBindVertexArray(mesh.vao)
+            self._point_instances(int(start))
+            gl.glDrawElementsInstanced(gl.GL_TRIANGLES, mesh.index_count, gl.GL_UNSIGNED_INT, None, int(end - start))
+            self.draw_calls += 1
+        self.instance_count = n
+
+        gl.glBindVertexArray(0)
+        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, 0)
+        gl.glBindTexture(gl.GL_TEXTURE_2D_ARRAY, 0)
+        gl.glUseProgram(0)
+
+    def delete(self):
+        gl.glDeleteBuffers(1, [self.instance_vbo])
@@ -0,0 +1,221 @@
+"""
+Estudo de Monte Carlo da probabilidade de impacto dos asteroides.
+
+Simula muitas trajetórias de asteroides sorteadas como em spawn_asteroid
+(ponto inicial, pontos de controle e planeta alvo aleatórios) e mede, para
+cada uma, qual planeta foi atingido (o alvo, outro planeta antes dele ou
+nenhum), o tempo até o impacto e a menor distância a um planeta ao longo da
+trajetória (quase-colisões).
+
+As trajetórias são divididas em blocos executados em um pool de processos;
+cada bloco é um SimulationEngine independente (sem pygame/OpenGL) que avança
+todos os seus asteroides juntos, de forma vetorizada, até o último deles
+colidir ou chegar ao fim da curva. Os asteroides não interagem entre si, então
+um bloco equivale a simular cada trajetória sozinha. Cada bloco tem a sua
+própria semente, derivada de (semente, índice do bloco) com
+np.random.SeedSequence, e começa em um instante sorteado das órbitas: o
+resultado de um bloco não depende do número de processos nem da ordem de
+execução.
+
+Os resultados por trajetória são gravados em colunas (NumPy .npz ou, se o
+pyarrow estiver instalado, Parquet) e o resumo por planeta é impresso.
+
+Uso:
+    python monte_carlo_impacts.py --trajectories 1000000 --seed 1 --output impactos.npz
+"""
+
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from scene_graph import load_scene, DEFAULT_SCENE
+from simulation_engine import SimulationEngine, ASTEROID_SPEED
+
+DEFAULT_TRAJECTORIES = 1000000
+# Asteroides simulados juntos em cada processo
+DEFAULT_CHUNK_SIZE = 20000
+# Passo da simulação (s): as trajetórias e a colisão contínua não dependem do passo,
+# e 0.1 dá os mesmos impactos que 1/240 (ver check_step_independence.py)
+DEFAULT_STEP = 0.1
+DEFAULT_OUTPUT = 'impact_study.npz'
+# Histogramas: tempo até o impacto (s) e menor distância das trajetórias sem impacto
+TIME_BINS = 40
+NEAR_MISS_RANGE = (0.0, 5.0)
+NEAR_MISS_BINS = 50
+# Distância entre superfícies abaixo da qual uma trajetória sem impacto é uma quase-colisão
+NEAR_MISS_DISTANCE = 1.0
+
+# Colunas do arquivo de resultados (uma linha por trajetória); 'hit' e 'closest'
+# valem -1 quando não há planeta, e 'clearance' é <= 0 nas trajetórias com impacto
+COLUMNS = ('chunk', 'epoch', 'target', 'hit', 'time_to_impact', 'clearance', 'closest')
+
+def chunk_seeds(seed, chunks):
+    """Uma SeedSequence independente por bloco, derivada da semente do estudo"""
+    return np.random.SeedSequence(seed).spawn(chunks)
+
+def longest_period(ephemeris):
+    """Maior período orbital (s) entre os corpos do catálogo"""
+    motion = np.abs(ephemeris.mean_motion)
+    return float(360.0 / motion[motion > 0].min())
+
+def simulate_chunk(job):
+    """
+    Simula um bloco de trajetórias até todas terminarem.
+
+    Args:
+        job: (índice do bloco, quantidade, SeedSequence, arquivo de cena, passo,
+            período do qual o instante inicial é sorteado)
+
+    Returns:
+        dict com os arrays das colunas (COLUMNS) do bloco
+    """
+    chunk, count, seed, scene_path, step, period = job
+    epoch_seed, swarm_seed = seed.spawn(2)
+    epoch = np.random.default_rng(epoch_seed).uniform(0.0, period)
+    engine = SimulationEngine(scene_path, seed=swarm_seed, record_events=False, track_clearance=True,
+                              start_time=epoch)
+    swarm = engine.asteroids
+    slots = engine.spawn_asteroids(count)
+    row = np.empty(swarm.count, dtype=np.int64)
+    row[slots] = np.arange(count)
+
+    hit = np.full(count, -1, dtype=np.int16)
+    time_to_impact = np.full(count, np.nan, dtype=np.float32)
+    # A trajetória termina quando a fração percorrida chega a 1; alguns passos a mais por segurança
+    max_ticks = int(np.ceil(1.0 / (ASTEROID_SPEED * step))) + 2
+    for _ in range(max_ticks):
+        if len(swarm) == 0:
+            break
+        asteroids, nodes, times = engine.tick(step)
+        hit[row[asteroids]] = nodes
+        time_to_impact[row[asteroids]] = times - epoch
+
+    return {
+        'chunk': np.full(count, chunk, dtype=np.int32),
+        'epoch': np.full(count, epoch, dtype=np.float64),
+        'target': swarm.target[slots].astype(np.int16),
+        'hit': hit,
+        'time_to_impact': time_to_impact,
+        'clearance': swarm.clearance[slots].copy(),
+        'closest': swarm.closest_node[slots].astype(np.int16),
+    }
+
+def node_names(scene_path=DEFAULT_SCENE):
+    """Nomes dos nós da cena, na ordem dos índices usados nas colunas"""
+    return list(load_scene(scene_path).names)
+
+def run_study(trajectories, chunk_size=DEFAULT_CHUNK_SIZE, seed=0, step=DEFAULT_STEP,
+              scene_path=DEFAULT_SCENE, max_workers=None):
+    """
+    Executa o estudo em um pool de processos.
+
+    Returns:
+        dict com as colunas de todas as trajetórias, na ordem dos blocos
+    """
+    chunks = (trajectories + chunk_size - 1) // chunk_size
+    seeds = chunk_seeds(seed, chunks)
+    period = longest_period(load_scene(scene_path).ephemeris)
+    jobs = [(i, min(chunk_size, trajectories - i * chunk_size), seeds[i], scene_path, step, period)
+            for i in range(chunks)]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(simulate_chunk, jobs))
+    return {name: np.concatenate([result[name] for result in results]) for name in COLUMNS}
+
+def summarize(columns, names):
+    """Taxas de impacto por planeta e histogramas (dicionário serializável em JSON)"""
+    target = columns['target']
+    hit = columns['hit']
+    missed = hit < 0
+    planets = {}
+    for node in np.unique(target):
+        aimed = target == node
+        planets[names[node]] = {
+            'targeted': int(np.count_nonzero(aimed)),
+            'hit_target': int(np.count_nonzero(aimed & (hit == node))),
+            'hit_other': int(np.count_nonzero(aimed & ~missed & (hit != node))),
+            'missed': int(np.count_nonzero(aimed & missed)),
+            'hit_rate': float(np.count_nonzero(aimed & (hit == node)) / max(np.count_nonzero(aimed), 1)),
+            'impacts_received': int(np.count_nonzero(hit == node)),
+            'near_misses': int(np.count_nonzero(missed & (columns['closest'] == node)
+                                                & (columns['clearance'] < NEAR_MISS_DISTANCE))),
+        }
+
+    impact_times = columns['time_to_impact'][~missed]
+    time_counts, time_edges = np.histogram(impact_times, bins=TIME_BINS, range=(0.0, 1.0 / ASTEROID_SPEED))
+    miss_counts, miss_edges = np.histogram(columns['clearance'][missed], bins=NEAR_MISS_BINS, range=NEAR_MISS_RANGE)
+    return {
+        'trajectories': int(len(target)),
+        'impacts': int(np.count_nonzero(~missed)),
+        'impact_rate': float(np.count_nonzero(~missed) / max(len(target), 1)),
+        'median_time_to_impact': float(np.median(impact_times)) if len(impact_times) else None,
+        'planets': planets,
+        'time_to_impact_histogram': {'counts': time_counts.tolist(), 'edges': time_edges.tolist()},
+        'near_miss_histogram': {'counts': miss_counts.tolist(), 'edges': miss_edges.tolist()},
+    }
+
+def write_columns(path, columns, names):
+    """
+    Grava as colunas em Parquet (se o caminho termina em .parquet e o pyarrow
+    está disponível) ou em .npz; devolve o caminho gravado.
+    """
+    if path.endswith('.parquet'):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            path = path[:-len('.parquet')] + '.npz'
+            print(f"pyarrow não instalado: gravando {path}")
+        else:
+            # Índices de nós como nomes (codificados como dicionário no Parquet)
+            labels = np.array(list(names) + ['none'])
+            table = pa.table({
+                name: (pa.array(labels[column]).dictionary_encode() if name in ('target', 'hit', 'closest')
+                       else pa.array(column))
+                for name, column in columns.items()
+            })
+            pq.write_table(table, path)
+            return path
+    np.savez_compressed(path, node_names=np.array(names), **columns)
+    return path
+
+def print_summary(summary):
+    print(f"Trajetórias: {summary['trajectories']}, impactos: {summary['impacts']} "
+          f"({summary['impact_rate']:.1%})")
+    if summary['median_time_to_impact'] is not None:
+        print(f"Tempo mediano até o impacto: {summary['median_time_to_impact']:.2f} s")
+    print(f"{'planeta':<10} {'alvo':>9} {'acertos':>9} {'taxa':>7} {'outro':>8} {'erros':>8} "
+          f"{'recebidos':>10} {'quase':>8}")
+    for name, p in summary['planets'].items():
+        print(f"{name:<10} {p['targeted']:>9} {p['hit_target']:>9} {p['hit_rate']:>7.1%} {p['hit_other']:>8} "
+              f"{p['missed']:>8} {p['impacts_received']:>10} {p['near_misses']:>8}")
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Estudo de Monte Carlo da probabilidade de impacto")
+    parser.add_argument('--trajectories', type=int, default=DEFAULT_TRAJECTORIES, help="trajetórias simuladas")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="trajetórias por bloco")
+    parser.add_argument('--seed', type=int, default=0, help="semente do estudo")
+    parser.add_argument('--step', type=float, default=DEFAULT_STEP, help="duração de cada passo (s)")
+    parser.add_argument('--workers', type=int, default=None, help="processos (padrão: número de CPUs)")
+    parser.add_argument('--scene', default=DEFAULT_SCENE, help="arquivo de cena JSON")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help="arquivo de resultados (.npz ou .parquet)")
+    parser.add_argument('--summary', help="arquivo JSON com o resumo")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    columns = run_study(args.trajectories, args.chunk_size, args.seed, args.step, args.scene, args.workers)
+    elapsed = time.perf_counter() - start
+    names = node_names(args.scene)
+    summary = summarize(columns, names)
+    path = write_columns(args.output, columns, names)
+    if args.summary:
+        with open(args.summary, 'w') as f:
+            json.dump(summary, f, indent=2)
+    print_summary(summary)
+    print(f"{summary['trajectories']} trajetórias em {elapsed:.1f} s; resultados em {path}")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
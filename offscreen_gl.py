@@ -0,0 +1,89 @@
+"""
+Contexto OpenGL sem janela (EGL + pbuffer) para benchmarks e testes.
+
+Funciona com o driver da GPU ou, em máquinas Linux sem GPU, com o renderizador
+por software do Mesa (llvmpipe): a plataforma EGL "surfaceless" não precisa de
+servidor gráfico. O contexto usa o perfil de compatibilidade, já que o
+explorador ainda desenha órbitas, anéis e curvas com o pipeline fixo.
+
+O PyOpenGL escolhe a plataforma (GLX, EGL, ...) na primeira importação de
+OpenGL.GL; por isso este módulo precisa ser importado antes de qualquer
+módulo que use OpenGL. As variáveis PYOPENGL_PLATFORM, EGL_PLATFORM e
+SDL_VIDEODRIVER só são definidas se ainda não existirem, e podem ser
+trocadas no ambiente (ex: EGL_PLATFORM=device em drivers proprietários).
+"""
+
+import os
+import sys
+
+if 'OpenGL.GL' in sys.modules and os.environ.get('PYOPENGL_PLATFORM') != 'egl':
+    raise ImportError("offscreen_gl deve ser importado antes de OpenGL.GL (ou defina PYOPENGL_PLATFORM=egl)")
+os.environ.setdefault('PYOPENGL_PLATFORM', 'egl')
+os.environ.setdefault('EGL_PLATFORM', 'surfaceless')
+# pygame (eventos, fontes) sem abrir janela
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import ctypes
+import numpy as np
+from OpenGL import EGL
+import OpenGL.GL as gl
+
+from shading_models import GL_VERSION_REQUIRED
+
+# EGL_KHR_create_context: perfil de compatibilidade (pipeline fixo disponível)
+EGL_CONTEXT_OPENGL_PROFILE_MASK = 0x30FD
+EGL_CONTEXT_OPENGL_COMPATIBILITY_PROFILE_BIT = 0x2
+
+class OffscreenContext:
+    """Contexto OpenGL atual com uma superfície pbuffer de width x height"""
+
+    def __init__(self, width=1280, height=720):
+        self.width, self.height = width, height
+        self.display = EGL.eglGetDisplay(EGL.EGL_DEFAULT_DISPLAY)
+        major, minor = EGL.EGLint(), EGL.EGLint()
+        if not EGL.eglInitialize(self.display, ctypes.pointer(major), ctypes.pointer(minor)):
+            raise RuntimeError("Não foi possível inicializar o EGL")
+
+        config_attribs = (EGL.EGLint * 13)(
+            EGL.EGL_SURFACE_TYPE, EGL.EGL_PBUFFER_BIT,
+            EGL.EGL_RED_SIZE, 8, EGL.EGL_GREEN_SIZE, 8, EGL.EGL_BLUE_SIZE, 8,
+            EGL.EGL_DEPTH_SIZE, 24,
+            EGL.EGL_RENDERABLE_TYPE, EGL.EGL_OPENGL_BIT,
+            EGL.EGL_NONE)
+        config = EGL.EGLConfig()
+        count = EGL.EGLint()
+        if not EGL.eglChooseConfig(self.display, config_attribs, ctypes.pointer(config), 1, ctypes.pointer(count)) \
+                or count.value == 0:
+            raise RuntimeError("Nenhuma configuração EGL com pbuffer e OpenGL")
+
+        surface_attribs = (EGL.EGLint * 5)(EGL.EGL_WIDTH, width, EGL.EGL_HEIGHT, height, EGL.EGL_NONE)
+        self.surface = EGL.eglCreatePbufferSurface(self.display, config, surface_attribs)
+        EGL.eglBindAPI(EGL.EGL_OPENGL_API)
+        context_attribs = (EGL.EGLint * 7)(
+            EGL.EGL_CONTEXT_MAJOR_VERSION, GL_VERSION_REQUIRED[0],
+            EGL.EGL_CONTEXT_MINOR_VERSION, GL_VERSION_REQUIRED[1],
+            EGL_CONTEXT_OPENGL_PROFILE_MASK, EGL_CONTEXT_OPENGL_COMPATIBILITY_PROFILE_BIT,
+            EGL.EGL_NONE)
+        self.context = EGL.eglCreateContext(self.display, config, EGL.EGL_NO_CONTEXT, context_attribs)
+        if not EGL.eglMakeCurrent(self.display, self.surface, self.surface, self.context):
+            raise RuntimeError("Não foi possível criar o contexto OpenGL sem janela")
+        gl.glViewport(0, 0, width, height)
+
+    @property
+    def renderer(self):
+        return gl.glGetString(gl.GL_RENDERER).decode()
+
+    @property
+    def version(self):
+        return gl.glGetString(gl.GL_VERSION).decode()
+
+    def read_pixels(self):
+        """Conteúdo atual da superfície, (altura, largura, 3) uint8 com a linha 0 no topo"""
+        data = gl.glReadPixels(0, 0, self.width, self.height, gl.GL_RGB, gl.GL_UNSIGNED_BYTE)
+        return np.frombuffer(data, dtype=np.uint8).reshape(self.height, self.width, 3)[::-1]
+
+    def release(self):
+        EGL.eglMakeCurrent(self.display, EGL.EGL_NO_SURFACE, EGL.EGL_NO_SURFACE, EGL.EGL_NO_CONTEXT)
+        EGL.eglDestroyContext(self.display, self.context)
+        EGL.eglDestroySurface(self.display, self.surface)
+        EGL.eglTerminate(self.display)
@@ -0,0 +1,111 @@
+"""
+Anéis das órbitas do Explorador 3D do Sistema Solar em um único buffer.
+
+Os círculos de todas as órbitas são gerados uma única vez com NumPy, em
+várias resoluções, e ficam residentes na GPU em um único buffer de vértices
+(anel por anel, e em cada anel um trecho por resolução). A cada frame a
+resolução de cada anel é escolhida pelo seu tamanho na tela e todos os anéis
+são desenhados com um único glMultiDrawArrays, sem cálculo de seno e
+cosseno nem glVertex por vértice.
+
+Resolução adaptativa: com n segmentos, o maior afastamento entre a corda e o
+círculo de raio R (em pixels) é R (1 - cos(pi / n)) ~ R pi^2 / (2 n^2). O
+raio na tela usa a distância da câmera ao ponto mais próximo do anel, de modo
+que órbitas externas grandes continuam lisas quando a câmera se aproxima e
+órbitas internas pequenas não recebem segmentos que nem aparecem.
+"""
+
+import ctypes
+
+import numpy as np
+import OpenGL.GL as gl
+
+from shading_models import ATTRIB_POSITION, get_line_program
+
+# Segmentos de cada resolução, do mais simples ao mais detalhado
+RING_LEVELS = (16, 32, 64, 128, 256, 512)
+# Afastamento máximo (pixels) entre o anel desenhado e o círculo verdadeiro
+TARGET_ERROR_PIXELS = 0.5
+ORBIT_COLOR = (0.5, 0.5, 0.5, 1.0)
+# Distância mínima usada no cálculo do tamanho na tela (câmera sobre o anel)
+MIN_DISTANCE = 1e-3
+
+def ring_vertices(radii, levels=RING_LEVELS):
+    """
+    Vértices de círculos no plano XZ centrados na origem.
+
+    Returns:
+        tuple: (vértices (N, 3) float32, primeiro vértice de cada anel em cada
+        resolução (anéis, níveis)), anel por anel e, em cada anel, nível por nível
+    """
+    radii = np.asarray(radii, dtype=np.float64)
+    levels = np.asarray(levels)
+    angles = np.concatenate([2.0 * np.pi * np.arange(n) / n for n in levels])
+    unit = np.stack([np.cos(angles), np.zeros_like(angles), np.sin(angles)], axis=1)
+    vertices = (radii[:, None, None] * unit[None]).reshape(-1, 3).astype(np.float32)
+    level_first = np.concatenate(([0], np.cumsum(levels)[:-1]))
+    first = np.arange(len(radii))[:, None] * levels.sum() + level_first[None, :]
+    return vertices, first.astype(np.int32)
+
+class OrbitRings:
+    """Anéis de órbita residentes na GPU, desenhados com um único glMultiDrawArrays"""
+
+    def __init__(self, radii, levels=RING_LEVELS, target_error_pixels=TARGET_ERROR_PIXELS, color=ORBIT_COLOR):
+        """
+        Args:
+            radii: Raio de cada anel (semieixo maior da órbita)
+            levels: Segmentos de cada resolução, em ordem crescente
+            target_error_pixels: Erro de aproximação tolerado na tela
+            color: Cor RGBA dos anéis
+        """
+        self.radii = np.asarray(radii, dtype=np.float64)
+        self.levels = np.asarray(levels)
+        self.target_error_pixels = target_error_pixels
+        self.color = color
+        self.program = get_line_program()
+        self.drawn_vertices = 0
+
+        vertices, self._first = ring_vertices(self.radii, self.levels)
+        self.vertex_count = len(vertices)
+        self.vao = gl.glGenVertexArrays(1)
+        gl.glBindVertexArray(self.vao)
+        self.vbo = gl.glGenBuffers(1)
+        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self.vbo)
+        gl.glBufferData(gl.GL_ARRAY_BUFFER, vertices.nbytes, vertices, gl.GL_STATIC_DRAW)
+        gl.glEnableVertexAttribArray(ATTRIB_POSITION)
+        gl.glVertexAttribPointer(ATTRIB_POSITION, 3, gl.GL_FLOAT, gl.GL_FALSE, 12, ctypes.c_void_p(0))
+        gl.glBindVertexArray(0)
+
+    def screen_radii(self, frame):
+        """Raio de cada anel em pixels, visto do seu ponto mais próximo da câmera"""
+        eye = np.asarray(frame.eye, dtype=np.float64)
+        horizontal = np.hypot(eye[0], eye[2])
+        nearest = np.maximum(np.hypot(horizontal - self.radii, eye[1]), MIN_DISTANCE)
+        return self.radii * frame.focal_length * (frame.viewport_height / 2.0) / nearest
+
+    def select_levels(self, radii_pixels):
+        """Índice da menor resolução com erro abaixo do tolerado, por anel (vetorizado)"""
+        needed = np.pi * np.sqrt(np.asarray(radii_pixels) / (2.0 * self.target_error_pixels))
+        return np.minimum(np.searchsorted(self.levels, needed), len(self.levels) - 1)
+
+    def draw(self, frame):
+        """Desenha todos os anéis com a câmera do frame (bloco "Camera" já enviado)"""
+        if not len(self.radii):
+            return
+        levels = self.select_levels(self.screen_radii(frame))
+        rings = np.arange(len(self.radii))
+        first = np.ascontiguousarray(self._first[rings, levels], dtype=np.int32)
+        counts = np.ascontiguousarray(self.levels[levels], dtype=np.int32)
+        self.drawn_vertices = int(counts.sum())
+
+        program = self.program
+        program.use()
+        program.set_vec4("color", self.color)
+        gl.glBindVertexArray(self.vao)
+        gl.glMultiDrawArrays(gl.GL_LINE_LOOP, first, counts, len(first))
+        gl.glBindVertexArray(0)
+        gl.glUseProgram(0)
+
+    def delete(self):
+        gl.glDeleteBuffers(1, [self.vbo])
+        gl.glDeleteVertexArrays(1, [self.vao])
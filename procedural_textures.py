@@ -0,0 +1,224 @@
+"""
+Texturas procedurais vetorizadas para o Explorador 3D do Sistema Solar.
+
+Gera as texturas usadas como fallback (e como texturas provisórias durante o
+carregamento) inteiramente com operações NumPy, sem laços por pixel:
+1. Xadrez (padrão genérico)
+2. Faixas de gigante gasoso (Júpiter, Saturno)
+3. Superfícies com ruído fractal (fBm de value noise) para os demais corpos
+
+As cores vêm da tabela FALLBACK_COLORS. Os resultados são memorizados em disco
+por (nome, tamanho, semente) e lotes podem ser gerados em um pool de processos.
+
+Uso (pré-gerar o cache em alta resolução):
+    python procedural_textures.py [tamanho] [semente]
+"""
+
+import os
+import sys
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Versão do gerador: faz parte da chave do cache em disco
+GENERATOR_VERSION = 1
+CACHE_DIR = os.path.join('.cache', 'textures')
+
+# Cores para os diferentes objetos (cor principal, cor secundária)
+FALLBACK_COLORS = {
+    'sun': ([255, 230, 125], [255, 180, 0]),
+    'mercury': ([150, 150, 150], [100, 100, 100]),
+    'venus': ([255, 198, 112], [180, 112, 60]),
+    'earth': ([30, 100, 200], [10, 150, 10]),
+    'moon': ([200, 200, 200], [100, 100, 100]),
+    'mars': ([220, 100, 50], [150, 50, 30]),
+    'jupiter': ([255, 220, 180], [200, 150, 100]),
+    'saturn': ([240, 220, 150], [200, 180, 120]),
+    'stars': ([20, 20, 40], [5, 5, 20])
+}
+DEFAULT_COLORS = ([150, 150, 150], [100, 100, 100])
+
+# Estilo de textura para cada objeto (objetos não listados usam xadrez)
+TEXTURE_STYLES = {
+    'sun': 'noise',
+    'mercury': 'noise',
+    'venus': 'noise',
+    'earth': 'noise',
+    'moon': 'noise',
+    'mars': 'noise',
+    'jupiter': 'bands',
+    'saturn': 'bands',
+    'stars': 'noise',
+    'asteroid': 'noise'
+}
+
+def _rng(name, seed):
+    """Gerador aleatório determinístico para (nome, semente)"""
+    return np.random.default_rng([zlib.crc32(name.encode()), seed])
+
+def _palette(color1, color2):
+    """Tabela de 256 cores RGBA (uint32) interpolando color1 -> color2"""
+    c1 = np.asarray(color1, dtype=np.float32)
+    c2 = np.asarray(color2, dtype=np.float32)
+    w = np.linspace(0.0, 1.0, 256, dtype=np.float32)[:, None]
+    rgb = np.rint(c1 + (c2 - c1) * w).astype(np.uint32)
+    return (rgb[:, 0] | (rgb[:, 1] << 8) | (rgb[:, 2] << 16) | (255 << 24)).astype('<u4')
+
+def _mix(color1, color2, weight):
+    """
+    Converte pesos (H, W) em [0, 1] em texels RGBA (H, W, 4) uint8.
+    A interpolação de cores é feita por uma tabela de 256 entradas.
+    """
+    index = np.clip(weight, 0.0, 1.0)
+    index *= 255.0
+    index = index.astype(np.uint8)
+    return np.take(_palette(color1, color2), index).view(np.uint8).reshape(index.shape + (4,))
+
+def _interp(n, cells):
+    """Índices das células vizinhas e pesos suavizados (smoothstep) para n amostras"""
+    x = np.arange(n, dtype=np.float32) * (cells / n)
+    x0 = x.astype(np.int32)
+    f = x - x0
+    return x0, f * f * (3.0 - 2.0 * f)
+
+def fractal_noise(width, height, rng, base_cells=4, octaves=5, persistence=0.5):
+    """
+    Soma de oitavas de value noise (fBm) em [0, 1], periódica na horizontal
+    (para o mapeamento esférico).
+
+    A interpolação é separável: cada oitava é interpolada na vertical sobre a
+    sua grade e a interpolação horizontal de todas as oitavas é feita em uma
+    única multiplicação de matrizes (altura x células) @ (células x largura).
+    """
+    row_blocks = []
+    col_weights = []
+    amplitude = 1.0
+    norm = 0.0
+    cells = base_cells
+    for _ in range(octaves):
+        cells_x = max(2, min(cells * 2, width))
+        cells_y = max(1, min(cells, height))
+        grid = rng.random((cells_y + 1, cells_x), dtype=np.float32) * np.float32(amplitude)
+
+        # Interpolação vertical: (height, cells_x)
+        y0, fy = _interp(height, cells_y)
+        fy = fy[:, None]
+        row_blocks.append(grid[y0] + (grid[y0 + 1] - grid[y0]) * fy)
+
+        # Pesos da interpolação horizontal (com repetição periódica): (cells_x, width)
+        x0, fx = _interp(width, cells_x)
+        x1 = (x0 + 1) % cells_x
+        weights = np.zeros((cells_x, width), dtype=np.float32)
+        columns = np.arange(width)
+        weights[x0, columns] = 1.0 - fx
+        weights[x1, columns] = fx
+        col_weights.append(weights)
+
+        norm += amplitude
+        amplitude *= persistence
+        cells *= 2
+    total = np.hstack(row_blocks) @ np.vstack(col_weights)
+    total *= np.float32(1.0 / norm)
+    return total
+
+def checker_texture(width, height, color1, color2, cell=32):
+    """Padrão xadrez (equivalente à textura fallback original)"""
+    # Paridade calculada por célula e expandida para pixels
+    i = np.arange(-(-height // cell))[:, None]
+    j = np.arange(-(-width // cell))[None, :]
+    parity = ((i + j) % 2).astype(np.float32)
+    parity = np.repeat(np.repeat(parity, cell, axis=0), cell, axis=1)[:height, :width]
+    return _mix(color1, color2, parity)
+
+def bands_texture(width, height, color1, color2, rng, bands=9):
+    """Faixas horizontais de gigante gasoso com turbulência fractal"""
+    turbulence = fractal_noise(width, height, rng, base_cells=4, octaves=4)
+    v = np.linspace(0.0, 1.0, height, dtype=np.float32)[:, None]
+    phase = np.float32(rng.uniform(0, 2 * np.pi))
+    band = turbulence * np.float32(2.5)
+    band += v * np.float32(np.pi * bands) + phase
+    np.sin(band, out=band)
+    band *= np.float32(0.4)
+    band += np.float32(0.4)
+    band += np.float32(0.2) * turbulence
+    return _mix(color1, color2, band)
+
+def noise_texture(width, height, color1, color2, rng):
+    """Superfície com ruído fractal"""
+    n = fractal_noise(width, height, rng, base_cells=4, octaves=6)
+    # Aumentar o contraste em torno do valor médio
+    n -= np.float32(0.5)
+    n *= np.float32(1.8)
+    n += np.float32(0.5)
+    return _mix(color1, color2, n)
+
+def generate_texture(name, size=256, seed=0):
+    """
+    Gera a textura procedural de um objeto.
+
+    Args:
+        name: Nome do objeto (define cores e estilo)
+        size: Lado da textura em pixels (a textura é quadrada)
+        seed: Semente para variações do ruído
+
+    Returns:
+        np.ndarray: Texels RGBA (size, size, 4) uint8
+    """
+    color1, color2 = FALLBACK_COLORS.get(name, DEFAULT_COLORS)
+    style = TEXTURE_STYLES.get(name, 'checker')
+    rng = _rng(name, seed)
+    if style == 'bands':
+        return bands_texture(size, size, color1, color2, rng)
+    if style == 'noise':
+        return noise_texture(size, size, color1, color2, rng)
+    return checker_texture(size, size, color1, color2, cell=max(1, size // 8))
+
+def cache_path(name, size, seed):
+    """Caminho do arquivo de cache para (nome, tamanho, semente)"""
+    return os.path.join(CACHE_DIR, f"{name}_{size}_{seed}_v{GENERATOR_VERSION}.npy")
+
+def generate_texture_cached(name, size=256, seed=0):
+    """Como generate_texture, mas memorizando o resultado em disco"""
+    path = cache_path(name, size, seed)
+    try:
+        data = np.load(path)
+        if data.shape == (size, size, 4) and data.dtype == np.uint8:
+            return data
+    except (OSError, ValueError):
+        pass
+    data = generate_texture(name, size, seed)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = path + '.tmp.npy'
+        np.save(tmp_path, data)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Não foi possível gravar cache de textura {name}: {e}")
+    return data
+
+def _generate_job(job):
+    return generate_texture_cached(*job)
+
+def generate_batch(jobs, max_workers=None):
+    """
+    Gera um lote de texturas em um pool de processos.
+
+    Args:
+        jobs: Lista de tuplas (nome, tamanho, semente)
+        max_workers: Número de processos (padrão: número de CPUs)
+
+    Returns:
+        dict: {(nome, tamanho, semente): texels RGBA}
+    """
+    jobs = [tuple(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        results = executor.map(_generate_job, jobs)
+        return dict(zip(jobs, results))
+
+if __name__ == '__main__':
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 2048
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    names = sorted(set(FALLBACK_COLORS) | set(TEXTURE_STYLES))
+    generate_batch([(name, size, seed) for name in names])
+    print(f"{len(names)} texturas {size}x{size} geradas em {CACHE_DIR}")
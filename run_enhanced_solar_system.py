@@ -17,11 +17,22 @@ import pygame
 from pygame.locals import *
 from OpenGL.GL import *
 import sys
+import argparse
 
 # Importar o SolarExplorer do arquivo principal
 from solar_explorer import SolarExplorer
+from frame_scheduler import FRAME_MODES, DEFAULT_FRAME_MODE, DEFAULT_TARGET_FPS
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Explorador 3D do Sistema Solar")
+    parser.add_argument('--frame-mode', choices=FRAME_MODES, default=DEFAULT_FRAME_MODE,
+                        help="ritmo de quadros: sem limite, vsync, taxa alvo ou economia de energia")
+    parser.add_argument('--fps', type=float, default=DEFAULT_TARGET_FPS, help="taxa alvo (modos target e power_save)")
+    parser.add_argument('--profile', metavar='CSV', help="liga o perfilador por fase e grava os percentis em CSV ao sair")
+    return parser.parse_args(argv)
 
 def main():
+    args = parse_args(sys.argv[1:])
     # Verificar se os diretórios necessários existem
     if not os.path.exists("models"):
         os.makedirs("models")
@@ -40,11 +51,13 @@ def main():
     print("  SPACE/SHIFT: Subir/descer com câmera livre")
     print("  O: Mostrar/ocultar órbitas")
     print("  P: Pausar/continuar simulação")
+    print("  F3: Mostrar/ocultar perfil por fase (CPU/GPU)")
+    print("  F4: Gravar perfil em CSV")
     print("  +/-: Aumentar/diminuir velocidade da simulação")
     print("  ESC: Sair")
     
     # Criar e executar o explorador
-    explorer = SolarExplorer()
+    explorer = SolarExplorer(frame_mode=args.frame_mode, target_fps=args.fps, profile_csv=args.profile)
     explorer.run()
 
 if __name__ == "__main__":
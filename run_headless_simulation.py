@@ -0,0 +1,69 @@
+"""
+Simulação do Sistema Solar sem janela (sem pygame nem OpenGL).
+
+Executa N segundos de simulação (órbitas, asteroides e colisões) o mais rápido
+que a CPU permitir, usando o mesmo motor do explorador (simulation_engine.py),
+e grava o registro de impactos e as estatísticas da execução.
+
+Uso:
+    python run_headless_simulation.py --seconds 600 --asteroids 1000 --spawn-rate 20 \\
+        --seed 1 --events impactos.csv --stats estatisticas.json
+"""
+
+import argparse
+import csv
+import json
+import sys
+
+from scene_graph import DEFAULT_SCENE
+from simulation_engine import SimulationEngine
+from fixed_timestep import DEFAULT_TICK_RATE
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Simulação do Sistema Solar sem janela")
+    parser.add_argument('--seconds', type=float, default=60.0, help="segundos de simulação")
+    parser.add_argument('--step', type=float, default=1.0 / DEFAULT_TICK_RATE, help="duração de cada passo (s)")
+    parser.add_argument('--asteroids', type=int, default=0, help="asteroides criados no início")
+    parser.add_argument('--spawn-rate', type=float, default=0.0, help="asteroides criados por segundo de simulação")
+    parser.add_argument('--seed', type=int, default=None, help="semente dos asteroides")
+    parser.add_argument('--scene', default=DEFAULT_SCENE, help="arquivo de cena JSON")
+    parser.add_argument('--events', help="arquivo CSV com os impactos (tempo, asteroide, planeta)")
+    parser.add_argument('--stats', help="arquivo JSON com as estatísticas")
+    parser.add_argument('--quiet', action='store_true', help="não imprime o resumo")
+    return parser.parse_args(argv)
+
+def write_events(engine, path):
+    """Grava os impactos registrados em CSV, um por linha"""
+    times, asteroids, nodes = engine.events()
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(('time', 'asteroid', 'planet'))
+        for t, asteroid, node in zip(times, asteroids, nodes):
+            writer.writerow((f"{t:.6f}", int(asteroid), engine.scene.names[node]))
+
+def print_statistics(stats):
+    print(f"Tempo simulado: {stats['simulated_seconds']:.2f} s em {stats['ticks']} passos")
+    print(f"Tempo de CPU: {stats['tick_seconds']:.3f} s ({stats['ticks_per_second']:.0f} passos/s)")
+    print(f"Asteroides: {stats['spawned']} criados, {stats['impacts']} impactos, "
+          f"{stats['expired']} expirados, {stats['alive']} vivos (máximo {stats['max_alive']})")
+    for name, count in stats['impacts_per_node'].items():
+        print(f"  {name:<10} {count:>8}")
+
+def main(argv):
+    args = parse_args(argv)
+    engine = SimulationEngine(args.scene, seed=args.seed, record_events=args.events is not None)
+    if args.asteroids:
+        engine.spawn_asteroids(args.asteroids)
+    engine.run(args.seconds, args.step, args.spawn_rate)
+
+    stats = engine.statistics()
+    if args.events:
+        write_events(engine, args.events)
+    if args.stats:
+        with open(args.stats, 'w') as f:
+            json.dump(stats, f, indent=2)
+    if not args.quiet:
+        print_statistics(stats)
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
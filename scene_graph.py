@@ -0,0 +1,215 @@
+"""
+Grafo de cena para o Explorador 3D do Sistema Solar.
+
+A hierarquia da cena (Sol, planetas, Terra -> Lua, Terra -> satélite,
+Saturno -> anéis) é descrita em um arquivo JSON (ver data/scene.json) em vez
+de ficar embutida no código de desenho. Os nós são ordenados topologicamente
+(pais antes dos filhos) e guardados em arrays achatados:
+
+- local: transformação de cada nó em relação ao pai (translação + inclinação)
+- world: transformação acumulada, herdada pelos filhos
+- models: world @ Ry(rotação própria) @ S(escala), usada apenas no desenho
+
+A cada passo, apenas os nós animados (corpos das efemérides e órbitas
+circulares) e os seus descendentes são marcados como sujos; as matrizes world
+são recalculadas nível a nível com um único produto de matrizes em lote por
+nível, e subárvores estáticas não são recalculadas. Desenho e colisões leem as
+mesmas transformações.
+
+Campos de um nó no arquivo de cena:
+    name          nome único do nó
+    parent        nome do nó pai (ausente = raiz)
+    body          corpo do catálogo de efemérides que define a translação
+    orbit_radius  raio de uma órbita circular em torno do pai (com orbit_speed
+                  em graus por segundo e orbit_phase em graus)
+    offset        translação fixa [x, y, z] somada à posição orbital
+    tilt          inclinação fixa em graus em torno do eixo X (herdada pelos filhos)
+    spin          rotação própria em graus por segundo em torno de Y (não herdada)
+    scale         escala uniforme do desenho (padrão: raio do corpo, ou 1; não herdada)
+    draw, ...     como o nó é desenhado (lido pelo SolarExplorer)
+"""
+
+import json
+import numpy as np
+
+from ephemeris import load_catalogue
+from transforms import rotation_x
+
+DEFAULT_SCENE = 'data/scene.json'
+
+def topological_order(nodes):
+    """Índices dos nós com cada pai antes dos seus filhos (mantendo a ordem do arquivo)"""
+    names = {}
+    for i, node in enumerate(nodes):
+        if node['name'] in names:
+            raise ValueError(f"Nó duplicado na cena: {node['name']}")
+        names[node['name']] = i
+    children = [[] for _ in nodes]
+    roots = []
+    for i, node in enumerate(nodes):
+        parent = node.get('parent')
+        if not parent:
+            roots.append(i)
+        elif parent not in names:
+            raise ValueError(f"Nó {node['name']} tem pai desconhecido: {parent}")
+        else:
+            children[names[parent]].append(i)
+    order = []
+    stack = list(reversed(roots))
+    while stack:
+        i = stack.pop()
+        order.append(i)
+        stack.extend(reversed(children[i]))
+    if len(order) != len(nodes):
+        raise ValueError("Hierarquia da cena com ciclo")
+    return order
+
+def spin_scale_matrices(angles_degrees, scales):
+    """Matrizes Ry(ângulo) @ S(escala) em lote, (N, 4, 4)"""
+    angles = np.radians(angles_degrees)
+    c = np.cos(angles) * scales
+    s = np.sin(angles) * scales
+    m = np.zeros((len(scales), 4, 4), dtype=np.float32)
+    m[:, 0, 0] = c
+    m[:, 0, 2] = s
+    m[:, 1, 1] = scales
+    m[:, 2, 0] = -s
+    m[:, 2, 2] = c
+    m[:, 3, 3] = 1.0
+    return m
+
+class SceneGraph:
+    """Nós da cena em ordem topológica, com transformações em arrays achatados"""
+
+    def __init__(self, nodes, ephemeris=None):
+        """
+        Args:
+            nodes: Lista de dicionários de nós (formato do arquivo de cena)
+            ephemeris: Efemérides usadas pelos nós com 'body'
+        """
+        self.nodes = [nodes[i] for i in topological_order(nodes)]
+        self.names = [node['name'] for node in self.nodes]
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.ephemeris = ephemeris
+        n = len(self.nodes)
+
+        self.parent = np.array([self.index[node['parent']] if node.get('parent') else -1
+                                for node in self.nodes], dtype=np.int64)
+        self.offset = np.array([node.get('offset', (0.0, 0.0, 0.0)) for node in self.nodes],
+                               dtype=np.float32).reshape(n, 3)
+        self.spin = np.array([node.get('spin', 0.0) for node in self.nodes], dtype=np.float32)
+
+        # Nós cuja translação vem das efemérides
+        self.body_nodes = np.array([i for i, node in enumerate(self.nodes) if 'body' in node], dtype=np.int64)
+        self.body_ids = np.array([ephemeris.index[self.nodes[i]['body']] for i in self.body_nodes], dtype=np.int64)
+        for i, body in zip(self.body_nodes, self.body_ids):
+            self._check_body_parent(i, body)
+
+        # Nós em órbita circular em torno do pai
+        self.orbit_nodes = np.array([i for i, node in enumerate(self.nodes) if 'orbit_radius' in node], dtype=np.int64)
+        self.orbit_radius = np.array([self.nodes[i]['orbit_radius'] for i in self.orbit_nodes], dtype=np.float32)
+        self.orbit_speed = np.array([self.nodes[i].get('orbit_speed', 0.0) for i in self.orbit_nodes], dtype=np.float32)
+        self.orbit_phase = np.array([self.nodes[i].get('orbit_phase', 0.0) for i in self.orbit_nodes], dtype=np.float32)
+
+        self.scale = np.ones(n, dtype=np.float32)
+        for i, node in enumerate(self.nodes):
+            if 'scale' in node:
+                self.scale[i] = node['scale']
+        explicit = np.array(['scale' in self.nodes[i] for i in self.body_nodes], dtype=bool)
+        if len(self.body_nodes):
+            self.scale[self.body_nodes[~explicit]] = ephemeris.radius[self.body_ids[~explicit]]
+
+        # Transformações locais fixas; a translação dos nós animados é reescrita a cada passo
+        self.local = np.tile(np.identity(4, dtype=np.float32), (n, 1, 1))
+        for i, node in enumerate(self.nodes):
+            if node.get('tilt'):
+                self.local[i] = rotation_x(node['tilt'])
+        self.local[:, :3, 3] = self.offset
+        self.world = np.zeros((n, 4, 4), dtype=np.float32)
+        self.models = np.zeros((n, 4, 4), dtype=np.float32)
+
+        self.animated = np.zeros(n, dtype=bool)
+        self.animated[self.body_nodes] = True
+        self.animated[self.orbit_nodes] = True
+        self.dirty = np.ones(n, dtype=bool)
+        # Quantidade de matrizes world recalculadas no último passo
+        self.recomputed = 0
+
+        # Níveis de profundidade: todos os nós de um nível são atualizados de uma vez
+        depth = np.zeros(n, dtype=np.int64)
+        for i in range(n):
+            if self.parent[i] >= 0:
+                depth[i] = depth[self.parent[i]] + 1
+        self.levels = [np.flatnonzero(depth == d) for d in range(int(depth.max(initial=-1)) + 1)]
+
+    def _check_body_parent(self, node, body):
+        """O pai de um nó de corpo deve ser o nó do corpo em torno do qual ele orbita"""
+        body_parent = self.ephemeris.parent[body]
+        scene_parent = self.parent[node]
+        if body_parent < 0:
+            valid = scene_parent < 0
+        else:
+            valid = scene_parent >= 0 and self.nodes[scene_parent].get('body') == self.ephemeris.names[body_parent]
+        if not valid:
+            raise ValueError(f"Nó {self.names[node]}: o pai na cena não corresponde à órbita do corpo")
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def clone(self):
+        """Cópia independente do grafo (mesmos nós e efemérides), ex: para o desenho interpolado"""
+        return SceneGraph(self.nodes, self.ephemeris)
+
+    def set_local(self, name, matrix):
+        """Substitui a transformação local de um nó estático (ele e seus filhos serão recalculados)"""
+        i = self.index[name]
+        self.local[i] = matrix
+        self.dirty[i] = True
+
+    def update(self, t):
+        """Atualiza os nós animados para o tempo t e recalcula as transformações sujas"""
+        local = self.local
+        if len(self.body_nodes):
+            # Só os corpos da cena: os pais de cada um também são nós da cena
+            relative = self.ephemeris.relative_positions(t, self.body_ids)
+            local[self.body_nodes, :3, 3] = self.offset[self.body_nodes] + relative
+        if len(self.orbit_nodes):
+            theta = np.radians(self.orbit_phase + self.orbit_speed * t)
+            local[self.orbit_nodes, :3, 3] = self.offset[self.orbit_nodes]
+            local[self.orbit_nodes, 0, 3] += self.orbit_radius * np.cos(theta)
+            local[self.orbit_nodes, 2, 3] += self.orbit_radius * np.sin(theta)
+
+        dirty = self.dirty
+        dirty |= self.animated
+        for depth, level in enumerate(self.levels):
+            if depth == 0:
+                nodes = level[dirty[level]]
+                self.world[nodes] = local[nodes]
+                continue
+            dirty[level] |= dirty[self.parent[level]]
+            nodes = level[dirty[level]]
+            if len(nodes):
+                self.world[nodes] = self.world[self.parent[nodes]] @ local[nodes]
+
+        # Matrizes de desenho: nós recalculados e nós com rotação própria
+        refresh = np.flatnonzero(dirty | (self.spin != 0))
+        self.models[refresh] = self.world[refresh] @ spin_scale_matrices(self.spin[refresh] * t, self.scale[refresh])
+        self.recomputed = int(np.count_nonzero(dirty))
+        dirty[:] = False
+
+    @property
+    def positions(self):
+        """Posições no mundo (N, 3) de todos os nós"""
+        return self.world[:, :3, 3]
+
+    def select(self, **fields):
+        """Índices (ordem topológica) dos nós cujos campos têm os valores informados"""
+        return np.array([i for i, node in enumerate(self.nodes)
+                         if all(node.get(key) == value for key, value in fields.items())], dtype=np.int64)
+
+def load_scene(path=DEFAULT_SCENE):
+    """Lê um arquivo de cena JSON (e o catálogo de efemérides que ele referencia)"""
+    with open(path) as f:
+        description = json.load(f)
+    ephemeris = load_catalogue(description['catalogue']) if 'catalogue' in description else None
+    return SceneGraph(description['nodes'], ephemeris)
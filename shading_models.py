@@ -1,6 +1,44 @@
 import OpenGL.GL as gl
 import numpy as np
 
+# Versão mínima do contexto OpenGL (shaders GLSL 330, perfil de compatibilidade)
+GL_VERSION_REQUIRED = (3, 3)
+
+def context_version():
+    """Versão (maior, menor) do contexto OpenGL atual, lida de GL_VERSION"""
+    version = gl.glGetString(gl.GL_VERSION).decode()
+    major, minor = version.split(' ')[0].split('.')[:2]
+    return int(major), int(minor)
+
+def require_context_version(required=GL_VERSION_REQUIRED):
+    """Falha com uma mensagem clara se o contexto atual não tiver a versão mínima"""
+    if context_version() < tuple(required):
+        raise RuntimeError(
+            f"OpenGL {required[0]}.{required[1]} (perfil de compatibilidade) é necessário, mas o contexto "
+            f"criado é {gl.glGetString(gl.GL_VERSION).decode()} ({gl.glGetString(gl.GL_RENDERER).decode()}). "
+            "Atualize o driver de vídeo ou use outra GPU.")
+
+# Localizações fixas dos atributos de vértice, compartilhadas por todos os programas.
+# Assim um mesmo VAO pode ser desenhado tanto com Gouraud quanto com Phong.
+ATTRIB_POSITION = 0
+ATTRIB_NORMAL = 1
+ATTRIB_TEXCOORD = 2
+# Atributos por instância (desenho instanciado): a mat4 ocupa 4 localizações seguidas
+ATTRIB_INSTANCE_MODEL = 3
+ATTRIB_INSTANCE_LAYER = 7
+# Cor por vértice (texto do HUD)
+ATTRIB_COLOR = 8
+ATTRIB_LOCATIONS = {
+    'position': ATTRIB_POSITION,
+    # Parâmetro t das curvas de Bézier: ocupa a localização da posição
+    'curveParameter': ATTRIB_POSITION,
+    'normal': ATTRIB_NORMAL,
+    'texcoord': ATTRIB_TEXCOORD,
+    'instanceModel': ATTRIB_INSTANCE_MODEL,
+    'instanceLayer': ATTRIB_INSTANCE_LAYER,
+    'color': ATTRIB_COLOR,
+}
+
 # Compila um shader (vertex ou fragment) a partir do código fonte GLSL fornecido.
 def compile_shader(source, shader_type):
     shader = gl.glCreateShader(shader_type)
@@ -18,6 +56,9 @@ def create_program(vertex_src, fragment_src):
     fs = compile_shader(fragment_src, gl.GL_FRAGMENT_SHADER)
     gl.glAttachShader(program, vs)
     gl.glAttachShader(program, fs)
+    # Fixa as localizações dos atributos antes do link
+    for name, location in ATTRIB_LOCATIONS.items():
+        gl.glBindAttribLocation(program, location, name)
     gl.glLinkProgram(program)
     # Verifica se o link foi bem-sucedido
     if not gl.glGetProgramiv(program, gl.GL_LINK_STATUS):
@@ -27,25 +68,156 @@ def create_program(vertex_src, fragment_src):
     gl.glDeleteShader(fs)
     return program
 
+# Tipos GLSL aceitos por cada setter de uniform
+_MAT4_TYPES = (gl.GL_FLOAT_MAT4,)
+_VEC3_TYPES = (gl.GL_FLOAT_VEC3,)
+_VEC4_TYPES = (gl.GL_FLOAT_VEC4,)
+_FLOAT_TYPES = (gl.GL_FLOAT,)
+_INT_TYPES = (gl.GL_INT, gl.GL_BOOL, gl.GL_SAMPLER_2D, gl.GL_SAMPLER_2D_ARRAY)
+
+def _decode_name(name):
+    name = name.decode() if isinstance(name, bytes) else name
+    # Arrays são reportados como "nome[0]"
+    return name[:-3] if name.endswith('[0]') else name
+
+class ShaderProgram:
+    """
+    Programa de shader linkado, com as localizações de todos os uniforms e
+    atributos ativos consultadas uma única vez após o link.
+
+    Os setters tipados só enviam o valor ao driver quando ele mudou desde o
+    último envio (os valores de uniforms ficam guardados no próprio programa).
+    Assim como glUniform*, exigem que o programa esteja em uso.
+    """
+
+    def __init__(self, program_id):
+        self.id = program_id
+        self.uniforms = {}  # nome -> (localização, tipo GLSL, tamanho)
+        self.attributes = {}  # nome -> (localização, tipo GLSL, tamanho)
+        self._values = {}
+
+        for index in range(gl.glGetProgramiv(program_id, gl.GL_ACTIVE_UNIFORMS)):
+            name, size, gl_type = gl.glGetActiveUniform(program_id, index)
+            name = _decode_name(name)
+            location = gl.glGetUniformLocation(program_id, name)
+            # Membros de blocos de uniforms não têm localização própria
+            if location != -1:
+                self.uniforms[name] = (location, gl_type, size)
+
+        for index in range(gl.glGetProgramiv(program_id, gl.GL_ACTIVE_ATTRIBUTES)):
+            name, size, gl_type = gl.glGetActiveAttrib(program_id, index)
+            name = _decode_name(name)
+            self.attributes[name] = (gl.glGetAttribLocation(program_id, name), gl_type, size)
+
+    def use(self):
+        gl.glUseProgram(self.id)
+
+    def bind_uniform_block(self, block_name, binding):
+        """Associa um bloco de uniforms do programa a um ponto de ligação de UBO"""
+        index = gl.glGetUniformBlockIndex(self.id, block_name)
+        if index != gl.GL_INVALID_INDEX:
+            gl.glUniformBlockBinding(self.id, index, binding)
+
+    def has_uniform(self, name):
+        return name in self.uniforms
+
+    def uniform_location(self, name):
+        """Localização de um uniform (-1 se não estiver ativo no programa)"""
+        entry = self.uniforms.get(name)
+        return entry[0] if entry else -1
+
+    def attribute_location(self, name):
+        """Localização de um atributo (-1 se não estiver ativo no programa)"""
+        entry = self.attributes.get(name)
+        return entry[0] if entry else -1
+
+    def _location(self, name, accepted_types, value):
+        """Localização do uniform, ou None se não estiver ativo ou o valor não mudou"""
+        entry = self.uniforms.get(name)
+        if entry is None:
+            # Uniform removido pelo compilador (não utilizado): ignorar, como o OpenGL faz
+            return None
+        location, gl_type, _size = entry
+        if gl_type not in accepted_types:
+            raise TypeError(f"Uniform '{name}' não é do tipo esperado pelo setter")
+        if self._values.get(name) == value:
+            return None
+        self._values[name] = value
+        return location
+
+    def set_mat4(self, name, matrix):
+        """Envia uma matriz 4x4 em convenção linha-maior (transposta no envio)"""
+        matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+        location = self._location(name, _MAT4_TYPES, matrix.tobytes())
+        if location is not None:
+            gl.glUniformMatrix4fv(location, 1, gl.GL_TRUE, matrix)
+
+    def set_mat4_array(self, name, matrices):
+        """Envia um array de matrizes 4x4 (K, 4, 4) linha-maior a partir do elemento 0 (sem cache)"""
+        location = self.uniform_location(name)
+        if location != -1:
+            matrices = np.ascontiguousarray(matrices, dtype=np.float32)
+            gl.glUniformMatrix4fv(location, len(matrices), gl.GL_TRUE, matrices)
+
+    def set_vec3(self, name, x, y=None, z=None):
+        """Envia um vec3 (três floats ou uma sequência de três elementos)"""
+        value = (float(x), float(y), float(z)) if y is not None else tuple(float(c) for c in x)
+        location = self._location(name, _VEC3_TYPES, value)
+        if location is not None:
+            gl.glUniform3f(location, *value)
+
+    def set_vec4(self, name, x, y=None, z=None, w=None):
+        """Envia um vec4 (quatro floats ou uma sequência de quatro elementos)"""
+        value = (float(x), float(y), float(z), float(w)) if y is not None else tuple(float(c) for c in x)
+        location = self._location(name, _VEC4_TYPES, value)
+        if location is not None:
+            gl.glUniform4f(location, *value)
+
+    def set_float(self, name, value):
+        value = float(value)
+        location = self._location(name, _FLOAT_TYPES, value)
+        if location is not None:
+            gl.glUniform1f(location, value)
+
+    def set_int(self, name, value):
+        """Envia um int (também usado para bool e unidades de textura de samplers)"""
+        value = int(value)
+        location = self._location(name, _INT_TYPES, value)
+        if location is not None:
+            gl.glUniform1i(location, value)
+
+# Bloco de uniforms da câmera, compartilhado por todos os programas e preenchido
+# uma vez por frame (ver frame_context.CameraUniformBuffer). As matrizes estão
+# em convenção linha-maior, como as matrizes NumPy da aplicação.
+CAMERA_BLOCK_NAME = "Camera"
+CAMERA_BLOCK_BINDING = 0
+CAMERA_BLOCK = """
+layout(std140, row_major) uniform Camera {
+    mat4 view;
+    mat4 projection;
+    mat4 viewProjection;
+    vec4 eyePosition;
+    vec4 lightPosition;
+};
+"""
+
 # Shader Gouraud: calcula iluminação (Lambert + Blinn-Phong) no vértice e passa a cor para o fragmento.
 VERTEX_SHADER_GOURAUD = """
-#version 120
-attribute vec3 position;
-attribute vec3 normal;
-attribute vec2 texcoord;
+#version 330
+""" + CAMERA_BLOCK + """
+in vec3 position;
+in vec3 normal;
+in vec2 texcoord;
 uniform mat4 model;
-uniform mat4 view;
-uniform mat4 projection;
-uniform vec3 lightPos;
-uniform vec3 viewPos;
-varying vec3 color;
-varying vec2 v_texcoord;
+out vec3 color;
+out vec2 v_texcoord;
 
 void main() {
     // Calcula normais e vetores de iluminação no espaço do modelo
+    vec3 worldPos = vec3(model * vec4(position, 1.0));
     vec3 N = normalize(mat3(model) * normal);
-    vec3 L = normalize(lightPos - vec3(model * vec4(position, 1.0)));
-    vec3 V = normalize(viewPos - vec3(model * vec4(position, 1.0)));
+    vec3 L = normalize(lightPosition.xyz - worldPos);
+    vec3 V = normalize(eyePosition.xyz - worldPos);
     vec3 H = normalize(L + V);
 
     // Iluminação difusa (Lambert)
@@ -61,55 +233,55 @@ void main() {
     color = ambient + diffuse + specular;
     v_texcoord = texcoord;
     // Calcula a posição final do vértice
-    gl_Position = projection * view * model * vec4(position, 1.0);
+    gl_Position = viewProjection * vec4(worldPos, 1.0);
 }
 """
 
 # Fragment shader Gouraud: apenas multiplica a cor interpolada pela textura.
 FRAGMENT_SHADER_GOURAUD = """
-#version 120
+#version 330
 uniform sampler2D tex;
-varying vec3 color;
-varying vec2 v_texcoord;
+in vec3 color;
+in vec2 v_texcoord;
+out vec4 fragColor;
 void main() {
-    vec4 texColor = texture2D(tex, v_texcoord);
-    gl_FragColor = vec4(color, 1.0) * texColor;
+    vec4 texColor = texture(tex, v_texcoord);
+    fragColor = vec4(color, 1.0) * texColor;
 }
 """
 
 # Vertex shader Phong: passa posição e normal para o fragment shader.
 VERTEX_SHADER_PHONG = """
-#version 120
-attribute vec3 position;
-attribute vec3 normal;
-attribute vec2 texcoord;
+#version 330
+""" + CAMERA_BLOCK + """
+in vec3 position;
+in vec3 normal;
+in vec2 texcoord;
 uniform mat4 model;
-uniform mat4 view;
-uniform mat4 projection;
-varying vec3 fragPos;
-varying vec3 fragNormal;
-varying vec2 v_texcoord;
+out vec3 fragPos;
+out vec3 fragNormal;
+out vec2 v_texcoord;
 void main() {
     fragPos = vec3(model * vec4(position, 1.0));
     fragNormal = normalize(mat3(model) * normal);
     v_texcoord = texcoord;
-    gl_Position = projection * view * model * vec4(position, 1.0);
+    gl_Position = viewProjection * vec4(fragPos, 1.0);
 }
 """
 
 # Fragment shader Phong: calcula iluminação (Lambert + Blinn-Phong) por fragmento.
 FRAGMENT_SHADER_PHONG = """
-#version 120
-uniform vec3 lightPos;
-uniform vec3 viewPos;
+#version 330
+""" + CAMERA_BLOCK + """
 uniform sampler2D tex;
-varying vec3 fragPos;
-varying vec3 fragNormal;
-varying vec2 v_texcoord;
+in vec3 fragPos;
+in vec3 fragNormal;
+in vec2 v_texcoord;
+out vec4 fragColor;
 void main() {
     vec3 N = normalize(fragNormal);
-    vec3 L = normalize(lightPos - fragPos);
-    vec3 V = normalize(viewPos - fragPos);
+    vec3 L = normalize(lightPosition.xyz - fragPos);
+    vec3 V = normalize(eyePosition.xyz - fragPos);
     vec3 H = normalize(L + V);
 
     float diff = max(dot(N, L), 0.0);
@@ -120,15 +292,235 @@ void main() {
     vec3 ambient = 0.15 * vec3(1.0, 1.0, 1.0);
 
     vec3 color = ambient + diffuse + specular;
-    vec4 texColor = texture2D(tex, v_texcoord);
-    gl_FragColor = vec4(color, 1.0) * texColor;
+    vec4 texColor = texture(tex, v_texcoord);
+    fragColor = vec4(color, 1.0) * texColor;
+}
+"""
+
+# Vertex shader sem iluminação: usado para o Sol (que emite luz) e para o fundo estrelado.
+VERTEX_SHADER_UNLIT = """
+#version 330
+""" + CAMERA_BLOCK + """
+in vec3 position;
+in vec2 texcoord;
+uniform mat4 model;
+out vec2 v_texcoord;
+void main() {
+    v_texcoord = texcoord;
+    gl_Position = viewProjection * model * vec4(position, 1.0);
+}
+"""
+
+# Fragment shader sem iluminação: apenas a cor da textura.
+FRAGMENT_SHADER_UNLIT = """
+#version 330
+uniform sampler2D tex;
+in vec2 v_texcoord;
+out vec4 fragColor;
+void main() {
+    fragColor = texture(tex, v_texcoord);
 }
 """
 
+# Vertex shader Gouraud instanciado: matriz de modelo e camada da textura vêm por instância.
+VERTEX_SHADER_GOURAUD_INSTANCED = """
+#version 330
+""" + CAMERA_BLOCK + """
+in vec3 position;
+in vec3 normal;
+in vec2 texcoord;
+in mat4 instanceModel;
+in float instanceLayer;
+out vec3 color;
+out vec2 v_texcoord;
+flat out float v_layer;
+
+void main() {
+    vec3 worldPos = vec3(instanceModel * vec4(position, 1.0));
+    vec3 N = normalize(mat3(instanceModel) * normal);
+    vec3 L = normalize(lightPosition.xyz - worldPos);
+    vec3 V = normalize(eyePosition.xyz - worldPos);
+    vec3 H = normalize(L + V);
+
+    float diff = max(dot(N, L), 0.0);
+    float spec = pow(max(dot(N, H), 0.0), 32.0);
+
+    vec3 diffuse = diff * vec3(1.0, 1.0, 1.0);
+    vec3 specular = spec * vec3(1.0);
+    vec3 ambient = 0.15 * vec3(1.0, 1.0, 1.0);
+
+    color = ambient + diffuse + specular;
+    v_texcoord = texcoord;
+    v_layer = instanceLayer;
+    gl_Position = viewProjection * vec4(worldPos, 1.0);
+}
+"""
+
+# Fragment shader Gouraud instanciado: a textura vem da camada do array indicada pela instância.
+FRAGMENT_SHADER_GOURAUD_INSTANCED = """
+#version 330
+uniform sampler2DArray textures;
+in vec3 color;
+in vec2 v_texcoord;
+flat in float v_layer;
+out vec4 fragColor;
+void main() {
+    vec4 texColor = texture(textures, vec3(v_texcoord, v_layer));
+    fragColor = vec4(color, 1.0) * texColor;
+}
+"""
+
+# Vertex shader Phong instanciado.
+VERTEX_SHADER_PHONG_INSTANCED = """
+#version 330
+""" + CAMERA_BLOCK + """
+in vec3 position;
+in vec3 normal;
+in vec2 texcoord;
+in mat4 instanceModel;
+in float instanceLayer;
+out vec3 fragPos;
+out vec3 fragNormal;
+out vec2 v_texcoord;
+flat out float v_layer;
+void main() {
+    fragPos = vec3(instanceModel * vec4(position, 1.0));
+    fragNormal = normalize(mat3(instanceModel) * normal);
+    v_texcoord = texcoord;
+    v_layer = instanceLayer;
+    gl_Position = viewProjection * vec4(fragPos, 1.0);
+}
+"""
+
+# Fragment shader Phong instanciado.
+FRAGMENT_SHADER_PHONG_INSTANCED = """
+#version 330
+""" + CAMERA_BLOCK + """
+uniform sampler2DArray textures;
+in vec3 fragPos;
+in vec3 fragNormal;
+in vec2 v_texcoord;
+flat in float v_layer;
+out vec4 fragColor;
+void main() {
+    vec3 N = normalize(fragNormal);
+    vec3 L = normalize(lightPosition.xyz - fragPos);
+    vec3 V = normalize(eyePosition.xyz - fragPos);
+    vec3 H = normalize(L + V);
+
+    float diff = max(dot(N, L), 0.0);
+    float spec = pow(max(dot(N, H), 0.0), 32.0);
+
+    vec3 diffuse = diff * vec3(1.0, 1.0, 1.0);
+    vec3 specular = spec * vec3(1.0);
+    vec3 ambient = 0.15 * vec3(1.0, 1.0, 1.0);
+
+    vec3 color = ambient + diffuse + specular;
+    vec4 texColor = texture(textures, vec3(v_texcoord, v_layer));
+    fragColor = vec4(color, 1.0) * texColor;
+}
+"""
+
+# Vertex shader de linhas (anéis das órbitas): posições já em coordenadas do mundo.
+VERTEX_SHADER_LINE = """
+#version 330
+""" + CAMERA_BLOCK + """
+in vec3 position;
+void main() {
+    gl_Position = viewProjection * vec4(position, 1.0);
+}
+"""
+
+# Fragment shader de linhas: cor única.
+FRAGMENT_SHADER_LINE = """
+#version 330
+uniform vec4 color;
+out vec4 fragColor;
+void main() {
+    fragColor = color;
+}
+"""
+
+# Curvas de Bézier avaliadas na GPU: até BEZIER_BATCH curvas por desenho instanciado
+BEZIER_BATCH = 48
+
+# Vertex shader das curvas de Bézier: o vértice só traz o parâmetro t; as colunas
+# de controls[instância] são os pontos de controle p0..p3 da curva.
+VERTEX_SHADER_BEZIER = """
+#version 330
+""" + CAMERA_BLOCK + """
+in float curveParameter;
+uniform mat4 controls[""" + str(BEZIER_BATCH) + """];
+void main() {
+    float t = curveParameter;
+    float u = 1.0 - t;
+    vec4 basis = vec4(u * u * u, 3.0 * u * u * t, 3.0 * u * t * t, t * t * t);
+    vec3 point = (controls[gl_InstanceID] * basis).xyz;
+    gl_Position = viewProjection * vec4(point, 1.0);
+}
+"""
+
+# Vertex shader do HUD: posições em pixels da tela (origem no canto superior esquerdo).
+VERTEX_SHADER_HUD = """
+#version 330
+in vec2 position;
+in vec2 texcoord;
+in vec4 color;
+uniform mat4 screen;
+out vec2 v_texcoord;
+out vec4 v_color;
+void main() {
+    v_texcoord = texcoord;
+    v_color = color;
+    gl_Position = screen * vec4(position, 0.0, 1.0);
+}
+"""
+
+# Fragment shader do HUD: a cobertura do glifo vem do canal alfa do atlas.
+FRAGMENT_SHADER_HUD = """
+#version 330
+uniform sampler2D atlas;
+in vec2 v_texcoord;
+in vec4 v_color;
+out vec4 fragColor;
+void main() {
+    fragColor = vec4(v_color.rgb, v_color.a * texture(atlas, v_texcoord).a);
+}
+"""
+
+# Cria o programa e o associa ao bloco de uniforms da câmera.
+def create_scene_program(vertex_src, fragment_src):
+    program = ShaderProgram(create_program(vertex_src, fragment_src))
+    program.bind_uniform_block(CAMERA_BLOCK_NAME, CAMERA_BLOCK_BINDING)
+    return program
+
 # Função utilitária para obter o programa Gouraud já compilado e linkado.
 def get_gouraud_program():
-    return create_program(VERTEX_SHADER_GOURAUD, FRAGMENT_SHADER_GOURAUD)
+    return create_scene_program(VERTEX_SHADER_GOURAUD, FRAGMENT_SHADER_GOURAUD)
 
 # Função utilitária para obter o programa Phong já compilado e linkado.
 def get_phong_program():
-    return create_program(VERTEX_SHADER_PHONG, FRAGMENT_SHADER_PHONG)
+    return create_scene_program(VERTEX_SHADER_PHONG, FRAGMENT_SHADER_PHONG)
+
+# Função utilitária para obter o programa sem iluminação já compilado e linkado.
+def get_unlit_program():
+    return create_scene_program(VERTEX_SHADER_UNLIT, FRAGMENT_SHADER_UNLIT)
+
+# Programas instanciados (planetas, luas e asteroides com texturas em um GL_TEXTURE_2D_ARRAY).
+def get_gouraud_instanced_program():
+    return create_scene_program(VERTEX_SHADER_GOURAUD_INSTANCED, FRAGMENT_SHADER_GOURAUD_INSTANCED)
+
+def get_phong_instanced_program():
+    return create_scene_program(VERTEX_SHADER_PHONG_INSTANCED, FRAGMENT_SHADER_PHONG_INSTANCED)
+
+# Programa de linhas de cor única (anéis das órbitas).
+def get_line_program():
+    return create_scene_program(VERTEX_SHADER_LINE, FRAGMENT_SHADER_LINE)
+
+# Programa das curvas de Bézier (mesmo fragment shader de cor única das linhas).
+def get_bezier_program():
+    return create_scene_program(VERTEX_SHADER_BEZIER, FRAGMENT_SHADER_LINE)
+
+# Programa do HUD (texto em coordenadas de tela; não usa o bloco da câmera).
+def get_hud_program():
+    return ShaderProgram(create_program(VERTEX_SHADER_HUD, FRAGMENT_SHADER_HUD))
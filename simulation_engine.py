@@ -0,0 +1,181 @@
+"""
+Motor da simulação do Explorador 3D do Sistema Solar, sem pygame nem OpenGL.
+
+Reúne o grafo de cena (órbitas das efemérides), o enxame de asteroides e as
+colisões contínuas com os planetas. Pode ser importado e executado em máquinas
+sem janela nem GPU (ver run_headless_simulation.py); o SolarExplorer usa o
+mesmo motor e apenas desenha o seu estado.
+
+Cada passo (tick) avança o tempo da simulação, atualiza o grafo de cena, move
+os asteroides e devolve os impactos do passo. O motor também acumula um
+registro de eventos (instante, asteroide, planeta) e estatísticas da execução.
+"""
+
+import time
+import numpy as np
+
+from collisions import AABB
+from scene_graph import load_scene, DEFAULT_SCENE
+from asteroid_swarm import AsteroidSwarm, SWEEP_TOLERANCE
+
+# Limites da cena (paredes invisíveis)
+SCENE_BOUNDS = {
+    'x': (-40, 40),
+    'y': (-10, 10),
+    'z': (-40, 40)
+}
+# Raio igual ao da lua; velocidade do parâmetro t da curva por segundo
+ASTEROID_RADIUS = 0.27
+ASTEROID_SPEED = 0.15
+
+class SimulationEngine:
+    """Estado da simulação (cena, efemérides, asteroides) avançado em passos"""
+
+    def __init__(self, scene_path=DEFAULT_SCENE, bounds=SCENE_BOUNDS, seed=None, record_events=True,
+                 start_time=0.0, track_clearance=False, constant_speed=True):
+        """
+        Args:
+            scene_path: Arquivo de cena JSON (e o catálogo de efemérides que ele referencia)
+            bounds: Limites da cena {'x': (min, max), 'y': ..., 'z': ...}
+            seed: Semente dos asteroides (None = aleatória)
+            record_events: Guarda todos os impactos em memória (events())
+            start_time: Instante inicial da simulação (posição dos planetas nas órbitas)
+            track_clearance: Mede a menor distância de cada asteroide aos planetas
+            constant_speed: Asteroides com velocidade constante ao longo da curva
+        """
+        self.start_time = start_time
+        self.elapsed_time = start_time
+        self.previous_time = start_time
+
+        # Grafo de cena: transformações de todos os nós calculadas uma vez por passo
+        self.scene = load_scene(scene_path)
+        self.ephemeris = self.scene.ephemeris
+        self.scene.update(self.elapsed_time)
+        # Nós que podem ser alvo dos asteroides
+        self.target_nodes = self.scene.select(target=True)
+        self.sun_node = self.scene.index['sun']
+
+        self.scene_bounds = bounds
+        self.scene_aabb = AABB(
+            [bounds['x'][0], bounds['y'][0], bounds['z'][0]],
+            [bounds['x'][1], bounds['y'][1], bounds['z'][1]]
+        )
+        self.asteroids = AsteroidSwarm(self.scene_aabb, radius=ASTEROID_RADIUS, speed=ASTEROID_SPEED, seed=seed,
+                                       track_clearance=track_clearance, constant_speed=constant_speed)
+
+        # Registro de eventos: um bloco (instantes, asteroides, nós) por passo com impactos
+        self.record_events = record_events
+        self.event_blocks = []
+        # Estatísticas
+        self.ticks = 0
+        self.spawned = 0
+        self.expired = 0
+        self.max_alive = 0
+        self.substeps = 0
+        self.tick_seconds = 0.0
+        self.impacts = np.zeros(len(self.scene), dtype=np.int64)
+
+    def spawn_asteroids(self, count=1):
+        """Cria asteroides com trajetória automática para planetas aleatórios"""
+        # Planetas alvo aleatórios; as posições vêm do grafo de cena no passo atual
+        targets = self.asteroids.rng.choice(self.target_nodes, count)
+        slots = self.asteroids.spawn(targets, self.scene.positions[targets])
+        self.spawned += count
+        self.max_alive = max(self.max_alive, len(self.asteroids))
+        return slots
+
+    def tick(self, step):
+        """
+        Avança a simulação em um passo de 'step' segundos de simulação.
+
+        Returns:
+            (asteroides, nós, instantes): impactos do passo, com o índice do
+            asteroide, o nó da cena atingido e o instante absoluto do impacto
+        """
+        start = time.perf_counter()
+        self.previous_time = self.elapsed_time
+        previous_positions = self.scene.positions.copy()
+        self.elapsed_time += step
+        # Transformações de todos os nós da cena neste passo
+        self.scene.update(self.elapsed_time)
+        # Asteroides: curvas, alvos e colisões do enxame inteiro em um passo
+        alive = len(self.asteroids)
+        hit_asteroids, hit_nodes, hit_fractions = self.asteroids.step(
+            step, self.collision_track(step, previous_positions),
+            self.scene.scale, self.target_nodes, self.sun_node)
+        hit_times = self.previous_time + step * hit_fractions
+
+        self.ticks += 1
+        self.expired += alive - len(self.asteroids) - len(hit_nodes)
+        if len(hit_nodes):
+            np.add.at(self.impacts, hit_nodes, 1)
+            if self.record_events:
+                self.event_blocks.append((hit_times, hit_asteroids, hit_nodes))
+        self.tick_seconds += time.perf_counter() - start
+        return hit_asteroids, hit_nodes, hit_times
+
+    def collision_track(self, step, previous_positions):
+        """
+        Posições dos nós da cena em K+1 instantes do último passo, para a colisão
+        contínua dos asteroides; K é o suficiente para que órbitas e curvas
+        possam ser tratadas como segmentos retos dentro de cada subpasso.
+        """
+        if len(self.asteroids) == 0 or step == 0.0:
+            return self.scene.positions
+        substeps = max(self.asteroids.required_substeps(step),
+                       self.ephemeris.required_substeps(step, SWEEP_TOLERANCE, indices=self.scene.body_ids))
+        self.substeps += substeps
+        track = np.empty((substeps + 1,) + self.scene.positions.shape, dtype=np.float32)
+        track[0] = previous_positions
+        start = self.elapsed_time - step
+        for k in range(1, substeps):
+            self.scene.update(start + step * k / substeps)
+            track[k] = self.scene.positions
+        self.scene.update(self.elapsed_time)
+        track[substeps] = self.scene.positions
+        return track
+
+    def run(self, seconds, step, spawn_rate=0.0, on_tick=None):
+        """
+        Executa 'seconds' segundos de simulação em passos de 'step', o mais
+        rápido possível.
+
+        Args:
+            spawn_rate: Asteroides criados por segundo de simulação
+            on_tick: Função chamada após cada passo com os impactos do passo
+        """
+        ticks = int(round(seconds / step))
+        # Asteroides de cada passo pela meta acumulada (rate * t), sem acumular
+        # erro de ponto flutuante; o arredondamento evita que 3199.9999 vire 3199
+        spawned = 0
+        for k in range(1, ticks + 1):
+            target = int(round(spawn_rate * step * k, 6))
+            if target > spawned:
+                self.spawn_asteroids(target - spawned)
+                spawned = target
+            hits = self.tick(step)
+            if on_tick is not None:
+                on_tick(*hits)
+
+    def events(self):
+        """Todos os impactos registrados: (instantes, asteroides, nós), em ordem de passo"""
+        if not self.event_blocks:
+            return np.zeros(0), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        times, asteroids, nodes = zip(*self.event_blocks)
+        return np.concatenate(times), np.concatenate(asteroids), np.concatenate(nodes)
+
+    def statistics(self):
+        """Resumo da execução (dicionário serializável em JSON)"""
+        return {
+            'simulated_seconds': self.elapsed_time - self.start_time,
+            'ticks': self.ticks,
+            'tick_seconds': self.tick_seconds,
+            'ticks_per_second': self.ticks / self.tick_seconds if self.tick_seconds else 0.0,
+            'collision_substeps': self.substeps,
+            'spawned': self.spawned,
+            'expired': self.expired,
+            'alive': len(self.asteroids),
+            'max_alive': self.max_alive,
+            'impacts': int(self.impacts.sum()),
+            'impacts_per_node': {self.scene.names[i]: int(self.impacts[i]) for i in self.target_nodes},
+        }
@@ -16,7 +16,7 @@ from OpenGL.GL import (
     glGetAttribLocation, glNormal3f, glTexCoord2f, glScalef
 )
 from OpenGL.GLU import (
-    gluNewQuadric, gluQuadricTexture, gluSphere, gluDeleteQuadric, gluDisk
+    gluNewQuadric, gluDeleteQuadric, gluDisk
 )
 import numpy as np
 import math
@@ -24,21 +24,76 @@ import time
 import random
 import os
 import ctypes
-import pywavefront
+from functools import partial
 
 
 # Importar os módulos que criamos
 from collisions import *
-from shading_models import get_gouraud_program, get_phong_program
+from shading_models import (
+    get_gouraud_program, get_phong_program, get_unlit_program,
+    get_gouraud_instanced_program, get_phong_instanced_program, GL_VERSION_REQUIRED, require_context_version
+)
+from gpu_mesh import GpuMesh
+from asset_pack import open_asset_pack, build_asset_pack, bake_mesh, DEFAULT_PACK_PATH, TEXTURE_FILES, MODEL_FILES
+from asset_loader import AsyncAssetLoader, DEFAULT_UPLOAD_BUDGET_MS
+from procedural_textures import generate_texture_cached
+from transforms import translation, rotation_y, scaling
+from sphere_mesh import SphereLOD, projected_radius
+from frame_context import FrameContext, CameraUniformBuffer
+from texture_array import TextureArray, TEXTURE_ARRAY_NAMES
+from instancing import InstancedSphereRenderer
+from orbit_rings import OrbitRings
+from bezier_curves import BezierCurves
+from scene_graph import DEFAULT_SCENE
+from simulation_engine import SimulationEngine
+from fixed_timestep import FixedTimestep, DEFAULT_TICK_RATE, lerp
+from hud import HUD
+from frame_scheduler import FrameScheduler, DEFAULT_FRAME_MODE, DEFAULT_TARGET_FPS
+from frame_profiler import FrameProfiler
 import OpenGL.GL as gl
 
+# Nível de detalhe usado para a esfera do fundo estrelado (a câmera fica dentro dela)
+SKYBOX_LOD_LEVEL = 2
+# Asteroides criados de uma vez pela tecla M
+SWARM_SPAWN_COUNT = 1000
+# Até quantos asteroides vivos as curvas de Bézier e os avisos por impacto são exibidos
+FEW_ASTEROIDS = 8
+# Intervalo (s) de atualização do FPS e das estatísticas no HUD
+HUD_STATS_INTERVAL = 0.5
+# Arquivo CSV gravado pela tecla F4 (percentis por fase do perfilador)
+PROFILE_CSV = 'frame_profile.csv'
+# Eventos de entrada do usuário (medição da latência até a apresentação)
+INPUT_EVENTS = (pygame.KEYDOWN, pygame.KEYUP, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION)
+
+def model_scale(models):
+    """Maior fator de escala de cada matriz de modelo (N, 4, 4): raio das esferas envolventes no mundo"""
+    return np.linalg.norm(np.asarray(models)[:, :3, :3], axis=1).max(axis=1)
+
 class SolarExplorer:
-    def __init__(self, width=1280, height=720):
+    def __init__(self, width=1280, height=720, upload_budget_ms=DEFAULT_UPLOAD_BUDGET_MS, tick_rate=DEFAULT_TICK_RATE,
+                 frame_mode=DEFAULT_FRAME_MODE, target_fps=DEFAULT_TARGET_FPS, profile_csv=None,
+                 scene_path=DEFAULT_SCENE, seed=None, window=True):
         # Inicialização do Pygame e OpenGL
         pygame.init()
         self.width, self.height = width, height
-        self.screen = pygame.display.set_mode((width, height), DOUBLEBUF | OPENGL)
-        pygame.display.set_caption("Explorador do Sistema Solar")
+        # Ritmo de quadros: o vsync precisa ser pedido na criação da janela
+        self.scheduler = FrameScheduler(frame_mode, target_fps)
+        # Sem janela (window=False), usa o contexto OpenGL já atual (ex: offscreen_gl)
+        if window:
+            # Contexto 3.3 de compatibilidade: shaders GLSL 330 e o pipeline fixo (HUD, projeção)
+            pygame.display.gl_set_attribute(pygame.GL_CONTEXT_MAJOR_VERSION, GL_VERSION_REQUIRED[0])
+            pygame.display.gl_set_attribute(pygame.GL_CONTEXT_MINOR_VERSION, GL_VERSION_REQUIRED[1])
+            pygame.display.gl_set_attribute(pygame.GL_CONTEXT_PROFILE_MASK, pygame.GL_CONTEXT_PROFILE_COMPATIBILITY)
+            try:
+                self.screen = pygame.display.set_mode((width, height), DOUBLEBUF | OPENGL,
+                                                      vsync=1 if self.scheduler.uses_vsync else 0)
+            except pygame.error:
+                if not self.scheduler.uses_vsync:
+                    raise
+                self.scheduler.vsync_unavailable()
+                self.screen = pygame.display.set_mode((width, height), DOUBLEBUF | OPENGL)
+            pygame.display.set_caption("Explorador do Sistema Solar")
+        require_context_version()
         
         # Configurar OpenGL
         glClearColor(0.0, 0.0, 0.05, 1.0)
@@ -51,6 +106,15 @@ class SolarExplorer:
         # Corrigir: passar matriz transposta
         glLoadMatrixf(self.create_projection_matrix().T.astype(np.float32))
         
+        # Carregamento assíncrono: o pacote de recursos (reconstruído se desatualizado)
+        # é aberto em segundo plano e as texturas provisórias já ficam disponíveis
+        self.asset_loader = AsyncAssetLoader(budget_ms=upload_budget_ms)
+        self.asset_pack_future = self.asset_loader.run(open_asset_pack)
+        # Sem pacote válido, cada recurso é decodificado da origem em paralelo no pool;
+        # os resultados são guardados para gravar um novo pacote ao final
+        self.decoded_textures = {}
+        self.baked_meshes = {}
+        
         # Criar texturas
         self.textures = {}
         self.load_textures()
@@ -79,10 +143,23 @@ class SolarExplorer:
         self.last_mouse_pos = None
         self.keys = set()
         
-        # Controle de tempo
-        self.last_time = time.time()
-        self.elapsed_time = 0
-        self.delta_time = 0
+        # Controle de tempo: a simulação avança em passos fixos (tick_rate por
+        # segundo real); o desenho interpola entre o passo anterior e o atual
+        self.last_time = time.perf_counter()
+        self.timestep = FixedTimestep(tick_rate)
+        self.render_alpha = 0.0
+        
+        # Motor da simulação (sem pygame/OpenGL): grafo de cena, efemérides,
+        # asteroides e colisões; aqui apenas o seu estado é desenhado
+        self.engine = SimulationEngine(scene_path, seed=seed)
+        self.scene = self.engine.scene
+        self.ephemeris = self.engine.ephemeris
+        self.asteroids = self.engine.asteroids
+        self.target_nodes = self.engine.target_nodes
+        self.scene_bounds = self.engine.scene_bounds
+        self.scene_aabb = self.engine.scene_aabb
+        # Cópia do grafo avaliada no instante interpolado de cada frame
+        self.render_scene = self.scene.clone()
         
         # Pontos de controle para a curva de Bézier de Marte
         self.mars_bezier_points = [
@@ -92,112 +169,130 @@ class SolarExplorer:
             np.array([-16, 0, 0], dtype=np.float32)
         ]
         
-        # Asteroide
-        self.asteroid = None  # {'t': float, 'target': str, 'alive': True, ...}
-        self.asteroid_speed = 0.15  # velocidade de t por segundo
-        self.asteroid_radius = 0.27  # igual à lua
-        self.asteroid_curve = None  # pontos de controle da curva de Bézier
-        self.asteroid_target_planet = None
-        self.asteroid_target_planet_radius = None
-        self.asteroid_target_planet_func = None
-        # Limites da cena (paredes invisíveis)
-        self.scene_bounds = {
-            'x': (-40, 40),
-            'y': (-10, 10),
-            'z': (-40, 40)
-        }
         # Controle de arrasto do asteroide
         self.asteroid_dragging = False
         self.asteroid_last_mouse = None
 
         self.gouraud_prog = get_gouraud_program()
         self.phong_prog = get_phong_program()
-        self.sphere_vao, self.sphere_vbo, self.sphere_nbo, self.sphere_tbo, self.sphere_ebo, self.sphere_index_count = self.create_sphere_mesh(1.0, 32, 16)
+        self.unlit_prog = get_unlit_program()
+        # Esferas em vários níveis de detalhe, residentes na GPU
+        self.sphere_lod = SphereLOD()
+        # Planetas, luas e asteroides: desenho instanciado por modelo de iluminação
+        self.body_renderer = InstancedSphereRenderer(self.sphere_lod, {
+            'gouraud': get_gouraud_instanced_program(),
+            'phong': get_phong_instanced_program()
+        }, self.texture_array)
+        self.init_scene_batches()
+        # Trajetórias dos asteroides avaliadas no vertex shader
+        self.bezier_curves = BezierCurves()
+        
+        # Avisos e estatísticas na tela (atlas de glifos criado uma única vez)
+        self.hud = HUD(width, height)
+        self.hud_last_update = self.last_time
+        
+        # Perfilador por fase (F3 liga/desliga e mostra no HUD, F4 grava CSV); com
+        # profile_csv, começa ligado e grava o CSV ao sair
+        self.profile_csv = profile_csv
+        self.profiler = FrameProfiler(enabled=profile_csv is not None)
+        self.profile_lines = []
+        
+        # Estado da câmera por frame, compartilhado pelos programas via UBO
+        self.projection_matrix = self.create_projection_matrix()
+        self.camera_ubo = CameraUniformBuffer()
+        self.frame = None
     
-        # Carregar modelo OBJ complexo (satélite)
-        self.satellite_model = pywavefront.Wavefront(
-            'models/satellite.obj',
-            collect_faces=True,
-            create_materials=True,
-            parse=True
-        )
-        self.satellite_texture = self.load_texture('satellite', 'textures/satellite.jpg')
+        # Modelos OBJ complexos (satélite): desenhados assim que seus buffers chegarem à GPU
+        self.meshes = {}
+        for name in MODEL_FILES:
+            self.asset_loader.load_mesh(name, self.read_mesh, partial(self.set_mesh, name), name)
     
     def load_textures(self):
-        # Texturas para os planetas
-        texture_files = {
-            'sun': 'textures/sun.jpg',
-            'mercury': 'textures/mercury.jpg',
-            'venus': 'textures/venus.jpg',
-            'earth': 'textures/earth.jpg',
-            'moon': 'textures/moon.jpg',
-            'mars': 'textures/mars.jpg',
-            'jupiter': 'textures/jupiter.jpg',
-            'saturn': 'textures/saturn.jpg',
-            'stars': 'textures/stars.jpg',
-            'asteroid': 'textures/asteroid.jpg'
-        }
-        
         # Criar diretório de texturas se não existir
         if not os.path.exists("textures"):
             os.makedirs("textures")
         
-        # Carregar texturas ou criar fallbacks
-        for name, file_path in texture_files.items():
-            texture_id = self.load_texture(name, file_path)
-            self.textures[name] = texture_id
-            
-    def load_texture(self, name, file_path):
-        # Tentar carregar a textura do arquivo
+        # Texturas dos corpos desenhados por instanciamento ficam em camadas de um único array
+        self.texture_array = TextureArray(TEXTURE_ARRAY_NAMES)
+        
+        # Texturas fallback ficam ativas até a textura real ser decodificada e enviada
+        for name, file_path in TEXTURE_FILES.items():
+            if name in self.texture_array.layers:
+                self.texture_array.upload_layer(name, 256, 256, generate_texture_cached(name, 256))
+                self.asset_loader.load_texture_layer(name, self.decode_texture, self.texture_array,
+                                                     partial(self.texture_layer_loaded, name), name, file_path)
+            else:
+                self.textures[name] = self.create_fallback_texture(name)
+                self.asset_loader.load_texture(name, self.decode_texture, partial(self.replace_texture, name), name, file_path)
+    
+    def get_asset_pack(self):
+        """Aguarda e retorna o pacote de recursos (None se ausente ou desatualizado)"""
         try:
-            if os.path.exists(file_path):
-                surface = pygame.image.load(file_path)
-                texture_data = pygame.image.tostring(surface, 'RGBA', True)
-                width, height = surface.get_size()
-                
-                texture_id = glGenTextures(1)
-                glBindTexture(GL_TEXTURE_2D, texture_id)
-                
-                glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
-                glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
-                
-                glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, width, height, 0, GL_RGBA, GL_UNSIGNED_BYTE, texture_data)
-                
-                print(f"Carregada textura: {name} de {file_path}")
-                return texture_id
+            return self.asset_pack_future.result()
         except Exception as e:
-            print(f"Erro ao carregar textura {name}: {e}")
-        
-        # Criar textura fallback
-        print(f"Criando textura fallback para: {name}")
-        return self.create_fallback_texture(name)
+            print(f"Erro ao abrir pacote de recursos: {e}")
+            return None
     
-    def create_fallback_texture(self, name):
-        # Cores para os diferentes objetos
-        colors = {
-            'sun': ([255, 230, 125], [255, 180, 0]),
-            'mercury': ([150, 150, 150], [100, 100, 100]),
-            'venus': ([255, 198, 112], [180, 112, 60]),
-            'earth': ([30, 100, 200], [10, 150, 10]),
-            'moon': ([200, 200, 200], [100, 100, 100]),
-            'mars': ([220, 100, 50], [150, 50, 30]),
-            'jupiter': ([255, 220, 180], [200, 150, 100]),
-            'saturn': ([240, 220, 150], [200, 180, 120]),
-            'stars': ([20, 20, 40], [5, 5, 20])
-        }
-        
-        color1, color2 = colors.get(name, ([150, 150, 150], [100, 100, 100]))
+    def decode_texture(self, name, file_path):
+        """Obtém os texels RGBA de uma textura (executado no pool de threads)"""
+        # Texels já decodificados no pacote: a view do mmap vai direto para a GPU
+        pack = self.get_asset_pack()
+        if pack is not None and pack.has_texture(name):
+            return pack.texture(name)
         
-        # Criar textura
-        width, height = 256, 256
-        texture_data = np.zeros((height, width, 3), dtype=np.uint8)
-        
-        for i in range(height):
-            for j in range(width):
-                if (i // 32 + j // 32) % 2 == 0:
-                    texture_data[i, j] = color1
-                else:
-                    texture_data[i, j] = color2
+        # Tentar carregar a textura do arquivo
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"{file_path} (mantendo textura fallback)")
+        surface = pygame.image.load(file_path)
+        width, height = surface.get_size()
+        result = width, height, pygame.image.tostring(surface, 'RGBA', True)
+        if pack is None:
+            self.decoded_textures[name] = result
+        return result
+    
+    def replace_texture(self, name, texture_id):
+        """Substitui a textura provisória pela textura carregada"""
+        glDeleteTextures([self.textures[name]])
+        self.textures[name] = texture_id
+        print(f"Carregada textura: {name} de {TEXTURE_FILES[name]}")
+    
+    def texture_layer_loaded(self, name, layer):
+        """A camada do array já contém a textura carregada"""
+        print(f"Carregada textura: {name} de {TEXTURE_FILES[name]} (camada {layer})")
+    
+    def read_mesh(self, name):
+        """Obtém os arrays de uma malha do pacote (executado no pool de threads)"""
+        pack = self.get_asset_pack()
+        if pack is not None and pack.has_mesh(name):
+            return pack.mesh(name)
+        if not os.path.exists(MODEL_FILES[name]):
+            raise FileNotFoundError(MODEL_FILES[name])
+        result = bake_mesh(MODEL_FILES[name])
+        if pack is None:
+            self.baked_meshes[name] = result
+        return result
+    
+    def set_mesh(self, name, mesh):
+        self.meshes[name] = mesh
+    
+    def stream_assets(self):
+        """Envia para a GPU os recursos já decodificados, dentro do orçamento do frame"""
+        self.asset_loader.upload_pending()
+        if self.asset_loader.idle and self.asset_pack_future is not None:
+            # Todos os recursos já estão na GPU: o mapeamento pode ser liberado
+            pack = self.get_asset_pack()
+            if pack is not None:
+                pack.close()
+            else:
+                # Novo pacote gravado em segundo plano com o que já foi decodificado
+                self.asset_loader.run(build_asset_pack, DEFAULT_PACK_PATH, TEXTURE_FILES, MODEL_FILES,
+                                      self.decoded_textures, self.baked_meshes)
+                self.decoded_textures, self.baked_meshes = {}, {}
+            self.asset_pack_future = None
+    
+    def create_fallback_texture(self, name, size=256):
+        # Textura procedural (memorizada em disco por nome, tamanho e semente)
+        texture_data = generate_texture_cached(name, size)
         
         # Criar textura OpenGL
         texture_id = glGenTextures(1)
@@ -208,7 +303,7 @@ class SolarExplorer:
         glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
         
         # Carregar dados
-        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGB, width, height, 0, GL_RGB, GL_UNSIGNED_BYTE, texture_data)
+        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, size, size, 0, GL_RGBA, GL_UNSIGNED_BYTE, texture_data)
         
         return texture_id
     
@@ -231,103 +326,19 @@ class SolarExplorer:
     
     def draw_skybox(self):
         """Desenha o fundo estrelado"""
-        glDisable(GL_LIGHTING)
-        glPushMatrix()
-        # Centraliza a skybox na posição da câmera para que ela nunca "afaste"
-        if self.camera_type == "orbit":
-            cam = self.get_orbit_camera_position()
-        else:
-            cam = np.array(self.camera_position)
-        glTranslatef(cam[0], cam[1], cam[2])
-        glBindTexture(GL_TEXTURE_2D, self.textures['stars'])
-        glEnable(GL_TEXTURE_2D)
-        glFrontFace(GL_CW)
-        quadric = gluNewQuadric()
-        gluQuadricTexture(quadric, GL_TRUE)
-        gluSphere(quadric, 90.0, 32, 32)
-        gluDeleteQuadric(quadric)
-        glFrontFace(GL_CCW)
-        glDisable(GL_TEXTURE_2D)
-        glPopMatrix()
-        glEnable(GL_LIGHTING)
+        # Centraliza a skybox na posição da câmera para que ela nunca "afaste".
+        # A câmera está dentro da esfera: nível de detalhe fixo
+        self.draw_sphere_shader(self.unlit_prog, self.frame.eye, scale=90.0, texture=self.textures['stars'], level=SKYBOX_LOD_LEVEL)
     
     def draw_sun(self):
-        """Desenha o sol"""
-        glDisable(GL_LIGHTING)  # O sol emite luz, não é iluminado
-        
-        glPushMatrix()
-        
-        # Textura do sol
-        glBindTexture(GL_TEXTURE_2D, self.textures['sun'])
-        glEnable(GL_TEXTURE_2D)
-        
-        # Rotação do sol
-        sun_rotation = 15 * self.elapsed_time  # 15 graus por segundo
-        glRotatef(sun_rotation, 0, 1, 0)
-        
-        # Desenhar esfera
-        quadric = gluNewQuadric()
-        gluQuadricTexture(quadric, GL_TRUE)
-        gluSphere(quadric, 5.0, 32, 32)
-        gluDeleteQuadric(quadric)
-        
-        glDisable(GL_TEXTURE_2D)
-        glPopMatrix()
-        
-        glEnable(GL_LIGHTING)
-    
-    def draw_planet(self, name, radius, distance, orbit_angle, rotation_angle, texture_name=None):
-        """Desenha um planeta"""
-        if texture_name is None:
-            texture_name = name
-        
-        # Calcular posição do planeta na órbita
-        x = distance * math.cos(math.radians(orbit_angle))
-        z = distance * math.sin(math.radians(orbit_angle))
-        
-        glPushMatrix()
-        
-        # Translação para posição orbital
-        glTranslatef(x, 0, z)
-        
-        # Rotação própria
-        glRotatef(rotation_angle, 0, 1, 0)
-        
-        # Textura do planeta
-        glBindTexture(GL_TEXTURE_2D, self.textures[texture_name])
-        glEnable(GL_TEXTURE_2D)
-        
-        # Desenhar o planeta
-        quadric = gluNewQuadric()
-        gluQuadricTexture(quadric, GL_TRUE)
-        gluSphere(quadric, radius, 32, 32)
-        gluDeleteQuadric(quadric)
-        
-        glDisable(GL_TEXTURE_2D)
-        glPopMatrix()
-        
-        # Desenhar órbita se necessário
-        if self.show_orbits:
-            self.draw_orbit(distance)
-        
-        return x, 0, z  # Retornar posição para uso posterior (ex: para luas)
+        """Desenha o sol (nós 'emissive' da cena)"""
+        # O sol emite luz, não é iluminado
+        scene = self.render_scene
+        visible = self.cull(scene.positions[self.emissive_nodes], scene.scale[self.emissive_nodes])
+        for i in self.emissive_nodes[visible]:
+            self.draw_sphere_shader(self.unlit_prog, scene.positions[i], scale=scene.scale[i],
+                                    texture=self.textures[scene.nodes[i]['texture']], model=scene.models[i])
     
-    def draw_orbit(self, distance):
-        """Desenha a órbita como um círculo"""
-        glDisable(GL_LIGHTING)
-        glDisable(GL_TEXTURE_2D)
-        
-        # Desenhar círculo da órbita
-        glColor3f(0.5, 0.5, 0.5)  # Cinza
-        glBegin(GL_LINE_LOOP)
-        for i in range(100):
-            angle = 2.0 * math.pi * i / 100
-            glVertex3f(distance * math.cos(angle), 0, distance * math.sin(angle))
-        glEnd()
-        
-        glEnable(GL_LIGHTING)
-    
-
     def get_orbit_camera_position(self):
         """Retorna a posição atual da câmera orbital"""
         # Converter ângulos para radianos
@@ -341,6 +352,33 @@ class SolarExplorer:
         
         return np.array([x, y, z])
     
+    def camera_eye(self):
+        """Posição do observador usada para iluminação e para o fundo estrelado"""
+        if self.camera_type == "orbit":
+            return self.get_orbit_camera_position()
+        return np.array(self.camera_position, dtype=np.float32)
+    
+    def begin_frame(self):
+        """Calcula o estado da câmera do frame e o envia uma única vez para o UBO"""
+        self.frame = FrameContext(self.create_view_matrix(), self.projection_matrix, self.camera_eye(),
+                                  viewport=(self.width, self.height))
+        self.camera_ubo.upload(self.frame)
+        # Contadores do recorte pelo volume de visão neste frame
+        self.drawn_objects = 0
+        self.culled_objects = 0
+        return self.frame
+
+    def cull(self, centers, radii):
+        """
+        Recorte pelo volume de visão do frame: máscara das esferas envolventes
+        que podem aparecer na tela (as demais não são desenhadas).
+        """
+        visible = sphere_set_frustum_collision(SphereSet(centers, radii), self.frame.frustum)
+        drawn = int(np.count_nonzero(visible))
+        self.drawn_objects += drawn
+        self.culled_objects += len(visible) - drawn
+        return visible
+    
     # Funções auxiliares para criar matrizes manualmente (requisito do trabalho)
     def create_view_matrix(self):
         """Cria uma matriz de visualização baseada na câmera atual"""
@@ -418,21 +456,11 @@ class SolarExplorer:
         
         return projection
 
-    def update(self):
-        """Atualiza o estado da simulação"""
-        # Calcular tempo decorrido
-        current_time = time.time()
-        delta_time = current_time - self.last_time
-        self.last_time = current_time
-        
-        # Só atualizar o tempo se não estiver pausado
-        if not self.paused:
-            # Ajustar pela velocidade da simulação
-            self.elapsed_time += delta_time * self.simulation_speed
-    
     def handle_events(self):
         """Processa eventos do usuário"""
         for event in pygame.event.get():
+            if event.type in INPUT_EVENTS:
+                self.scheduler.input_received()
             if event.type == pygame.QUIT:
                 return False
             elif event.type == pygame.KEYDOWN:
@@ -447,16 +475,23 @@ class SolarExplorer:
                     print("Simulação " + ("pausada" if self.paused else "continuada"))
                 elif event.key == pygame.K_o:
                     self.show_orbits = not self.show_orbits
+                elif event.key == pygame.K_F3:
+                    print("Perfilador " + ("ligado" if self.profiler.toggle() else "desligado"))
+                elif event.key == pygame.K_F4:
+                    self.profiler.export_csv(PROFILE_CSV)
+                    print(f"Perfil gravado em {PROFILE_CSV}")
                 elif event.key in (pygame.K_PLUS, pygame.K_KP_PLUS):
                     self.simulation_speed *= 1.5
                     print(f"Velocidade: {self.simulation_speed:.1f}x")
                 elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
                     self.simulation_speed /= 1.5
                     print(f"Velocidade: {self.simulation_speed:.1f}x")
-                # Criar asteroide com tecla 'n'
+                # Criar asteroide com tecla 'n' e um enxame com 'm'
                 if event.key == pygame.K_n:
-                    if self.asteroid is None or not self.asteroid.get('alive', False):
-                        self.spawn_asteroid()
+                    self.spawn_asteroid()
+                elif event.key == pygame.K_m:
+                    self.spawn_asteroid(SWARM_SPAWN_COUNT)
+                    print(f"Asteroides: {len(self.asteroids)}")
             elif event.type == pygame.KEYUP:
                 if event.key in self.keys:
                     self.keys.remove(event.key)
@@ -505,310 +540,89 @@ class SolarExplorer:
                 self.camera_position[1] -= speed
         # Remover movimento do asteroide com teclado
 
-    def spawn_asteroid(self):
-        """Cria um asteroide com trajetória automática para um planeta aleatório"""
-        # Lista de planetas possíveis (nome, função para posição, raio)
-        planet_defs = [
-            ('mercury', lambda t: [
-                8 * math.cos(math.radians(48 * t)),
-                0,
-                8 * math.sin(math.radians(48 * t))
-            ], 0.38),
-            ('venus', lambda t: [
-                10 * math.cos(math.radians(35 * t)),
-                0,
-                10 * math.sin(math.radians(35 * t))
-            ], 0.95),
-            ('earth', lambda t: [
-                14 * math.cos(math.radians(29 * t)),
-                0,
-                14 * math.sin(math.radians(29 * t))
-            ], 1.0),
-            # Marte agora tem órbita circular
-            ('mars', lambda t: [
-                18 * math.cos(math.radians(24 * t)),
-                0,
-                18 * math.sin(math.radians(24 * t))
-            ], 0.53),
-            ('jupiter', lambda t: [
-                25 * math.cos(math.radians(13 * t)),
-                0,
-                25 * math.sin(math.radians(13 * t))
-            ], 3.0),
-            ('saturn', lambda t: [
-                32 * math.cos(math.radians(9 * t)),
-                0,
-                32 * math.sin(math.radians(9 * t))
-            ], 2.5)
-        ]
-        # Escolher planeta aleatório
-        pname, pfunc, pradius = random.choice(planet_defs)
-        # Posição do planeta no tempo atual
-        tnow = self.elapsed_time
-        if pname == 'mars':
-            ppos = pfunc(tnow)
-            if isinstance(ppos, np.ndarray):
-                ppos = ppos.tolist()
-        else:
-            ppos = pfunc(tnow)
-        # Ponto inicial aleatório dentro dos limites da cena (exceto perto do planeta)
-        while True:
-            x = random.uniform(self.scene_bounds['x'][0]+5, self.scene_bounds['x'][1]-5)
-            y = random.uniform(self.scene_bounds['y'][0]+2, self.scene_bounds['y'][1]-2)
-            z = random.uniform(self.scene_bounds['z'][0]+5, self.scene_bounds['z'][1]-5)
-            if np.linalg.norm(np.array([x, y, z]) - np.array(ppos)) > 10:
-                break
-        p0 = np.array([x, y, z], dtype=np.float32)
-        p3 = np.array(ppos, dtype=np.float32)
-        # Dois pontos de controle intermediários aleatórios (entre p0 e p3)
-        def random_ctrl(p0, p3, spread=8):
-            v = p3 - p0
-            t = random.uniform(0.25, 0.75)
-            base = p0 + v * t
-            offset = np.random.uniform(-spread, spread, 3)
-            return base + offset
-        p1 = random_ctrl(p0, p3)
-        p2 = random_ctrl(p0, p3)
-        self.asteroid_curve = [p0, p1, p2, p3]
-        self.asteroid_target_planet = pname
-        self.asteroid_target_planet_radius = pradius
-        self.asteroid_target_planet_func = pfunc
-        self.asteroid = {
-            't': 0.0,
-            'alive': True
-        }
+    def spawn_asteroid(self, count=1):
+        """Cria asteroides com trajetória automática para planetas aleatórios"""
+        self.engine.spawn_asteroids(count)
 
     def update(self):
-        """Atualiza o estado da simulação"""
-        current_time = time.time()
+        """Executa os passos fixos correspondentes ao tempo real do frame"""
+        current_time = time.perf_counter()
         delta_time = current_time - self.last_time
         self.last_time = current_time
-        if not self.paused:
-            self.elapsed_time += delta_time * self.simulation_speed
-        # Atualizar asteroide automático
-        if self.asteroid and self.asteroid.get('alive', False):
-            # Atualizar ponto final da curva para seguir planeta alvo
-            pname = self.asteroid_target_planet
-            pfunc = self.asteroid_target_planet_func
-            pradius = self.asteroid_target_planet_radius
-            tnow = self.elapsed_time
-            if pname == 'mars':
-                p3 = pfunc(tnow)
-                if isinstance(p3, np.ndarray):
-                    p3 = p3.tolist()
-            else:
-                p3 = pfunc(tnow)
-            p3 = np.array(p3, dtype=np.float32)
-            # Atualizar curva: p0, p1, p2 mantêm, p3 muda
-            self.asteroid_curve[3] = p3
-            # Avançar t
-            self.asteroid['t'] += self.asteroid_speed * delta_time * self.simulation_speed
-            tval = min(self.asteroid['t'], 1.0)
-            pos = self.bezier_cubic(tval, *self.asteroid_curve)
-            self.asteroid['pos'] = pos.tolist()
-            # Testar colisão com planeta alvo
-            planet_sphere = Sphere(p3.tolist(), pradius)
-            asteroid_sphere = Sphere(pos.tolist(), self.asteroid_radius)
-            if sphere_sphere_collision(asteroid_sphere, planet_sphere):
-                self.asteroid['alive'] = False
-                print(f"Colisão: Asteroide colidiu com {pname.upper()}!")
+        for _ in range(self.timestep.advance(delta_time)):
+            self.tick(self.timestep.dt * self.simulation_speed if not self.paused else 0.0)
+        self.render_alpha = self.timestep.alpha
+
+    def tick(self, step):
+        """Avança a simulação em um passo fixo de 'step' segundos de simulação"""
+        few = len(self.asteroids) <= FEW_ASTEROIDS
+        hit_asteroids, hit_nodes, hit_times = self.engine.tick(step)
+        if len(hit_nodes) == 1 or (few and len(hit_nodes)):
+            for node, impact_time in zip(hit_nodes, hit_times):
+                pname = self.scene.names[node]
+                print(f"Colisão: Asteroide colidiu com {pname.upper()}! (t = {impact_time:.3f} s)")
+                # Exibe aviso na tela (HUD, sem bloquear o loop)
                 self.show_warning(f"Asteroide colidiu com {pname.upper()}!")
-            # Se chegou ao final da curva sem colidir, remove também
-            elif self.asteroid['t'] >= 1.0:
-                self.asteroid['alive'] = False
-        # Testar colisão do asteroide com planetas
-        if self.asteroid and self.asteroid.get('alive', False):
-            asteroid_sphere = Sphere(self.asteroid['pos'], self.asteroid_radius)
-            # Lista de planetas (nome, posição, raio)
-            planets = []
-            # Mercúrio
-            mercury_orbit = 48 * self.elapsed_time
-            mercury_pos = [
-                8 * math.cos(math.radians(mercury_orbit)),
-                0,
-                8 * math.sin(math.radians(mercury_orbit))
-            ]
-            planets.append(('mercury', mercury_pos, 0.38))
-            # Vênus
-            venus_orbit = 35 * self.elapsed_time
-            venus_pos = [
-                10 * math.cos(math.radians(venus_orbit)),
-                0,
-                10 * math.sin(math.radians(venus_orbit))
-            ]
-            planets.append(('venus', venus_pos, 0.95))
-            # Terra
-            earth_orbit = 29 * self.elapsed_time
-            earth_pos = [
-                14 * math.cos(math.radians(earth_orbit)),
-                0,
-                14 * math.sin(math.radians(earth_orbit))
-            ]
-            planets.append(('earth', earth_pos, 1.0))
-            # Marte (agora órbita circular)
-            mars_orbit = 24 * self.elapsed_time
-            mars_pos = [
-                18 * math.cos(math.radians(mars_orbit)),
-                0,
-                18 * math.sin(math.radians(mars_orbit))
-            ]
-            planets.append(('mars', mars_pos, 0.53))
-            # Júpiter
-            jupiter_orbit = 13 * self.elapsed_time
-            jupiter_pos = [
-                25 * math.cos(math.radians(jupiter_orbit)),
-                0,
-                25 * math.sin(math.radians(jupiter_orbit))
-            ]
-            planets.append(('jupiter', jupiter_pos, 3.0))
-            # Saturno
-            saturn_orbit = 9 * self.elapsed_time
-            saturn_pos = [
-                32 * math.cos(math.radians(saturn_orbit)),
-                0,
-                32 * math.sin(math.radians(saturn_orbit))
-            ]
-            planets.append(('saturn', saturn_pos, 2.5))
-            # Sol (não pode colidir)
-            sun_pos = [0, 0, 0]
-            sun_radius = 5.0
-            # Teste: se asteroide está dentro do sol, empurra para fora
-            dist_to_sun = np.linalg.norm(np.array(self.asteroid['pos']) - np.array(sun_pos))
-            if dist_to_sun < sun_radius + self.asteroid_radius:
-                # Empurra para fora do sol
-                direction = np.array(self.asteroid['pos']) - np.array(sun_pos)
-                if np.linalg.norm(direction) == 0:
-                    direction = np.array([1, 0, 0])
-                direction = direction / np.linalg.norm(direction)
-                self.asteroid['pos'] = (np.array(sun_pos) + direction * (sun_radius + self.asteroid_radius + 0.1)).tolist()
-            # Testa colisão com planetas (exceto sol)
-            for pname, ppos, pradius in planets:
-                planet_sphere = Sphere(ppos, pradius)
-                if sphere_sphere_collision(asteroid_sphere, planet_sphere):
-                    self.asteroid['alive'] = False
-                    print(f"Colisão: Asteroide colidiu com {pname.upper()}!")
-                    # Exibe aviso na tela (pygame)
-                    self.show_warning(f"Asteroide colidiu com {pname.upper()}!")
-                    break
-            # Testa colisão com paredes (AABB)
-            asteroid_aabb = create_aabb_for_object(self.asteroid['pos'], [self.asteroid_radius*2]*3)
-            scene_aabb = AABB(
-                [self.scene_bounds['x'][0], self.scene_bounds['y'][0], self.scene_bounds['z'][0]],
-                [self.scene_bounds['x'][1], self.scene_bounds['y'][1], self.scene_bounds['z'][1]]
-            )
-            if not aabb_aabb_collision(asteroid_aabb, scene_aabb):
-                # Fora da cena, ajusta para dentro
-                pos = np.array(self.asteroid['pos'])
-                for i, axis in enumerate(['x', 'y', 'z']):
-                    minb, maxb = self.scene_bounds[axis]
-                    if pos[i] - self.asteroid_radius < minb:
-                        pos[i] = minb + self.asteroid_radius
-                    if pos[i] + self.asteroid_radius > maxb:
-                        pos[i] = maxb - self.asteroid_radius
-                self.asteroid['pos'] = pos.tolist()
-    
+        elif len(hit_nodes):
+            print(f"Colisão: {len(hit_nodes)} asteroides colidiram com planetas")
+            self.show_warning("Asteroides colidiram com planetas!")
+
     def show_warning(self, text):
-        """Exibe um aviso na tela por alguns segundos"""
-        font = pygame.font.SysFont("Arial", 36, bold=True)
-        surface = font.render(text, True, (255, 80, 80))
-        self.screen.blit(surface, (self.width//2 - surface.get_width()//2, 40))
-        pygame.display.flip()
-        pygame.time.wait(1200)  # 1.2 segundos
+        """Exibe um aviso na tela por alguns segundos (sem bloquear o loop)"""
+        self.hud.push(text)
 
-    def create_sphere_mesh(self, radius, slices, stacks):
-        """Cria a malha para uma esfera com coordenadas de textura"""
-        vertices = []
-        normals = []
-        texcoords = []
-        indices = []
-        for i in range(stacks + 1):
-            lat = math.pi * i / stacks
-            v = i / stacks
-            for j in range(slices + 1):
-                lon = 2 * math.pi * j / slices
-                u = j / slices
-                x = radius * math.sin(lat) * math.cos(lon)
-                y = radius * math.cos(lat)
-                z = radius * math.sin(lat) * math.sin(lon)
-                vertices.extend([x, y, z])
-                normals.extend([math.sin(lat) * math.cos(lon), math.cos(lat), math.sin(lat) * math.sin(lon)])
-                texcoords.extend([u, 1 - v])
-        for i in range(stacks):
-            for j in range(slices):
-                first = i * (slices + 1) + j
-                second = first + slices + 1
-                indices.extend([first, second, first + 1])
-                indices.extend([second, second + 1, first + 1])
-        vertices = np.array(vertices, dtype=np.float32)
-        normals = np.array(normals, dtype=np.float32)
-        texcoords = np.array(texcoords, dtype=np.float32)
-        indices = np.array(indices, dtype=np.uint32)
-        vao = glGenVertexArrays(1)
-        glBindVertexArray(vao)
-        vbo = glGenBuffers(1)
-        glBindBuffer(GL_ARRAY_BUFFER, vbo)
-        glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices, GL_STATIC_DRAW)
-        nbo = glGenBuffers(1)
-        glBindBuffer(GL_ARRAY_BUFFER, nbo)
-        glBufferData(GL_ARRAY_BUFFER, normals.nbytes, normals, GL_STATIC_DRAW)
-        tbo = glGenBuffers(1)
-        glBindBuffer(GL_ARRAY_BUFFER, tbo)
-        glBufferData(GL_ARRAY_BUFFER, texcoords.nbytes, texcoords, GL_STATIC_DRAW)
-        ebo = glGenBuffers(1)
-        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, ebo)
-        glBufferData(GL_ELEMENT_ARRAY_BUFFER, indices.nbytes, indices, GL_STATIC_DRAW)
-        glBindVertexArray(0)
-        return vao, vbo, nbo, tbo, ebo, len(indices)
+    def update_hud_stats(self):
+        """Atualiza as linhas de FPS e estatísticas do HUD a cada HUD_STATS_INTERVAL"""
+        now = time.perf_counter()
+        if now - self.hud_last_update < HUD_STATS_INTERVAL:
+            return
+        self.hud_last_update = now
+        self.hud.set_line('frames', self.scheduler.summary())
+        self.hud.set_line('simulation', f"Tempo: {self.engine.elapsed_time:.1f} s  Velocidade: {self.simulation_speed:.1f}x"
+                          + ("  (pausado)" if self.paused else ""))
+        self.hud.set_line('asteroids', f"Asteroides: {len(self.asteroids)}  Impactos: {int(self.engine.impacts.sum())}")
+        self.hud.set_line('culling', f"Objetos desenhados: {self.drawn_objects}  fora da tela: {self.culled_objects}")
+        # Percentis p50/p95/p99 (ms) de cada fase do perfilador
+        for key in self.profile_lines:
+            self.hud.set_line(key, None)
+        lines = self.profiler.overlay_lines() if self.profiler.enabled else []
+        self.profile_lines = [f"profile{i}" for i in range(len(lines))]
+        for key, text in zip(self.profile_lines, lines):
+            self.hud.set_line(key, text)
 
-    def draw_sphere_shader(self, program, position, scale=1.0, texture=None):
-        gl.glUseProgram(program)
-        model = np.identity(4, dtype=np.float32)
-        model[:3, 3] = position
-        model[:3, :3] *= scale
-        loc_model = gl.glGetUniformLocation(program, "model")
-        loc_view = gl.glGetUniformLocation(program, "view")
-        loc_proj = gl.glGetUniformLocation(program, "projection")
-        loc_light = gl.glGetUniformLocation(program, "lightPos")
-        loc_viewpos = gl.glGetUniformLocation(program, "viewPos")
-        gl.glUniformMatrix4fv(loc_model, 1, gl.GL_TRUE, model)
-        gl.glUniformMatrix4fv(loc_view, 1, gl.GL_TRUE, self.create_view_matrix())
-        gl.glUniformMatrix4fv(loc_proj, 1, gl.GL_TRUE, self.create_projection_matrix())
-        gl.glUniform3f(loc_light, 0, 0, 0)
-        cam_pos = self.get_orbit_camera_position() if self.camera_type == "orbit" else np.array(self.camera_position)
-        gl.glUniform3f(loc_viewpos, *cam_pos)
-        # Bind texture if provided
-        if texture is not None:
-            gl.glActiveTexture(gl.GL_TEXTURE0)
-            gl.glBindTexture(gl.GL_TEXTURE_2D, texture)
-            tex_loc = gl.glGetUniformLocation(program, "tex")
-            if tex_loc != -1:
-                gl.glUniform1i(tex_loc, 0)
-        gl.glBindVertexArray(self.sphere_vao)
-        pos_loc = gl.glGetAttribLocation(program, "position")
-        norm_loc = gl.glGetAttribLocation(program, "normal")
-        tex_loc = gl.glGetAttribLocation(program, "texcoord")
-        # VBO posição
-        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self.sphere_vbo)
-        gl.glEnableVertexAttribArray(pos_loc)
-        gl.glVertexAttribPointer(pos_loc, 3, gl.GL_FLOAT, gl.GL_FALSE, 0, None)
-        # VBO normal
-        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self.sphere_nbo)
-        gl.glEnableVertexAttribArray(norm_loc)
-        gl.glVertexAttribPointer(norm_loc, 3, gl.GL_FLOAT, gl.GL_FALSE, 0, None)
-        # VBO texcoord
-        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self.sphere_tbo)
-        gl.glEnableVertexAttribArray(tex_loc)
-        gl.glVertexAttribPointer(tex_loc, 2, gl.GL_FLOAT, gl.GL_FALSE, 0, None)
-        # EBO
-        gl.glBindBuffer(gl.GL_ELEMENT_ARRAY_BUFFER, self.sphere_ebo)
-        gl.glDrawElements(gl.GL_TRIANGLES, self.sphere_index_count, gl.GL_UNSIGNED_INT, None)
-        gl.glDisableVertexAttribArray(pos_loc)
-        gl.glDisableVertexAttribArray(norm_loc)
-        gl.glDisableVertexAttribArray(tex_loc)
-        gl.glBindVertexArray(0)
-        if texture is not None:
-            gl.glBindTexture(gl.GL_TEXTURE_2D, 0)
-        gl.glUseProgram(0)
+    def draw_sphere_shader(self, program, position, scale=1.0, texture=None, rotation=0.0, level=None, model=None):
+        """Desenha uma esfera escolhendo o nível de detalhe pelo seu raio projetado na tela"""
+        if level is None:
+            frame = self.frame
+            radius_px = projected_radius(position, scale, frame.eye, frame.focal_length, frame.viewport_height)
+            mesh = self.sphere_lod.select(radius_px)
+        else:
+            mesh = self.sphere_lod.meshes[level]
+        if model is None:
+            model = translation(*position) @ rotation_y(rotation) @ scaling(scale)
+        self.draw_mesh_shader(program, mesh, model, texture=texture)
+
+    def init_scene_batches(self):
+        """Agrupa os nós da cena pela forma de desenho"""
+        scene = self.scene
+        self.emissive_nodes = scene.select(draw='emissive')
+        self.ring_nodes = scene.select(draw='rings')
+        self.mesh_nodes = scene.select(draw='mesh')
+        self.orbit_nodes = scene.select(orbit=True)
+        # Anéis das órbitas (semieixo maior): gerados uma vez, desenhados com uma única chamada
+        ephemeris = self.ephemeris
+        self.orbit_rings = OrbitRings([ephemeris.semi_major_axis[ephemeris.index[scene.nodes[i]['body']]]
+                                       for i in self.orbit_nodes])
+        # Corpos iluminados: um lote por programa para o desenho instanciado
+        bodies = scene.select(draw='body')
+        default_layer = self.texture_array.layer('asteroid')
+        programs = np.array([scene.nodes[i].get('program', 'gouraud') for i in bodies])
+        self.body_batches = []
+        for program_name in np.unique(programs):
+            indices = bodies[programs == program_name]
+            layers = np.array([self.texture_array.layers.get(scene.nodes[i].get('texture', scene.names[i]), default_layer)
+                               for i in indices], dtype=np.float32)
+            self.body_batches.append((str(program_name), indices, layers))
 
     def draw_scene(self):
         """Desenha toda a cena"""
@@ -819,210 +633,146 @@ class SolarExplorer:
         glMatrixMode(GL_MODELVIEW)
         glLoadIdentity()
         
-        # Configurar câmera
+        # Configurar câmera (estado calculado uma única vez por frame)
+        self.begin_frame()
         self.setup_camera()
         
         # Atualizar posição da luz para o sol
         glLightfv(GL_LIGHT0, GL_POSITION, [0, 0, 0, 1])
         
+        # Estado da cena interpolado entre o passo anterior e o atual
+        profiler = self.profiler
+        with profiler.phase('scene_graph'):
+            self.render_scene.update(lerp(self.engine.previous_time, self.engine.elapsed_time, self.render_alpha))
+        
         # Desenhar skybox
-        self.draw_skybox()
+        with profiler.phase('skybox'):
+            self.draw_skybox()
         
         # Desenhar sol
-        self.draw_sun()
+        with profiler.phase('sun'):
+            self.draw_sun()
         
-        # Desenhar planetas usando curvas de Bézier para as órbitas e cálculos baseados em tempo
-        # Cada planeta tem seu período orbital e rotacional baseado em dados reais (simplificados)
+        # Corpos iluminados são acumulados e desenhados juntos no fim (instanciamento)
+        self.body_renderer.begin()
         
-        # Mercúrio (Gouraud + textura)
-        mercury_orbit = 48 * self.elapsed_time
-        mercury_rotation = 10 * self.elapsed_time
-        mercury_x = 8 * math.cos(math.radians(mercury_orbit))
-        mercury_z = 8 * math.sin(math.radians(mercury_orbit))
+        # Planetas e luas: matrizes de modelo já calculadas pelo grafo de cena
+        scene = self.render_scene
         if self.show_orbits:
-            self.draw_orbit(8)
-        self.draw_sphere_shader(self.gouraud_prog, position=[mercury_x, 0, mercury_z], scale=0.38, texture=self.textures['mercury'])
+            with profiler.phase('orbits'):
+                self.orbit_rings.draw(self.frame)
+        for program_name, indices, layers in self.body_batches:
+            models, radii = scene.models[indices], scene.scale[indices]
+            visible = self.cull(models[:, :3, 3], radii)
+            self.body_renderer.add_models(program_name, models[visible], radii[visible], layers[visible])
 
-        # Vênus (Phong + textura)
-        venus_orbit = 35 * self.elapsed_time
-        venus_rotation = 8 * self.elapsed_time
-        venus_x = 10 * math.cos(math.radians(venus_orbit))
-        venus_z = 10 * math.sin(math.radians(venus_orbit))
-        if self.show_orbits:
-            self.draw_orbit(10)
-        self.draw_sphere_shader(self.phong_prog, position=[venus_x, 0, venus_z], scale=0.95, texture=self.textures['venus'])
-
-        # Terra (Gouraud + textura)
-        earth_orbit = 29 * self.elapsed_time
-        earth_rotation = 365 * self.elapsed_time
-        earth_x = 14 * math.cos(math.radians(earth_orbit))
-        earth_z = 14 * math.sin(math.radians(earth_orbit))
-        if self.show_orbits:
-            self.draw_orbit(14)
-        self.draw_sphere_shader(self.gouraud_prog, position=[earth_x, 0, earth_z], scale=1.0, texture=self.textures['earth'])
+        # Anéis (Saturno)
+        with profiler.phase('rings'):
+            models = scene.models[self.ring_nodes]
+            radii = np.array([scene.nodes[i]['outer_radius'] for i in self.ring_nodes]) * model_scale(models)
+            visible = self.cull(models[:, :3, 3], radii)
+            for i in self.ring_nodes[visible]:
+                self.draw_rings(scene.nodes[i], scene.models[i])
 
-        # Lua (orbita ao redor da Terra)
-        glPushMatrix()
-        glTranslatef(earth_x, 0, earth_z)
-        moon_orbit = 10 * self.elapsed_time
-        moon_rotation = 10 * self.elapsed_time
-        moon_x = 2.5 * math.cos(math.radians(moon_orbit))
-        moon_z = 2.5 * math.sin(math.radians(moon_orbit))
-        glTranslatef(moon_x, 0, moon_z)
-        glRotatef(moon_rotation, 0, 1, 0)
-        glBindTexture(GL_TEXTURE_2D, self.textures['moon'])
-        glEnable(GL_TEXTURE_2D)
-        quadric = gluNewQuadric()
-        gluQuadricTexture(quadric, GL_TRUE)
-        gluSphere(quadric, 0.27, 16, 16)
-        gluDeleteQuadric(quadric)
-        glDisable(GL_TEXTURE_2D)
-        glPopMatrix()
-
-        # Marte (Gouraud + textura)
-        mars_orbit = 24 * self.elapsed_time
-        mars_rotation = 350 * self.elapsed_time
-        mars_x = 18 * math.cos(math.radians(mars_orbit))
-        mars_z = 18 * math.sin(math.radians(mars_orbit))
-        if self.show_orbits:
-            self.draw_orbit(18)
-        self.draw_sphere_shader(self.gouraud_prog, position=[mars_x, 0, mars_z], scale=0.53, texture=self.textures['mars'])
-
-        # Júpiter (Gouraud + textura)
-        jupiter_orbit = 13 * self.elapsed_time
-        jupiter_rotation = 870 * self.elapsed_time
-        jupiter_x = 25 * math.cos(math.radians(jupiter_orbit))
-        jupiter_z = 25 * math.sin(math.radians(jupiter_orbit))
-        if self.show_orbits:
-            self.draw_orbit(25)
-        self.draw_sphere_shader(self.gouraud_prog, position=[jupiter_x, 0, jupiter_z], scale=3.0, texture=self.textures['jupiter'])
-
-        # Saturno (Gouraud + textura)
-        saturn_orbit = 9 * self.elapsed_time
-        saturn_rotation = 820 * self.elapsed_time
-        saturn_x = 32 * math.cos(math.radians(saturn_orbit))
-        saturn_z = 32 * math.sin(math.radians(saturn_orbit))
-        if self.show_orbits:
-            self.draw_orbit(32)
-        self.draw_sphere_shader(self.gouraud_prog, position=[saturn_x, 0, saturn_z], scale=2.5, texture=self.textures['saturn'])
-
-        # Anéis de Saturno
+        # Asteroides: todo o enxame em um único lote instanciado
+        swarm = self.asteroids
+        alive = swarm.alive_indices()
+        positions = swarm.interpolated_positions(self.render_alpha, alive)
+        self.body_renderer.add_many('gouraud', positions[self.cull(positions, swarm.radius)], swarm.radius,
+                                    self.texture_array.layer('asteroid'))
+        if len(alive) <= FEW_ASTEROIDS:
+            with profiler.phase('bezier'):
+                self.bezier_curves.draw(swarm.control[alive], self.frame)
+        
+        # Todos os planetas, a lua e os asteroides: um glDrawElementsInstanced por grupo
+        with profiler.phase('planets'):
+            self.body_renderer.flush(self.frame)
+        
+        # --- Modelos OBJ complexos (satélite em órbita da Terra) ---
+        with profiler.phase('satellite'):
+            for i in self.mesh_nodes:
+                node = scene.nodes[i]
+                mesh = self.meshes.get(node['mesh'])
+                model = scene.models[i]
+                if mesh is not None and self.cull(model[None, :3, 3], mesh.bounding_radius * model_scale(model[None]))[0]:
+                    self.draw_mesh_shader(self.gouraud_prog, mesh, model, texture=self.textures[node['texture']])
+        
+        # HUD: avisos e estatísticas sobre a cena, em um único desenho
+        with profiler.phase('hud'):
+            self.update_hud_stats()
+            self.hud.draw()
+    
+    def draw_rings(self, node, model):
+        """Desenha um anel (disco) com a matriz de modelo do nó"""
         glPushMatrix()
-        glTranslatef(saturn_x, 0, saturn_z)
-        glRotatef(80, 1, 0, 0)
+        glMultMatrixf(model.T)
         glDisable(GL_LIGHTING)
-        glColor4f(1.0, 1.0, 0.8, 0.7)
-        inner_radius = 3.0
-        outer_radius = 5.0
+        glColor4f(*node.get('color', (1.0, 1.0, 1.0, 1.0)))
         quadric = gluNewQuadric()
-        gluDisk(quadric, inner_radius, outer_radius, 32, 4)
+        gluDisk(quadric, node['inner_radius'], node['outer_radius'], 32, 4)
         gluDeleteQuadric(quadric)
         glEnable(GL_LIGHTING)
         glPopMatrix()
 
-        # Asteroide
-        if self.asteroid and self.asteroid.get('alive', False):
-            glPushMatrix()
-            glTranslatef(*self.asteroid['pos'])
-            glBindTexture(GL_TEXTURE_2D, self.textures['asteroid'])
-            glEnable(GL_TEXTURE_2D)
-            quadric = gluNewQuadric()
-            gluQuadricTexture(quadric, GL_TRUE)
-            gluSphere(quadric, self.asteroid_radius, 16, 16)
-            gluDeleteQuadric(quadric)
-            glDisable(GL_TEXTURE_2D)
-            glPopMatrix()
-            self.draw_bezier_orbit(self.asteroid_curve, steps=100)
-        
-        # --- Satélite OBJ complexo em órbita da Terra ---
-        self.draw_satellite(earth_x, earth_z)
-    
-    def draw_satellite(self, earth_x, earth_z):
-        """Desenha o satélite (modelo OBJ) em órbita da Terra"""
-        glPushMatrix()
-        # Posição orbital do satélite em torno da Terra
-        sat_orbit = 60 * self.elapsed_time
-        sat_radius = 3.5
-        sat_x = earth_x + sat_radius * math.cos(math.radians(sat_orbit))
-        sat_z = earth_z + sat_radius * math.sin(math.radians(sat_orbit))
-        glTranslatef(sat_x, 0.5, sat_z)
-        glRotatef(sat_orbit * 2, 0, 1, 0)  # Rotação própria
-        glScalef(0.05, 0.05, 0.05)  # Escala menor para o satélite
-
-        # Bind textura do satélite
-        glBindTexture(GL_TEXTURE_2D, self.satellite_texture)
-        glEnable(GL_TEXTURE_2D)
-
-        # Desenhar o modelo OBJ
-        for name, mesh in self.satellite_model.meshes.items():
-            glBegin(GL_TRIANGLES)
-            for face in mesh.faces:
-                for vertex_i in face:
-                    vertex = self.satellite_model.vertices[vertex_i]
-                    if len(vertex) == 8:
-                        x, y, z, nx, ny, nz, u, v = vertex
-                        glNormal3f(nx, ny, nz)
-                        glTexCoord2f(u, v)
-                        glVertex3f(x, y, z)
-                    elif len(vertex) == 6:
-                        x, y, z, nx, ny, nz = vertex
-                        glNormal3f(nx, ny, nz)
-                        glVertex3f(x, y, z)
-                    else:
-                        x, y, z = vertex[:3]
-                        glVertex3f(x, y, z)
-            glEnd()
-
-        glDisable(GL_TEXTURE_2D)
-        glPopMatrix()
+    def draw_mesh_shader(self, program, mesh, model, texture=None):
+        """Desenha uma GpuMesh com o programa de shader e a matriz de modelo informados"""
+        # Câmera e luz já estão no UBO do frame: só a matriz de modelo é enviada
+        program.use()
+        program.set_mat4("model", model)
+        if texture is not None:
+            gl.glActiveTexture(gl.GL_TEXTURE0)
+            gl.glBindTexture(gl.GL_TEXTURE_2D, texture)
+            program.set_int("tex", 0)
+        mesh.draw()
+        if texture is not None:
+            gl.glBindTexture(gl.GL_TEXTURE_2D, 0)
+        gl.glUseProgram(0)
 
     def setup_camera(self):
         """Configura a câmera com base no modo atual"""
         glMatrixMode(GL_MODELVIEW)
         glLoadIdentity()
         # Corrigir: passar matriz transposta
-        glLoadMatrixf(self.create_view_matrix().T.astype(np.float32))
-
-    def bezier_cubic(self, t, p0, p1, p2, p3):
-        """Calcula ponto na curva de Bézier cúbica"""
-        return (
-            (1 - t) ** 3 * p0 +
-            3 * (1 - t) ** 2 * t * p1 +
-            3 * (1 - t) * t ** 2 * p2 +
-            t ** 3 * p3
-        )
+        glLoadMatrixf(self.frame.view.T)
 
-    def draw_bezier_orbit(self, points, steps=100):
-        """Desenha a curva de Bézier como órbita"""
-        glDisable(GL_LIGHTING)
-        glDisable(GL_TEXTURE_2D)
-        glColor3f(1.0, 0.5, 0.2)  # Laranja para destacar
-        glBegin(GL_LINE_STRIP)
-        for i in range(steps + 1):
-            t = i / steps
-            pos = self.bezier_cubic(t, *points)
-            glVertex3f(pos[0], pos[1], pos[2])
-        glEnd()
-        glEnable(GL_LIGHTING)
-
-        
     # Adicionar o método run() que serve como ponto de entrada principal
     def run(self):
         """Loop principal do programa"""
         running = True
         
         while running:
+            # Esperar o início do frame (modo do agendador); a entrada é lida logo
+            # depois, o mais perto possível da apresentação
+            profiler = self.profiler
+            profiler.begin_frame()
+            with profiler.phase('wait'):
+                self.scheduler.wait(idle=self.paused)
+            
             # Processar eventos do usuário
-            running = self.handle_events()
+            with profiler.phase('events'):
+                running = self.handle_events()
+            
+            # Enviar recursos carregados em segundo plano
+            with profiler.phase('assets'):
+                self.stream_assets()
             
             # Atualizar lógica da simulação
-            self.update()
+            with profiler.phase('update'):
+                self.update()
             
             # Renderizar cena
-            self.draw_scene()
+            with profiler.phase('draw_scene'):
+                self.draw_scene()
             
             # Atualizar tela
-            pygame.display.flip()
-            pygame.time.wait(10)  # Limitar FPS
-        
+            with profiler.phase('flip'):
+                pygame.display.flip()
+            self.scheduler.frame_presented()
+            profiler.end_frame()
+        
+        print(self.scheduler.summary())
+        if self.profile_csv:
+            self.profiler.export_csv(self.profile_csv)
+            print(f"Perfil gravado em {self.profile_csv}")
+        self.asset_loader.shutdown()
         pygame.quit()
\ No newline at end of file
@@ -0,0 +1,104 @@
+"""
+Malhas de esfera com níveis de detalhe (LOD) para o Explorador 3D do Sistema Solar.
+
+As esferas são geradas com NumPy (sem laços por vértice), memorizadas por
+resolução e mantidas residentes na GPU em vários níveis de detalhe. A cada
+frame o nível de cada corpo é escolhido pelo seu raio projetado na tela:
+planetas pequenos e distantes usam poucas centenas de triângulos e
+aproximações usam a malha completa.
+"""
+
+import functools
+import numpy as np
+
+from gpu_mesh import GpuMesh
+
+# Resoluções (fatias, pilhas) dos níveis, do mais simples ao mais detalhado
+LOD_LEVELS = ((16, 8), (24, 12), (32, 16), (64, 32), (128, 64))
+# Comprimento desejado (em pixels) de cada aresta ao longo do equador
+TARGET_EDGE_PIXELS = 6.0
+
+@functools.lru_cache(maxsize=None)
+def create_sphere_mesh(radius, slices, stacks):
+    """
+    Cria a malha de uma esfera com normais e coordenadas de textura.
+
+    Returns:
+        tuple: (vértices (N, 8) float32 intercalados como em GpuMesh, índices uint32).
+        Os arrays são somente leitura, pois são compartilhados pelo cache.
+    """
+    lat = np.linspace(0.0, np.pi, stacks + 1, dtype=np.float64)[:, None]
+    lon = np.linspace(0.0, 2.0 * np.pi, slices + 1, dtype=np.float64)[None, :]
+    sin_lat, cos_lat = np.sin(lat), np.cos(lat)
+
+    normals = np.empty((stacks + 1, slices + 1, 3), dtype=np.float64)
+    normals[..., 0] = sin_lat * np.cos(lon)
+    normals[..., 1] = np.broadcast_to(cos_lat, (stacks + 1, slices + 1))
+    normals[..., 2] = sin_lat * np.sin(lon)
+
+    vertices = np.empty((stacks + 1, slices + 1, 8), dtype=np.float32)
+    vertices[..., 0:3] = radius * normals
+    vertices[..., 3:6] = normals
+    vertices[..., 6] = np.arange(slices + 1) / slices
+    vertices[..., 7] = 1.0 - (np.arange(stacks + 1) / stacks)[:, None]
+
+    # Dois triângulos por quadrilátero da grade
+    first = (np.arange(stacks)[:, None] * (slices + 1) + np.arange(slices)[None, :]).ravel()
+    second = first + slices + 1
+    indices = np.stack([first, second, first + 1, second, second + 1, first + 1], axis=1)
+    indices = indices.astype(np.uint32).ravel()
+
+    vertices = vertices.reshape(-1, 8)
+    vertices.flags.writeable = False
+    indices.flags.writeable = False
+    return vertices, indices
+
+def projected_radius(centers, radii, eye, focal_length, viewport_height):
+    """
+    Raio aproximado, em pixels, de esferas projetadas na tela.
+
+    Args:
+        centers: Centros (N, 3) ou (3,)
+        radii: Raios (N,) ou escalar
+        eye: Posição da câmera
+        focal_length: Elemento [1, 1] da matriz de projeção (1 / tan(fov / 2))
+        viewport_height: Altura da janela em pixels
+
+    Returns:
+        np.ndarray: Raios projetados; infinito para esferas que contêm a câmera
+    """
+    centers = np.asarray(centers, dtype=np.float64)
+    radii = np.asarray(radii, dtype=np.float64)
+    dist = np.linalg.norm(centers - np.asarray(eye, dtype=np.float64), axis=-1)
+    with np.errstate(divide='ignore'):
+        r = radii * focal_length * (viewport_height / 2.0) / np.maximum(dist - radii, 0.0)
+    return r
+
+class SphereLOD:
+    """Conjunto de malhas de esfera unitária residentes na GPU, uma por nível de detalhe"""
+
+    def __init__(self, levels=LOD_LEVELS, target_edge_pixels=TARGET_EDGE_PIXELS):
+        self.levels = tuple(levels)
+        self.target_edge_pixels = target_edge_pixels
+        self._slices = np.array([slices for slices, _stacks in self.levels])
+        self.meshes = []
+        for slices, stacks in self.levels:
+            vertices, indices = create_sphere_mesh(1.0, slices, stacks)
+            self.meshes.append(GpuMesh(vertices, indices, [('sphere', 0, len(indices))]))
+
+    def select_levels(self, radii_pixels):
+        """Índices dos níveis adequados para os raios projetados informados (vetorizado)"""
+        needed = 2.0 * np.pi * np.asarray(radii_pixels, dtype=np.float64) / self.target_edge_pixels
+        return np.minimum(np.searchsorted(self._slices, needed), len(self.levels) - 1)
+
+    def select(self, radius_pixels):
+        """Malha adequada para um raio projetado"""
+        return self.meshes[int(self.select_levels(radius_pixels))]
+
+    def triangle_count(self, level):
+        return self.meshes[level].index_count // 3
+
+    def delete(self):
+        for mesh in self.meshes:
+            mesh.delete()
+        self.meshes = []
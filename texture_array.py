@@ -0,0 +1,67 @@
+"""
+Array de texturas (GL_TEXTURE_2D_ARRAY) para o Explorador 3D do Sistema Solar.
+
+Todas as texturas dos corpos desenhados por instanciamento ficam em camadas de
+uma única textura, de modo que um único bind serve para todos os corpos de um
+desenho instanciado; cada instância informa apenas o índice da sua camada.
+"""
+
+import numpy as np
+import OpenGL.GL as gl
+
+# Tamanho de cada camada (o mesmo das texturas dos planetas em textures/)
+TEXTURE_ARRAY_SIZE = (2048, 1024)
+# Corpos cujas texturas ficam no array (desenhados por instanciamento)
+TEXTURE_ARRAY_NAMES = ('mercury', 'venus', 'earth', 'moon', 'mars', 'jupiter', 'saturn', 'asteroid')
+
+def resize_nearest(texels, width, height, new_width, new_height):
+    """Redimensiona texels RGBA pelo vizinho mais próximo (usado quando a imagem não tem o tamanho da camada)"""
+    image = np.asarray(texels, dtype=np.uint8).reshape(height, width, 4)
+    rows = np.arange(new_height) * height // new_height
+    cols = np.arange(new_width) * width // new_width
+    return np.ascontiguousarray(image[rows[:, None], cols[None, :]])
+
+class TextureArray:
+    """GL_TEXTURE_2D_ARRAY com uma camada por nome"""
+
+    def __init__(self, names, size=TEXTURE_ARRAY_SIZE):
+        self.names = tuple(names)
+        self.width, self.height = size
+        self.layers = {name: index for index, name in enumerate(self.names)}
+
+        self.texture_id = gl.glGenTextures(1)
+        gl.glBindTexture(gl.GL_TEXTURE_2D_ARRAY, self.texture_id)
+        gl.glTexParameteri(gl.GL_TEXTURE_2D_ARRAY, gl.GL_TEXTURE_MIN_FILTER, gl.GL_LINEAR)
+        gl.glTexParameteri(gl.GL_TEXTURE_2D_ARRAY, gl.GL_TEXTURE_MAG_FILTER, gl.GL_LINEAR)
+        gl.glTexParameteri(gl.GL_TEXTURE_2D_ARRAY, gl.GL_TEXTURE_WRAP_S, gl.GL_REPEAT)
+        gl.glTexParameteri(gl.GL_TEXTURE_2D_ARRAY, gl.GL_TEXTURE_WRAP_T, gl.GL_CLAMP_TO_EDGE)
+        gl.glTexImage3D(gl.GL_TEXTURE_2D_ARRAY, 0, gl.GL_RGBA8, self.width, self.height, len(self.names),
+                        0, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE, None)
+        gl.glBindTexture(gl.GL_TEXTURE_2D_ARRAY, 0)
+
+    def layer(self, name):
+        return self.layers[name]
+
+    def fit(self, width, height, texels):
+        """Texels no tamanho da camada (sem cópia se o tamanho já coincide)"""
+        if (width, height) == (self.width, self.height):
+            return texels
+        return resize_nearest(texels, width, height, self.width, self.height)
+
+    def upload_rows(self, layer, first_row, rows, texels):
+        """Envia um intervalo de linhas de uma camada (texels já no tamanho da camada)"""
+        gl.glBindTexture(gl.GL_TEXTURE_2D_ARRAY, self.texture_id)
+        gl.glTexSubImage3D(gl.GL_TEXTURE_2D_ARRAY, 0, 0, first_row, layer, self.width, rows, 1,
+                           gl.GL_RGBA, gl.GL_UNSIGNED_BYTE, texels)
+        gl.glBindTexture(gl.GL_TEXTURE_2D_ARRAY, 0)
+
+    def upload_layer(self, name, width, height, texels):
+        """Envia uma camada inteira de uma vez"""
+        self.upload_rows(self.layers[name], 0, self.height, self.fit(width, height, texels))
+
+    def bind(self, unit=0):
+        gl.glActiveTexture(gl.GL_TEXTURE0 + unit)
+        gl.glBindTexture(gl.GL_TEXTURE_2D_ARRAY, self.texture_id)
+
+    def delete(self):
+        gl.glDeleteTextures([self.texture_id])
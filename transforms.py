@@ -0,0 +1,53 @@
+"""
+Matrizes de transformação geométrica para o Explorador 3D do Sistema Solar.
+
+Todas as matrizes são 4x4, em float32 e na convenção de vetores-coluna
+(linha-maior em NumPy), por isso são enviadas aos shaders com transpose=GL_TRUE.
+As funções reproduzem glTranslatef, glRotatef e glScalef para que a mesma
+transformação possa ser montada sem a pilha de matrizes fixa do OpenGL.
+"""
+
+import math
+import numpy as np
+
+def translation(x, y, z):
+    """Matriz de translação"""
+    m = np.identity(4, dtype=np.float32)
+    m[0, 3] = x
+    m[1, 3] = y
+    m[2, 3] = z
+    return m
+
+def scaling(sx, sy=None, sz=None):
+    """Matriz de escala (uniforme se apenas sx for informado)"""
+    if sy is None:
+        sy = sx
+    if sz is None:
+        sz = sx
+    m = np.identity(4, dtype=np.float32)
+    m[0, 0] = sx
+    m[1, 1] = sy
+    m[2, 2] = sz
+    return m
+
+def rotation_x(angle_degrees):
+    """Rotação em torno do eixo X (equivalente a glRotatef(angle, 1, 0, 0))"""
+    a = math.radians(angle_degrees)
+    c, s = math.cos(a), math.sin(a)
+    m = np.identity(4, dtype=np.float32)
+    m[1, 1] = c
+    m[1, 2] = -s
+    m[2, 1] = s
+    m[2, 2] = c
+    return m
+
+def rotation_y(angle_degrees):
+    """Rotação em torno do eixo Y (equivalente a glRotatef(angle, 0, 1, 0))"""
+    a = math.radians(angle_degrees)
+    c, s = math.cos(a), math.sin(a)
+    m = np.identity(4, dtype=np.float32)
+    m[0, 0] = c
+    m[0, 2] = s
+    m[2, 0] = -s
+    m[2, 2] = c
+    return m